@@ -0,0 +1,47 @@
+"""운영용 관리 명령.
+
+    python -m app.cli reconcile-counters
+    python -m app.cli recompute-hot-scores
+"""
+import argparse
+import asyncio
+
+from app.models import posts_model
+
+
+def reconcile_counters(_: argparse.Namespace) -> None:
+    updated = asyncio.run(posts_model.reconcile_post_counters())
+    print(f"게시글 카운터 재계산 완료: {updated}건")
+
+
+def recompute_hot_scores(_: argparse.Namespace) -> None:
+    updated = asyncio.run(posts_model.recompute_hot_scores())
+    print(f"hot_score 재계산 완료: {updated}건")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="Community API 관리 명령")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    reconcile = subparsers.add_parser(
+        "reconcile-counters",
+        help="likes/comments 테이블 기준으로 posts의 likes_count/comments_count를 재계산합니다.",
+    )
+    reconcile.set_defaults(handler=reconcile_counters)
+
+    hot_scores = subparsers.add_parser(
+        "recompute-hot-scores",
+        help="저장된 카운터 기준으로 posts.hot_score를 재계산합니다.",
+    )
+    hot_scores.set_defaults(handler=recompute_hot_scores)
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = build_parser().parse_args(argv)
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,12 @@
 from typing import Optional
 
 from fastapi import Request
+from starlette.requests import HTTPConnection
 
-from app.common.jwt_tokens import decode_access_token
+from app.common.jwt_tokens import decode_access_token, verify_access_token
 
 
-def get_bearer_token_from_request(request: Request) -> Optional[str]:
+def get_bearer_token_from_request(request: HTTPConnection) -> Optional[str]:
     header = request.headers.get("Authorization")
     if not header:
         return None
@@ -24,3 +25,15 @@ def get_user_id_from_request(request: Request) -> Optional[int]:
     if not access_token:
         return None
     return decode_access_token(access_token)
+
+
+def get_stream_token_from_connection(connection: HTTPConnection) -> Optional[tuple[int, int]]:
+    """스트림 연결의 (user_id, exp).
+
+    WebSocket/EventSource는 브라우저에서 헤더를 지정할 수 없어 ?token= 쿼리도 허용합니다.
+    쿼리의 토큰 값은 app.core.logger가 uvicorn 접근 로그에서 가립니다.
+    """
+    access_token = get_bearer_token_from_request(connection) or connection.query_params.get("token")
+    if not access_token:
+        return None
+    return verify_access_token(access_token)
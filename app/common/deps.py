@@ -1,6 +1,16 @@
-from fastapi import Request
-from app.common.auth import get_user_id_from_request
-from app.common.exceptions import UnauthorizedError
+from dataclasses import dataclass
+from typing import Annotated
+
+from fastapi import Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.common.auth import get_stream_token_from_connection, get_user_id_from_request
+from app.common.exceptions import UnauthorizedError, UserNotFoundError
+from app.database import get_db
+from app.models import users_model
+
+# scope="function": 엔드포인트가 반환되면 응답을 보내기 전에 커밋/롤백합니다.
+DbSession = Annotated[AsyncSession, Depends(get_db, scope="function")]
 
 
 def get_current_user_id(request: Request) -> int:
@@ -12,4 +22,31 @@ def get_current_user_id(request: Request) -> int:
 def get_current_user_id_optional(request: Request) -> int | None:
     return get_user_id_from_request(request)
 
-require_user_id = get_current_user_id
\ No newline at end of file
+def get_stream_token(request: Request) -> tuple[int, int]:
+    """SSE 스트림의 (user_id, exp). 스트림은 exp가 지나면 닫힙니다."""
+    verified = get_stream_token_from_connection(request)
+    if not verified:
+        raise UnauthorizedError()
+    return verified
+
+require_user_id = get_current_user_id
+
+
+@dataclass(frozen=True)
+class AuthenticatedUser:
+    id: int
+    email: str
+    nickname: str
+    profile_image_url: str | None
+
+
+async def get_current_user(db: DbSession, user_id: int = Depends(get_current_user_id)) -> AuthenticatedUser:
+    """요청당 한 번 확인하는 인증 사용자. 사용자 요약 캐시를 거치므로 보통 DB를 읽지 않습니다."""
+    summary = await users_model.get_active_user_summary(db, user_id)
+    if not summary:
+        raise UserNotFoundError()
+    return AuthenticatedUser(**summary)
+
+
+# FastAPI가 요청 안에서 의존성 결과를 재사용하므로 여러 곳에서 주입해도 한 번만 계산됩니다.
+CurrentUser = Annotated[AuthenticatedUser, Depends(get_current_user)]
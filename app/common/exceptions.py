@@ -35,6 +35,9 @@ class ErrorCode(Enum):
     # 500 Internal Server Error
     INTERNAL_SERVER_ERROR = ("internal_server_error", "서버 오류가 발생했습니다", 500)
     DATABASE_ERROR = ("database_error", "데이터베이스 오류가 발생했습니다", 500)
+
+    # 503 Service Unavailable
+    SERVICE_UNAVAILABLE = ("service_unavailable", "요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해주세요", 503)
     
     @property
     def code(self) -> str:
@@ -126,4 +129,8 @@ class InternalServerError(BusinessException):
 
 class DatabaseError(BusinessException):
     def __init__(self, custom_message: str = None):
-        super().__init__(ErrorCode.DATABASE_ERROR, custom_message)
\ No newline at end of file
+        super().__init__(ErrorCode.DATABASE_ERROR, custom_message)
+
+class ServiceUnavailableError(BusinessException):
+    def __init__(self, custom_message: str = None):
+        super().__init__(ErrorCode.SERVICE_UNAVAILABLE, custom_message)
@@ -1,4 +1,8 @@
+import hashlib
 import os
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
 
 import jwt
@@ -6,6 +10,12 @@ import jwt
 JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "dev-only-change-me-please-set-at-least-32-chars")
 JWT_ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
+ACCESS_TOKEN_CACHE_SIZE = int(os.getenv("ACCESS_TOKEN_CACHE_SIZE", "10000"))
+
+# 검증을 통과한 access token의 LRU. {sha256(token): (user_id, exp)} — exp가 지나면 다시 검증합니다.
+# 동기 의존성은 FastAPI 스레드풀에서 실행되므로 OrderedDict 조작은 _verified_tokens_lock 안에서 합니다.
+_verified_tokens: OrderedDict[str, tuple[int, int]] = OrderedDict()
+_verified_tokens_lock = threading.Lock()
 
 
 def create_access_token(user_id: int, expires_minutes: int = ACCESS_TOKEN_EXPIRE_MINUTES) -> str:
@@ -19,7 +29,7 @@ def create_access_token(user_id: int, expires_minutes: int = ACCESS_TOKEN_EXPIRE
     return jwt.encode(payload, JWT_SECRET_KEY, algorithm=JWT_ALGORITHM)
 
 
-def decode_access_token(token: str) -> int | None:
+def _verify_access_token(token: str) -> tuple[int, int] | None:
     try:
         payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
     except jwt.PyJWTError:
@@ -29,6 +39,43 @@ def decode_access_token(token: str) -> int | None:
         return None
 
     subject = payload.get("sub")
-    if not isinstance(subject, str) or not subject.isdigit():
+    expires_at = payload.get("exp")
+    if not isinstance(subject, str) or not subject.isdigit() or not isinstance(expires_at, int):
         return None
-    return int(subject)
+    return int(subject), expires_at
+
+
+def decode_access_token(token: str) -> int | None:
+    """access token의 user_id. 같은 토큰은 만료 전까지 서명 검증 없이 캐시에서 반환합니다."""
+    verified = verify_access_token(token)
+    return verified[0] if verified else None
+
+
+def verify_access_token(token: str) -> tuple[int, int] | None:
+    """access token의 (user_id, exp). 오래 열려 있는 스트림은 exp가 지나면 연결을 끊는 데 씁니다."""
+    # 원문 토큰을 메모리에 들고 있지 않도록 해시를 키로 씁니다.
+    key = hashlib.sha256(token.encode("utf-8")).hexdigest()
+    with _verified_tokens_lock:
+        cached = _verified_tokens.get(key)
+        if cached is not None:
+            user_id, expires_at = cached
+            if expires_at > time.time():
+                _verified_tokens.move_to_end(key)
+                return user_id, expires_at
+            del _verified_tokens[key]
+
+    # 서명 검증은 잠금 밖에서 합니다. 같은 토큰을 동시에 검증하면 둘 다 같은 값을 넣을 뿐입니다.
+    verified = _verify_access_token(token)
+    if verified is None:
+        return None
+    with _verified_tokens_lock:
+        _verified_tokens[key] = verified
+        _verified_tokens.move_to_end(key)
+        while len(_verified_tokens) > ACCESS_TOKEN_CACHE_SIZE:
+            _verified_tokens.popitem(last=False)
+    return verified
+
+
+def clear_verified_tokens() -> None:
+    with _verified_tokens_lock:
+        _verified_tokens.clear()
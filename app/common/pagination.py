@@ -0,0 +1,38 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any
+
+from app.common.exceptions import InvalidPagingParamsError
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"__dt__": value.isoformat()}
+    raise TypeError(f"cursor 값으로 직렬화할 수 없는 타입입니다: {type(value).__name__}")
+
+
+def _object_hook(value: dict) -> Any:
+    if "__dt__" in value:
+        return datetime.fromisoformat(value["__dt__"])
+    return value
+
+
+def encode_cursor(payload: dict) -> str:
+    """정렬 키를 담은 dict를 URL-safe 불투명 문자열로 인코딩합니다."""
+    raw = json.dumps(payload, default=_default, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict:
+    """encode_cursor로 만든 문자열을 복원합니다. 손상된 값은 InvalidPagingParamsError."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode("ascii"))
+        payload = json.loads(raw.decode("utf-8"), object_hook=_object_hook)
+    except (binascii.Error, UnicodeError, ValueError):
+        raise InvalidPagingParamsError("cursor 값이 올바르지 않습니다.")
+    if not isinstance(payload, dict):
+        raise InvalidPagingParamsError("cursor 값이 올바르지 않습니다.")
+    return payload
@@ -3,12 +3,12 @@ from typing import Any, Optional
 from fastapi.responses import JSONResponse
 
 
-def ok(message: str = "success", data: Any = None) -> JSONResponse:
-    """200 OK 응답"""
-    return JSONResponse(
-        status_code=200,
-        content={"message": message, "data": data}
-    )
+def ok(message: str = "success", data: Any = None, paging: Optional[dict] = None) -> JSONResponse:
+    """200 OK 응답. 목록 응답은 paging(next_cursor 등)을 data와 나란히 담습니다."""
+    content = {"message": message, "data": data}
+    if paging is not None:
+        content["paging"] = paging
+    return JSONResponse(status_code=200, content=content)
 
 
 def created(message: str = "created", data: Any = None) -> JSONResponse:
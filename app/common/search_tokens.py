@@ -0,0 +1,55 @@
+import re
+import unicodedata
+from collections import Counter
+
+MAX_TERM_LENGTH = 32
+MAX_QUERY_TERMS = 8
+# 사용자 검색 prefix 색인에 저장하는 최대 길이. 더 긴 검색어는 이 길이로 찾은 뒤 나머지를 비교합니다.
+USER_PREFIX_LENGTH = 10
+
+# 한글 음절은 따로 떼어 bigram(+ 색인 시 unigram)으로 쪼개고, 그 밖의 글자/숫자는 단어 단위로 색인합니다.
+_HANGUL_RUN = r"[가-힣]+"
+_TOKEN_PATTERN = re.compile(rf"{_HANGUL_RUN}|[^\W_가-힣]+")
+_HANGUL_PATTERN = re.compile(rf"^{_HANGUL_RUN}$")
+
+
+def _terms(text: str, unigrams: bool = False) -> list[str]:
+    normalized = unicodedata.normalize("NFKC", text or "").lower()
+    terms: list[str] = []
+    for run in _TOKEN_PATTERN.findall(normalized):
+        if _HANGUL_PATTERN.match(run) and len(run) > 1:
+            # 조사/어미가 붙어도 검색되도록 형태소 분석 대신 2-gram을 씁니다. ("파이썬을" → 파이, 이썬, 썬을)
+            terms.extend(run[i:i + 2] for i in range(len(run) - 1))
+            if unigrams:
+                # 한 음절 검색어("썬")도 찾을 수 있도록 색인에는 음절 하나씩도 넣습니다.
+                terms.extend(run)
+        else:
+            terms.append(run[:MAX_TERM_LENGTH])
+    return terms
+
+
+def tokenize(text: str) -> Counter[str]:
+    """색인용. 텍스트의 검색어별 등장 횟수를 반환합니다."""
+    return Counter(_terms(text, unigrams=True))
+
+
+def query_terms(text: str) -> list[str]:
+    """검색용. 중복을 제거한 검색어 목록을 앞에서부터 최대 MAX_QUERY_TERMS개 반환합니다."""
+    return list(dict.fromkeys(_terms(text)))[:MAX_QUERY_TERMS]
+
+
+def user_prefixes(nickname: str, email: str, max_length: int = USER_PREFIX_LENGTH) -> list[str]:
+    """닉네임과 이메일 전체의 앞부분 1~max_length글자를 모두 반환합니다.
+
+    이메일은 @ 뒤까지 색인해야 "bob@ex"처럼 @가 들어간 짧은 검색어도 prefix 등호 조회로 찾을 수 있습니다.
+    """
+    prefixes: dict[str, None] = {}
+    for value in (nickname, email):
+        normalized = normalize_user_query(value)
+        for length in range(1, min(len(normalized), max_length) + 1):
+            prefixes[normalized[:length]] = None
+    return list(prefixes)
+
+
+def normalize_user_query(text: str) -> str:
+    return unicodedata.normalize("NFKC", text or "").strip().lower()
@@ -1,8 +1,20 @@
-import bcrypt
 import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import bcrypt
+
+from app.core.bounded_pool import create_slots, run_bounded
 
 logger = logging.getLogger(__name__)
 
+# bcrypt는 해싱 중 GIL을 풀어 주므로 스레드 풀만으로 코어를 병렬 활용할 수 있습니다.
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "4"))
+PASSWORD_HASH_QUEUE_LIMIT = int(os.getenv("PASSWORD_HASH_QUEUE_LIMIT", "32"))
+
+_hash_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash")
+_hash_slots = create_slots(PASSWORD_HASH_WORKERS, PASSWORD_HASH_QUEUE_LIMIT)
+
 
 def hash_password(password: str) -> str:
 
@@ -38,4 +50,14 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     except Exception as e:
         # 기타 예외
         logger.error(f"비밀번호 검증 중 예외 발생: {type(e).__name__} - {e}")
-        return False
\ No newline at end of file
+        return False
+
+
+async def hash_password_async(password: str) -> str:
+    """hash_password를 전용 스레드 풀에서 실행합니다. 대기열이 가득 차면 ServiceUnavailableError."""
+    return await run_bounded(_hash_executor, _hash_slots, hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password를 전용 스레드 풀에서 실행합니다. 대기열이 가득 차면 ServiceUnavailableError."""
+    return await run_bounded(_hash_executor, _hash_slots, verify_password, plain_password, hashed_password)
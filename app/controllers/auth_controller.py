@@ -1,6 +1,8 @@
 import os
 import re
 
+from sqlalchemy.ext.asyncio import AsyncSession
+
 from app.common.exceptions import (
     EmailAlreadyExistsError,
     InvalidCredentialsError,
@@ -10,29 +12,32 @@ from app.common.exceptions import (
     NicknameAlreadyExistsError,
 )
 from app.common.jwt_tokens import ACCESS_TOKEN_EXPIRE_MINUTES, create_access_token
-from app.common.security import hash_password, verify_password
+from app.common.security import hash_password_async, verify_password_async
+from app.core.session_store import session_store
 from app.models import users_model
 
 REFRESH_TOKEN_TTL_DAYS = int(os.getenv("REFRESH_TOKEN_TTL_DAYS", "14"))
+REFRESH_TOKEN_TTL_SECONDS = REFRESH_TOKEN_TTL_DAYS * 24 * 60 * 60
 PASSWORD_PATTERN = re.compile(
     r"^(?=.*[a-z])(?=.*[A-Z])(?=.*\d)(?=.*[@$!%*#?&])[A-Za-z\d@$!%*#?&]{8,20}$"
 )
 
 
-def signup(email: str, password: str, nickname: str) -> dict:
+async def signup(db: AsyncSession, email: str, password: str, nickname: str) -> dict:
     """BE-L1: 비밀번호 검증을 users_controller 수준으로 강화 (단순 길이 체크 → regex 패턴 검증)."""
-    if users_model.is_email_exists(email):
+    if await users_model.is_email_exists(db, email):
         raise EmailAlreadyExistsError()
-    if users_model.is_nickname_exists(nickname):
+    if await users_model.is_nickname_exists(db, nickname):
         raise NicknameAlreadyExistsError()
     if len(password) < 8 or len(password) > 20:
         raise InvalidPasswordError("비밀번호는 8자 이상, 20자 이하여야 합니다.")
     if not PASSWORD_PATTERN.match(password):
         raise InvalidPasswordError("비밀번호는 대문자, 소문자, 숫자, 특수문자를 각각 최소 1개 포함해야 합니다.")
 
-    user = users_model.create_user(
+    user = await users_model.create_user(
+        db,
         email=email,
-        password_hash=hash_password(password),
+        password_hash=await hash_password_async(password),
         nickname=nickname,
     )
     if not user:
@@ -45,30 +50,30 @@ def signup(email: str, password: str, nickname: str) -> dict:
     }
 
 
-def check_email(email: str) -> dict:
-    if users_model.is_email_exists(email):
+async def check_email(db: AsyncSession, email: str) -> dict:
+    if await users_model.is_email_exists(db, email):
         raise EmailAlreadyExistsError()
     return {"available": True, "message": "사용 가능한 이메일입니다."}
 
 
-def check_nickname(nickname: str) -> dict:
-    if users_model.is_nickname_exists(nickname):
+async def check_nickname(db: AsyncSession, nickname: str) -> dict:
+    if await users_model.is_nickname_exists(db, nickname):
         raise NicknameAlreadyExistsError()
     return {"available": True, "message": "사용 가능한 닉네임입니다."}
 
 
-def login(email: str, password: str) -> dict:
+async def login(db: AsyncSession, email: str, password: str) -> dict:
     if not email or not password:
         raise MissingRequiredFieldsError()
 
-    user = users_model.find_user_by_email(email)
+    user = await users_model.find_user_by_email(db, email)
     if not user:
         raise InvalidCredentialsError()
-    if not verify_password(password, user["password"]):
+    if not await verify_password_async(password, user["password"]):
         raise InvalidCredentialsError()
 
     access_token = create_access_token(user["id"])
-    refresh_token = users_model.create_session(user_id=user["id"], ttl_days=REFRESH_TOKEN_TTL_DAYS)
+    refresh_token = await session_store.create(db, user["id"], REFRESH_TOKEN_TTL_SECONDS)
     return {
         "access_token": access_token,
         "refresh_token": refresh_token,
@@ -77,16 +82,15 @@ def login(email: str, password: str) -> dict:
     }
 
 
-def refresh(refresh_token: str) -> dict:
+async def refresh(db: AsyncSession, refresh_token: str) -> dict:
     if not refresh_token:
         raise MissingRequiredFieldsError("refresh_token이 필요합니다.")
 
-    user_id = users_model.get_user_id_by_session(refresh_token)
-    if not user_id:
+    rotated = await session_store.rotate(db, refresh_token, REFRESH_TOKEN_TTL_SECONDS)
+    if not rotated:
         raise InvalidRequestFormatError("유효하지 않거나 만료된 refresh_token 입니다.")
 
-    users_model.delete_session(refresh_token)
-    new_refresh_token = users_model.create_session(user_id=user_id, ttl_days=REFRESH_TOKEN_TTL_DAYS)
+    user_id, new_refresh_token = rotated
     new_access_token = create_access_token(user_id)
 
     return {
@@ -97,6 +101,6 @@ def refresh(refresh_token: str) -> dict:
     }
 
 
-def logout(refresh_token: str | None) -> None:
+async def logout(db: AsyncSession, refresh_token: str | None) -> None:
     if refresh_token:
-        users_model.delete_session(refresh_token)
+        await session_store.delete(db, refresh_token)
@@ -1,11 +1,13 @@
 from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
 from app.common.responses import ok, created
 
 from app.common.exceptions import (
     BusinessException, ErrorCode,
     MissingRequiredFieldsError, PostNotFoundError,
     CommentNotFoundError, ForbiddenError,
-    InvalidRequestFormatError
+    InvalidRequestFormatError, InvalidPagingParamsError
 )
 from app.models import posts_model, comments_model
 
@@ -19,16 +21,31 @@ def _validate_comment(content: str) -> None:
         )
 
 
-def list_comments(post_id: int, user_id: int | None = None) -> JSONResponse:
+async def list_comments(
+    db: AsyncSession,
+    post_id: int,
+    user_id: int | None = None,
+    limit: int = 50,
+    after_id: int | None = None,
+) -> JSONResponse:
+    if not (1 <= limit <= 100):
+        raise InvalidPagingParamsError()
 
-    if not posts_model.find_post(post_id):
+    post = await posts_model.find_post(db, post_id)
+    if not post:
         raise PostNotFoundError()
     
-    comments = comments_model.list_comments(post_id, user_id)
-    return ok(message="read_comments_success", data=comments)
+    comments, has_more = await comments_model.list_comments(db, post_id, user_id, limit=limit, after_id=after_id)
+    # 전체 개수는 COUNT 대신 게시글의 comments_count 카운터를 사용합니다.
+    paging = {
+        "total": post["comments_count"],
+        "has_more": has_more,
+        "next_after_id": comments[-1]["id"] if has_more else None,
+    }
+    return ok(message="read_comments_success", data=comments, paging=paging)
 
 
-def create_comment(user_id: int, post_id: int, payload: dict) -> JSONResponse:
+async def create_comment(db: AsyncSession, user_id: int, post_id: int, payload: dict) -> JSONResponse:
     content = (payload.get("content") or "").strip()
     
    
@@ -37,16 +54,16 @@ def create_comment(user_id: int, post_id: int, payload: dict) -> JSONResponse:
 
     _validate_comment(content)
 
-    if not posts_model.find_post(post_id):
+    if not await posts_model.find_post(db, post_id):
         raise PostNotFoundError()
 
-    comment = comments_model.create_comment(user_id, post_id, content)
+    comment = await comments_model.create_comment(db, user_id, post_id, content)
     return created(message="comment_created", data=comment)
 
 
 
-def update_comment(user_id: int, post_id: int, comment_id: int, payload: dict) -> JSONResponse:
-    comment = comments_model.find_comment(comment_id)
+async def update_comment(db: AsyncSession, user_id: int, post_id: int, comment_id: int, payload: dict) -> JSONResponse:
+    comment = await comments_model.find_comment(db, comment_id)
     if not comment:
         raise CommentNotFoundError()
 
@@ -66,15 +83,15 @@ def update_comment(user_id: int, post_id: int, comment_id: int, payload: dict) -
     _validate_comment(content)
 
 
-    updated = comments_model.update_comment(comment_id, content)
+    updated = await comments_model.update_comment(db, comment_id, content)
     if not updated:
         raise CommentNotFoundError()
 
     return ok(message="comment_updated", data=updated)
 
 
-def delete_comment(user_id: int, post_id: int, comment_id: int) -> JSONResponse:
-    comment = comments_model.find_comment(comment_id)
+async def delete_comment(db: AsyncSession, user_id: int, post_id: int, comment_id: int) -> JSONResponse:
+    comment = await comments_model.find_comment(db, comment_id)
     if not comment:
         raise CommentNotFoundError()
 
@@ -86,5 +103,5 @@ def delete_comment(user_id: int, post_id: int, comment_id: int) -> JSONResponse:
     if comment["user_id"] != user_id:
         raise ForbiddenError("댓글 삭제 권한이 없습니다.")
 
-    comments_model.delete_comment(comment_id)
+    await comments_model.delete_comment(db, comment_id)
     return ok(message="comment_deleted", data=None)
\ No newline at end of file
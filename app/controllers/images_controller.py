@@ -0,0 +1,241 @@
+import hashlib
+import logging
+import mimetypes
+import re
+from pathlib import Path, PurePosixPath
+from typing import AsyncIterator
+
+import anyio
+from fastapi import UploadFile
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.common.exceptions import (
+    BusinessException,
+    ErrorCode,
+    InvalidRequestFormatError,
+    MissingRequiredFieldsError,
+    UnauthorizedError,
+)
+from app.common.responses import ok
+from app.core import image_variants, upload_storage
+from app.models import images_model
+
+logger = logging.getLogger(__name__)
+
+ALLOWED_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".webp"}
+MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+SHA256_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+CONTENT_KEY_PATTERN = re.compile(r"^([0-9a-f]{2})/([0-9a-f]{2})/([0-9a-f]{64})(\.[a-z]+)$")
+
+
+def file_too_large() -> BusinessException:
+    return BusinessException(
+        ErrorCode.INVALID_REQUEST_FORMAT,
+        f"파일 크기는 {MAX_FILE_SIZE // (1024 * 1024)}MB 이하여야 합니다.",
+    )
+
+
+def _validate_extension(filename: str | None) -> str:
+    file_ext = Path(filename or "").suffix.lower()
+    if file_ext not in ALLOWED_EXTENSIONS:
+        raise BusinessException(
+            ErrorCode.INVALID_REQUEST_FORMAT,
+            f"허용되지 않는 파일 형식입니다. 허용: {', '.join(sorted(ALLOWED_EXTENSIONS))}",
+        )
+    return file_ext
+
+
+def _content_type(file_ext: str) -> str:
+    return mimetypes.guess_type(f"image{file_ext}")[0] or "application/octet-stream"
+
+
+def _parse_content_key(key: str | None) -> tuple[str, str] | None:
+    """저장 키가 content_key 형식이면 (sha256, 확장자)."""
+    match = CONTENT_KEY_PATTERN.match(key or "")
+    if not match:
+        return None
+    shard1, shard2, sha256, file_ext = match.groups()
+    if sha256[:2] != shard1 or sha256[2:4] != shard2 or file_ext not in ALLOWED_EXTENSIONS:
+        return None
+    return sha256, file_ext
+
+
+async def _read_upload(file: UploadFile) -> AsyncIterator[bytes]:
+    while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+        yield chunk
+
+
+async def _stream_to_file(chunks: AsyncIterator[bytes], file_path: Path) -> tuple[int, str]:
+    """업로드를 청크 단위로 파일에 쓰고 (크기, sha256)을 반환합니다.
+
+    MAX_FILE_SIZE를 넘는 순간 중단하고 쓰던 파일을 지웁니다. 파일 쓰기는 스레드에서 실행되어
+    이벤트 루프를 막지 않고, 메모리는 청크 하나 크기만 사용합니다.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        async with await anyio.open_file(file_path, "wb") as out:
+            async for chunk in chunks:
+                size += len(chunk)
+                if size > MAX_FILE_SIZE:
+                    raise file_too_large()
+                digest.update(chunk)
+                await out.write(chunk)
+    except BaseException:
+        await anyio.Path(file_path).unlink(missing_ok=True)
+        raise
+    return size, digest.hexdigest()
+
+
+def _file_sha256(file_path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as source:
+        while chunk := source.read(UPLOAD_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _upload_payload(image_url: str, variants: list[dict]) -> dict:
+    return {"image_url": image_url, "variants": variants, "srcset": images_model.build_srcset(variants)}
+
+
+async def _existing_upload(db: AsyncSession, image_url: str) -> dict | None:
+    """같은 내용이 이미 기록되어 있으면 GC 유예를 갱신하고 응답 payload를 반환합니다. pending 행은 아직 없는 것으로 봅니다."""
+    existing = await images_model.find_upload(db, image_url)
+    if existing is None or existing["pending"]:
+        return None
+    if not await images_model.touch_upload(db, image_url):
+        # 조회한 뒤 GC가 행과 파일을 지웠으면 새 업로드처럼 다시 저장합니다.
+        return None
+    return _upload_payload(image_url, existing["variants"])
+
+
+async def _store_image(
+    db: AsyncSession,
+    source: Path,
+    key: str,
+    size: int,
+    sha256: str,
+    user_id: int,
+    original_stored: bool,
+) -> dict:
+    """source(작업 디렉터리 안의 원본)로 파생본을 만들어 저장소에 올리고 업로드를 기록합니다."""
+    storage = upload_storage.storage
+    rendered = await image_variants.create_variants(source) or {"width": None, "height": None, "variants": []}
+    variants = []
+    for variant in rendered["variants"]:
+        variant_file = variant.pop("file")
+        variant_key = str(PurePosixPath(key).with_name(variant_file))
+        await storage.save_file(source.with_name(variant_file), variant_key, _content_type(f".{variant['format']}"))
+        variants.append({"url": storage.url_for(variant_key), **variant})
+    # 원본은 파생본 뒤에 올려, 원본이 보이면 파생본도 준비되어 있게 합니다.
+    if not original_stored:
+        await storage.save_file(source, key, _content_type(source.suffix))
+
+    image_url = storage.url_for(key)
+    await images_model.record_upload(
+        db,
+        url=image_url,
+        user_id=user_id,
+        size_bytes=size,
+        sha256=sha256,
+        width=rendered["width"],
+        height=rendered["height"],
+        variants=variants,
+    )
+    logger.info("이미지 업로드 성공: %s (%d bytes, 파생본 %d개)", image_url, size, len(variants))
+    return _upload_payload(image_url, variants)
+
+
+async def upload_image(db: AsyncSession, user_id: int, file: UploadFile):
+    """multipart 업로드. 내용 해시 키(ab/cd/<sha256>.ext)로 저장하고, 같은 내용이 있으면 그대로 재사용합니다."""
+    file_ext = _validate_extension(file.filename)
+    async with upload_storage.work_dir() as work_dir:
+        part_path = work_dir / "upload.part"
+        size, sha256 = await _stream_to_file(_read_upload(file), part_path)
+        key = upload_storage.content_key(sha256, file_ext)
+
+        data = await _existing_upload(db, upload_storage.storage.url_for(key))
+        if data is None:
+            source = work_dir / PurePosixPath(key).name
+            await anyio.Path(part_path).rename(source)
+            data = await _store_image(db, source, key, size, sha256, user_id, original_stored=False)
+    return ok("upload_success", data)
+
+
+async def create_direct_upload(db: AsyncSession, user_id: int, payload: dict):
+    """저장소로 직접 올릴 URL을 발급합니다. 클라이언트가 계산한 크기/SHA-256을 서명에 넣어 다른 내용은 거절됩니다.
+
+    같은 내용이 이미 있으면 upload 없이 기존 이미지를 돌려줍니다. 없으면 pending 행을 먼저 만들어
+    /complete가 오지 않은 업로드도 GC가 지우고, 그 전에 붙인 image_url도 참조로 남게 합니다.
+    """
+    file_ext = _validate_extension(payload.get("filename"))
+    size = payload.get("size")
+    sha256 = (payload.get("sha256") or "").lower()
+    if not size or not sha256:
+        raise MissingRequiredFieldsError()
+    if size > MAX_FILE_SIZE:
+        raise file_too_large()
+    if not SHA256_PATTERN.match(sha256):
+        raise InvalidRequestFormatError("sha256은 16진수 64자여야 합니다.")
+
+    storage = upload_storage.storage
+    key = upload_storage.content_key(sha256, file_ext)
+    image_url = storage.url_for(key)
+    data = await _existing_upload(db, image_url)
+    if data is not None:
+        return ok("upload_exists", {**data, "upload": None})
+
+    await images_model.reserve_upload(db, image_url, user_id, size, sha256)
+    upload = await storage.presign_upload(key, size, sha256, _content_type(file_ext))
+    upload["expires_in"] = upload_storage.PRESIGNED_UPLOAD_TTL_SECONDS
+    return ok("upload_url_created", {"image_url": image_url, "upload": upload})
+
+
+async def receive_direct_upload(token: str, chunks: AsyncIterator[bytes]):
+    """local 저장소의 presigned URL 역할. 서명된 크기/해시와 다른 내용은 저장하지 않습니다."""
+    claims = upload_storage.decode_upload_token(token)
+    if claims is None:
+        raise UnauthorizedError("업로드 URL이 만료되었거나 올바르지 않습니다.")
+
+    async with upload_storage.work_dir() as work_dir:
+        part_path = work_dir / "upload.part"
+        size, sha256 = await _stream_to_file(chunks, part_path)
+        if size != claims["size"] or sha256 != claims["sha256"]:
+            raise InvalidRequestFormatError("업로드한 파일이 발급받은 크기/해시와 다릅니다.")
+        await upload_storage.storage.save_file(part_path, claims["key"], claims["content_type"])
+    return ok("upload_success", None)
+
+
+async def complete_direct_upload(db: AsyncSession, user_id: int, image_url: str | None):
+    """직접 업로드가 끝난 이미지를 확인해 파생본을 만들고 기록합니다. 내용이 키의 해시와 다르면 지웁니다."""
+    if not image_url:
+        raise MissingRequiredFieldsError()
+    storage = upload_storage.storage
+    key = storage.key_for_url(image_url)
+    parsed = _parse_content_key(key)
+    if parsed is None:
+        raise InvalidRequestFormatError("이 서버에서 발급한 업로드 URL이 아닙니다.")
+
+    data = await _existing_upload(db, image_url)
+    if data is not None:
+        return ok("upload_success", data)
+
+    size = await storage.size(key)
+    if size is None:
+        raise InvalidRequestFormatError("업로드된 파일이 없습니다.")
+    if size > MAX_FILE_SIZE:
+        await storage.delete([key])
+        raise file_too_large()
+
+    sha256, _ = parsed
+    async with upload_storage.work_dir() as work_dir:
+        source = work_dir / PurePosixPath(key).name
+        await storage.download(key, source)
+        if await anyio.to_thread.run_sync(_file_sha256, source) != sha256:
+            await storage.delete([key])
+            raise InvalidRequestFormatError("업로드한 파일이 발급받은 해시와 다릅니다.")
+        data = await _store_image(db, source, key, size, sha256, user_id, original_stored=True)
+    return ok("upload_success", data)
@@ -1,18 +1,27 @@
+from fastapi.encoders import jsonable_encoder
 from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.common.exceptions import (
     BusinessException,
     ErrorCode,
+    InvalidPagingParamsError,
     MissingRequiredFieldsError,
     UserNotFoundError,
 )
 from app.common.responses import created, ok
+from app.core.pubsub import message_hub
+from app.database import after_commit
 from app.models import messages_model, users_model
 
 MAX_MESSAGE_LENGTH = 1000
 
 
-def _validate_recipient(user_id: int, recipient_id: int) -> None:
+def user_channel(user_id: int) -> str:
+    return f"user:{user_id}"
+
+
+async def _validate_recipient(db: AsyncSession, user_id: int, recipient_id: int) -> None:
     if recipient_id <= 0:
         raise UserNotFoundError()
     if recipient_id == user_id:
@@ -20,7 +29,7 @@ def _validate_recipient(user_id: int, recipient_id: int) -> None:
             ErrorCode.INVALID_REQUEST_FORMAT,
             "자기 자신에게는 메시지를 보낼 수 없습니다.",
         )
-    if not users_model.get_user_by_id(recipient_id):
+    if not await users_model.get_user_by_id(db, recipient_id):
         raise UserNotFoundError()
 
 
@@ -36,28 +45,93 @@ def _validate_content(content: str) -> str:
     return normalized
 
 
-def search_users(user_id: int, query: str | None = None) -> JSONResponse:
-    users = messages_model.search_users(user_id=user_id, query=query)
+async def search_users(db: AsyncSession, user_id: int, query: str | None = None) -> JSONResponse:
+    users = await messages_model.search_users(db, user_id=user_id, query=query)
     return ok(message="search_message_users_success", data=users)
 
 
-def list_conversations(user_id: int) -> JSONResponse:
-    conversations = messages_model.list_conversations(user_id=user_id)
-    return ok(message="read_conversations_success", data=conversations)
+async def list_conversations(
+    db: AsyncSession,
+    user_id: int,
+    limit: int = 20,
+    cursor: str | None = None,
+) -> JSONResponse:
+    if not (1 <= limit <= 50):
+        raise InvalidPagingParamsError()
+    conversations, next_cursor = await messages_model.list_conversations(
+        db, user_id=user_id, limit=limit, cursor=cursor
+    )
+    return ok(message="read_conversations_success", data=conversations, paging={"next_cursor": next_cursor})
+
+
+async def list_messages(
+    db: AsyncSession,
+    user_id: int,
+    other_user_id: int,
+    limit: int = 50,
+    before_id: int | None = None,
+    after_id: int | None = None,
+) -> JSONResponse:
+    if not (1 <= limit <= 100):
+        raise InvalidPagingParamsError()
+    if before_id and after_id:
+        raise InvalidPagingParamsError("before_id와 after_id는 함께 사용할 수 없습니다.")
+
+    await _validate_recipient(db, user_id, other_user_id)
+    messages, has_more = await messages_model.list_messages(
+        db,
+        user_id=user_id,
+        other_user_id=other_user_id,
+        limit=limit,
+        before_id=before_id,
+        after_id=after_id,
+    )
+    # has_more: before/기본 조회면 더 오래된 메시지, after_id 조회면 더 새로운 메시지가 남아 있음
+    paging = {
+        "has_more": has_more,
+        "oldest_id": messages[0]["id"] if messages else None,
+        "newest_id": messages[-1]["id"] if messages else None,
+    }
+    return ok(message="read_messages_success", data=messages, paging=paging)
 
 
-def list_messages(user_id: int, other_user_id: int) -> JSONResponse:
-    _validate_recipient(user_id, other_user_id)
-    messages = messages_model.list_messages(user_id=user_id, other_user_id=other_user_id)
-    return ok(message="read_messages_success", data=messages)
+async def mark_read(
+    db: AsyncSession,
+    user_id: int,
+    other_user_id: int,
+    up_to_id: int | None = None,
+) -> JSONResponse:
+    await _validate_recipient(db, user_id, other_user_id)
+    read_count = await messages_model.mark_messages_read(db, user_id, other_user_id, up_to_id=up_to_id)
+    unread_count = await messages_model.get_unread_count(db, user_id, other_user_id)
+    return ok(message="messages_read", data={"read_count": read_count, "unread_count": unread_count})
 
 
-def send_message(user_id: int, recipient_id: int, content: str) -> JSONResponse:
-    _validate_recipient(user_id, recipient_id)
+async def send_message(db: AsyncSession, user_id: int, recipient_id: int, content: str) -> JSONResponse:
+    await _validate_recipient(db, user_id, recipient_id)
     normalized_content = _validate_content(content)
-    message = messages_model.create_message(
+    message = await messages_model.create_message(
+        db,
         sender_id=user_id,
         recipient_id=recipient_id,
         content=normalized_content,
     )
+    _publish_message(db, message)
     return created(message="message_sent", data=message)
+
+
+def _publish_message(db: AsyncSession, message: dict) -> None:
+    """커밋된 뒤에만 양쪽 사용자 스트림으로 새 메시지를 보냅니다. 롤백되면 보내지 않습니다."""
+    payload = jsonable_encoder(message)
+
+    async def _publish() -> None:
+        await message_hub.publish(
+            user_channel(payload["recipient_id"]),
+            {"type": "message", "data": {**payload, "is_mine": False}},
+        )
+        await message_hub.publish(
+            user_channel(payload["sender_id"]),
+            {"type": "message", "data": {**payload, "is_mine": True}},
+        )
+
+    after_commit(db, _publish)
@@ -1,6 +1,7 @@
 import re
 
 from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.common.exceptions import (
     BusinessException,
@@ -53,12 +54,14 @@ def _normalize_tags(tags: list[str]) -> list[str]:
     return deduped
 
 
-def list_posts(
+async def list_posts(
+    db: AsyncSession,
     page: int = 1,
     limit: int = 10,
     current_user_id: int | None = None,
     sort: str = "latest",
     tag: str | None = None,
+    cursor: str | None = None,
 ) -> JSONResponse:
     if page < 1:
         raise InvalidPagingParamsError()
@@ -68,11 +71,15 @@ def list_posts(
         raise InvalidRequestFormatError("sort는 latest, hot, discussed 중 하나여야 합니다.")
 
     normalized_tag = _normalize_single_tag(tag) if tag else None
-    data = posts_model.list_posts(page, limit, current_user_id, sort=sort, tag=normalized_tag)
-    return ok(message="read_posts_success", data=data)
+    data, next_cursor = await posts_model.list_posts(
+        db,
+        page, limit, current_user_id, sort=sort, tag=normalized_tag, cursor=cursor
+    )
+    return ok(message="read_posts_success", data=data, paging={"next_cursor": next_cursor})
 
 
-def create_post(
+async def create_post(
+    db: AsyncSession,
     user_id: int,
     title: str,
     content: str,
@@ -88,24 +95,25 @@ def create_post(
     _validate_title(title)
     normalized_tags = _normalize_tags(tags or [])
 
-    post = posts_model.create_post(user_id, title, content, image_url, tags=normalized_tags)
+    post = await posts_model.create_post(db, user_id, title, content, image_url, tags=normalized_tags)
     return created(message="post_created", data=post)
 
 
-def get_post(post_id: int, current_user_id: int | None = None) -> JSONResponse:
-    post = posts_model.find_post(post_id, current_user_id)
+async def get_post(db: AsyncSession, post_id: int, current_user_id: int | None = None) -> JSONResponse:
+    post = await posts_model.find_post(db, post_id, current_user_id)
     if not post:
         raise PostNotFoundError()
 
     # BE-M3: increment 후 find_post를 다시 호출하지 않고,
     # view_count를 응답에서 +1 보정하여 빠른 피드백 제공
-    posts_model.increment_views(post_id)
+    await posts_model.increment_views(post_id)
     post["views"] = post.get("view_count", 0) + 1
     post["view_count"] = post["views"]
     return ok(message="read_detail_success", data=post)
 
 
-def update_post(
+async def update_post(
+    db: AsyncSession,
     user_id: int,
     post_id: int,
     title: str,
@@ -113,7 +121,7 @@ def update_post(
     image_url: str | None = None,
     tags: list[str] | None = None,
 ) -> JSONResponse:
-    post = posts_model.find_post(post_id)
+    post = await posts_model.find_post(db, post_id)
     if not post:
         raise PostNotFoundError()
 
@@ -127,51 +135,52 @@ def update_post(
 
     _validate_title(title)
     normalized_tags = _normalize_tags(tags) if tags is not None else None
-    updated = posts_model.update_post(post_id, title, content, image_url, tags=normalized_tags)
+    updated = await posts_model.update_post(db, post_id, title, content, image_url, tags=normalized_tags)
     if not updated:
         raise PostNotFoundError()
     return ok(message="post_updated", data=updated)
 
 
-def delete_post(user_id: int, post_id: int) -> JSONResponse:
-    post = posts_model.find_post(post_id)
+async def delete_post(db: AsyncSession, user_id: int, post_id: int) -> JSONResponse:
+    post = await posts_model.find_post(db, post_id)
     if not post:
         raise PostNotFoundError()
     if post["user_id"] != user_id:
         raise ForbiddenError("게시글 삭제 권한이 없습니다.")
 
-    posts_model.delete_post(post_id)
+    await posts_model.delete_post(db, post_id)
     return ok(message="post_deleted", data=None)
 
 
-def like_post(user_id: int, post_id: int) -> JSONResponse:
-    if not posts_model.find_post(post_id):
+async def like_post(db: AsyncSession, user_id: int, post_id: int) -> JSONResponse:
+    if not await posts_model.find_post(db, post_id):
         raise PostNotFoundError()
 
-    if posts_model.is_liked(user_id, post_id):
+    if await posts_model.is_liked(db, user_id, post_id):
         raise BusinessException(ErrorCode.INVALID_REQUEST_FORMAT, "이미 좋아요를 눌렀습니다.")
 
-    created_like = posts_model.add_like(user_id, post_id)
+    created_like = await posts_model.add_like(db, user_id, post_id)
     if not created_like:
         raise BusinessException(ErrorCode.INVALID_REQUEST_FORMAT, "이미 좋아요를 눌렀습니다.")
     return created(
         message="like_created",
-        data={"likes_count": posts_model.get_like_count(post_id)},
+        data={"likes_count": await posts_model.get_like_count(db, post_id)},
     )
 
 
-def unlike_post(user_id: int, post_id: int) -> JSONResponse:
-    if not posts_model.find_post(post_id):
+async def unlike_post(db: AsyncSession, user_id: int, post_id: int) -> JSONResponse:
+    if not await posts_model.find_post(db, post_id):
         raise PostNotFoundError()
 
-    posts_model.remove_like(user_id, post_id)
+    await posts_model.remove_like(db, user_id, post_id)
     return ok(
         message="like_deleted",
-        data={"likes_count": posts_model.get_like_count(post_id)},
+        data={"likes_count": await posts_model.get_like_count(db, post_id)},
     )
 
 
-def get_trending(
+async def get_trending(
+    db: AsyncSession,
     days: int = 7,
     limit: int = 5,
     current_user_id: int | None = None,
@@ -181,5 +190,26 @@ def get_trending(
     if not (1 <= limit <= 20):
         raise InvalidRequestFormatError("limit은 1~20 사이여야 합니다.")
 
-    data = posts_model.get_trending(days=days, limit=limit, current_user_id=current_user_id)
+    data = await posts_model.get_trending(db, days=days, limit=limit, current_user_id=current_user_id)
     return ok(message="read_trending_success", data=data)
+
+
+async def search_posts(
+    db: AsyncSession,
+    query: str | None,
+    limit: int = 10,
+    cursor: str | None = None,
+    current_user_id: int | None = None,
+) -> JSONResponse:
+    normalized_query = (query or "").strip()
+    if not normalized_query:
+        raise MissingRequiredFieldsError("검색어를 입력해주세요.")
+    if len(normalized_query) > 100:
+        raise InvalidRequestFormatError("검색어는 최대 100자까지 입력할 수 있습니다.")
+    if not (1 <= limit <= 50):
+        raise InvalidPagingParamsError()
+
+    data, next_cursor = await posts_model.search_posts(
+        db, normalized_query, limit=limit, cursor=cursor, current_user_id=current_user_id
+    )
+    return ok(message="search_posts_success", data=data, paging={"next_cursor": next_cursor})
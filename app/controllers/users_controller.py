@@ -1,7 +1,10 @@
 import re
+from dataclasses import asdict
 
 from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.common.deps import AuthenticatedUser
 from app.common.exceptions import (
     BusinessException,
     EmailAlreadyExistsError,
@@ -14,8 +17,8 @@ from app.common.exceptions import (
     UserNotFoundError,
 )
 from app.common.responses import created, ok
-from app.common.security import hash_password, verify_password
-from app.models import users_model
+from app.common.security import hash_password_async, verify_password_async
+from app.models import posts_model, users_model
 
 EMAIL_PATTERN = re.compile(r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$")
 PASSWORD_PATTERN = re.compile(r"^(?=.*[a-z])(?=.*[A-Z])(?=.*\d)(?=.*[@$!%*#?&])[A-Za-z\d@$!%*#?&]{8,20}$")
@@ -58,18 +61,18 @@ def _validate_password(password: str) -> None:
         )
 
 
-def check_email(payload: dict) -> JSONResponse:
+async def check_email(db: AsyncSession, payload: dict) -> JSONResponse:
     email = (payload.get("email") or "").strip()
     if not email:
         raise MissingRequiredFieldsError("이메일을 입력해주세요.")
     _validate_email(email)
 
-    if users_model.is_email_exists(email):
+    if await users_model.is_email_exists(db, email):
         return ok(message="email_already_exists", data={"available": False, "email": email})
     return ok(message="email_available", data={"available": True, "email": email})
 
 
-def signup(payload: dict) -> JSONResponse:
+async def signup(db: AsyncSession, payload: dict) -> JSONResponse:
     email = (payload.get("email") or "").strip()
     password = payload.get("password") or ""
     nickname = (payload.get("nickname") or "").strip()
@@ -86,14 +89,15 @@ def signup(payload: dict) -> JSONResponse:
     _validate_nickname(nickname)
     _validate_password(password)
 
-    if users_model.is_email_exists(email):
+    if await users_model.is_email_exists(db, email):
         raise EmailAlreadyExistsError("중복된 이메일입니다.")
-    if users_model.is_nickname_exists(nickname):
+    if await users_model.is_nickname_exists(db, nickname):
         raise NicknameAlreadyExistsError("중복된 닉네임입니다.")
 
-    created_user = users_model.create_user(
+    created_user = await users_model.create_user(
+        db,
         email=email,
-        password_hash=hash_password(password),
+        password_hash=await hash_password_async(password),
         nickname=nickname,
         profile_image_url=profile_image_url,
     )
@@ -102,25 +106,12 @@ def signup(payload: dict) -> JSONResponse:
     return created(message="signup_success", data=None)
 
 
-def get_me(user_id: int) -> JSONResponse:
-    user = users_model.get_user_by_id(user_id)
-    if not user:
-        raise UserNotFoundError()
-
-    data = {
-        "id": user["id"],
-        "email": user["email"],
-        "nickname": user["nickname"],
-        "profile_image_url": user.get("profile_image_url"),
-    }
-    return ok(message="read_me_success", data=data)
-
+async def get_me(current_user: AuthenticatedUser) -> JSONResponse:
+    return ok(message="read_me_success", data=asdict(current_user))
 
-def update_me(user_id: int, payload: dict) -> JSONResponse:
-    user = users_model.get_user_by_id(user_id)
-    if not user:
-        raise UserNotFoundError()
 
+async def update_me(db: AsyncSession, current_user: AuthenticatedUser, payload: dict) -> JSONResponse:
+    user_id = current_user.id
     update_fields = {}
 
     if "nickname" in payload:
@@ -128,7 +119,7 @@ def update_me(user_id: int, payload: dict) -> JSONResponse:
         if not nickname:
             raise MissingRequiredFieldsError("닉네임을 입력해주세요.")
         _validate_nickname(nickname)
-        if nickname != user["nickname"] and users_model.is_nickname_exists(nickname):
+        if nickname != current_user.nickname and await users_model.is_nickname_exists(db, nickname):
             raise NicknameAlreadyExistsError("중복된 닉네임입니다.")
         update_fields["nickname"] = nickname
 
@@ -138,9 +129,11 @@ def update_me(user_id: int, payload: dict) -> JSONResponse:
     if not update_fields:
         raise MissingRequiredFieldsError("수정할 항목이 없습니다.")
 
-    updated = users_model.update_user(user_id, **update_fields)
+    updated = await users_model.update_user(db, user_id, **update_fields)
     if not updated:
         raise UserNotFoundError()
+    # 캐시된 게시글 상세/목록에 들어 있는 작성자 닉네임/프로필 이미지를 갱신합니다.
+    posts_model.invalidate_author_cache(db, user_id)
 
     data = {
         "id": updated["id"],
@@ -151,7 +144,7 @@ def update_me(user_id: int, payload: dict) -> JSONResponse:
     return ok(message="user_updated", data=data)
 
 
-def update_password(user_id: int, payload: dict) -> JSONResponse:
+async def update_password(db: AsyncSession, user_id: int, payload: dict) -> JSONResponse:
     old_pw = payload.get("old_password") or ""
     new_pw = payload.get("new_password") or ""
 
@@ -160,23 +153,23 @@ def update_password(user_id: int, payload: dict) -> JSONResponse:
     if not new_pw:
         raise MissingRequiredFieldsError("새 비밀번호를 입력해주세요.")
 
-    user = users_model.get_user_by_id(user_id)
+    user = await users_model.get_user_by_id(db, user_id)
     if not user:
         raise UserNotFoundError()
 
-    if not verify_password(old_pw, user["password"]):
+    if not await verify_password_async(old_pw, user["password"]):
         raise InvalidCredentialsError("현재 비밀번호가 일치하지 않습니다.")
 
     _validate_password(new_pw)
 
-    users_model.update_user(user_id, password_hash=hash_password(new_pw))
+    await users_model.update_user(db, user_id, password_hash=await hash_password_async(new_pw))
     return ok(message="password_updated", data=None)
 
 
-def withdraw(user_id: int) -> JSONResponse:
-    user = users_model.get_user_by_id(user_id)
+async def withdraw(db: AsyncSession, user_id: int) -> JSONResponse:
+    user = await users_model.get_user_by_id(db, user_id)
     if not user:
         raise UserNotFoundError()
 
-    users_model.delete_user(user_id)
+    await users_model.delete_user(db, user_id)
     return ok(message="user_deleted", data=None)
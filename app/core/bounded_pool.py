@@ -0,0 +1,32 @@
+import asyncio
+import logging
+import threading
+from concurrent.futures import Executor
+
+from app.common.exceptions import ServiceUnavailableError
+
+logger = logging.getLogger(__name__)
+
+
+def create_slots(workers: int, queue_limit: int) -> threading.BoundedSemaphore:
+    """실행 중 + 대기 중인 작업 수 상한. workers + queue_limit를 넘으면 run_bounded가 즉시 503으로 거절합니다."""
+    return threading.BoundedSemaphore(max(workers, 1) + queue_limit)
+
+
+async def run_bounded(executor: Executor, slots: threading.BoundedSemaphore, func, *args):
+    """executor에서 func(*args)를 실행하고 결과를 기다립니다. 슬롯이 없으면 ServiceUnavailableError.
+
+    슬롯은 작업이 끝날 때 완료 콜백에서 반환하므로 요청이 취소되어도 작업이 도는 동안은 점유됩니다.
+    submit 자체가 실패하면(종료되었거나 깨진 풀) 슬롯을 바로 반환하고 예외를 올립니다.
+    """
+    if not slots.acquire(blocking=False):
+        logger.warning("%s 대기열이 가득 차 요청을 거절합니다.", getattr(func, "__name__", func))
+        raise ServiceUnavailableError()
+
+    try:
+        future = executor.submit(func, *args)
+    except BaseException:
+        slots.release()
+        raise
+    future.add_done_callback(lambda _: slots.release())
+    return await asyncio.wrap_future(future)
@@ -0,0 +1,150 @@
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory").strip().lower()
+CACHE_TTL_SECONDS = int(os.getenv("CACHE_TTL_SECONDS", "60"))
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "2048"))
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+
+class NullCache:
+    """캐시를 끈 상태. 항상 miss로 동작합니다."""
+
+    async def get(self, key: str) -> Any | None:
+        return None
+
+    async def set(self, key: str, value: Any, ttl: int | None = None) -> None:
+        return None
+
+    async def delete(self, *keys: str) -> None:
+        return None
+
+    async def incr(self, key: str) -> int:
+        return 0
+
+    async def clear(self) -> None:
+        return None
+
+    async def close(self) -> None:
+        return None
+
+
+class MemoryCache:
+    """프로세스 내 LRU + TTL 캐시.
+
+    값은 JSON 문자열로 저장해 호출자가 꺼낸 dict를 수정해도 캐시 원본이 바뀌지 않습니다.
+    무효화는 같은 프로세스에만 반영되므로 워커가 여러 개면 RedisCache를 사용하세요.
+    """
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES, default_ttl: int = CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        # 무효화용 세대 카운터는 LRU 축출 대상에서 제외합니다.
+        self._counters: dict[str, int] = {}
+
+    async def get(self, key: str) -> Any | None:
+        if key in self._counters:
+            return self._counters[key]
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, raw = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return json.loads(raw)
+
+    async def set(self, key: str, value: Any, ttl: int | None = None) -> None:
+        expires_at = time.monotonic() + (ttl or self.default_ttl)
+        self._entries[key] = (expires_at, json.dumps(value))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._entries.pop(key, None)
+
+    async def incr(self, key: str) -> int:
+        self._counters[key] = self._counters.get(key, 0) + 1
+        return self._counters[key]
+
+    async def clear(self) -> None:
+        self._entries.clear()
+        self._counters.clear()
+
+    async def close(self) -> None:
+        return None
+
+
+class RedisCache:
+    """Redis 백엔드. 장애 시 예외를 올리지 않고 miss로 처리해 DB 경로로 넘어갑니다."""
+
+    def __init__(self, url: str = REDIS_URL, default_ttl: int = CACHE_TTL_SECONDS, prefix: str = "community:"):
+        try:
+            import redis.asyncio as redis_asyncio
+        except ImportError as exc:  # pragma: no cover - redis 미설치 환경
+            raise RuntimeError("CACHE_BACKEND=redis 를 사용하려면 redis 패키지가 필요합니다.") from exc
+
+        self.default_ttl = default_ttl
+        self.prefix = prefix
+        self._client = redis_asyncio.from_url(url, decode_responses=True)
+
+    async def get(self, key: str) -> Any | None:
+        try:
+            raw = await self._client.get(self.prefix + key)
+        except Exception as exc:
+            logger.warning("Redis cache get failed: %s", exc)
+            return None
+        return json.loads(raw) if raw is not None else None
+
+    async def set(self, key: str, value: Any, ttl: int | None = None) -> None:
+        try:
+            await self._client.set(self.prefix + key, json.dumps(value), ex=ttl or self.default_ttl)
+        except Exception as exc:
+            logger.warning("Redis cache set failed: %s", exc)
+
+    async def delete(self, *keys: str) -> None:
+        if not keys:
+            return
+        try:
+            await self._client.delete(*[self.prefix + key for key in keys])
+        except Exception as exc:
+            logger.warning("Redis cache delete failed: %s", exc)
+
+    async def incr(self, key: str) -> int:
+        try:
+            return await self._client.incr(self.prefix + key)
+        except Exception as exc:
+            logger.warning("Redis cache incr failed: %s", exc)
+            return 0
+
+    async def clear(self) -> None:
+        try:
+            keys = [key async for key in self._client.scan_iter(match=self.prefix + "*")]
+            if keys:
+                await self._client.delete(*keys)
+        except Exception as exc:
+            logger.warning("Redis cache clear failed: %s", exc)
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+def create_cache(backend: str = CACHE_BACKEND):
+    if backend == "redis":
+        return RedisCache()
+    if backend in {"none", "off", ""}:
+        return NullCache()
+    return MemoryCache()
+
+
+cache = create_cache()
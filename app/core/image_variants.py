@@ -0,0 +1,135 @@
+import importlib.util
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+from app.common.exceptions import ServiceUnavailableError
+from app.core.bounded_pool import create_slots, run_bounded
+
+logger = logging.getLogger(__name__)
+
+# 목록/상세에서 srcset으로 쓰는 폭(px). 원본보다 큰 폭은 만들지 않습니다.
+IMAGE_VARIANT_WIDTHS = {"thumb": 320, "medium": 960}
+# webp | avif. AVIF는 더 작지만 인코딩이 수 배 느립니다.
+IMAGE_VARIANT_FORMAT = os.getenv("IMAGE_VARIANT_FORMAT", "webp").strip().lower()
+IMAGE_VARIANT_QUALITY = int(os.getenv("IMAGE_VARIANT_QUALITY", "80"))
+# 디코딩/리사이즈는 CPU 작업이라 별도 프로세스에서 실행합니다. 0이면 프로세스 대신 스레드 하나를 씁니다
+# (AWS Lambda처럼 multiprocessing을 쓸 수 없는 환경).
+IMAGE_WORKERS = int(os.getenv("IMAGE_WORKERS", str(min(2, os.cpu_count() or 1))))
+IMAGE_QUEUE_LIMIT = int(os.getenv("IMAGE_QUEUE_LIMIT", "16"))
+
+PILLOW_AVAILABLE = importlib.util.find_spec("PIL") is not None
+
+_executor: Executor | None = None
+_executor_lock = threading.Lock()
+_slots = create_slots(IMAGE_WORKERS, IMAGE_QUEUE_LIMIT)
+
+
+def variant_filename(source_name: str, width: int, image_format: str = IMAGE_VARIANT_FORMAT) -> str:
+    """원본 파일명 옆에 두는 파생 파일명. ("abc.png", 320) → "abc.w320.webp" """
+    return f"{Path(source_name).stem}.w{width}.{image_format}"
+
+
+def render_variants(source: str, widths: dict[str, int], image_format: str, quality: int) -> dict:
+    """원본을 읽어 폭별 파생 이미지를 원본과 같은 디렉터리에 저장합니다. 워커 프로세스에서 실행됩니다.
+
+    반환값: {"width", "height", "variants": [{"name", "file", "width", "height", "format"}]}
+    """
+    from PIL import Image, ImageOps
+
+    source_path = Path(source)
+    with Image.open(source_path) as original:
+        # 휴대폰 사진은 EXIF 회전 정보를 반영해야 가로/세로가 맞습니다. GIF는 첫 프레임만 사용합니다.
+        image = ImageOps.exif_transpose(original)
+        width, height = image.size
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "transparency" in image.info or image.mode in ("LA", "PA") else "RGB")
+
+        variants = []
+        rendered_widths: set[int] = set()
+        for name, target_width in sorted(widths.items(), key=lambda item: item[1]):
+            target_width = min(target_width, width)
+            if target_width in rendered_widths:
+                continue
+            rendered_widths.add(target_width)
+            target_height = max(1, round(height * target_width / width))
+            resized = image if target_width == width else image.resize((target_width, target_height), Image.LANCZOS)
+            filename = variant_filename(source_path.name, target_width, image_format)
+            resized.save(source_path.with_name(filename), format=image_format.upper(), quality=quality)
+            variants.append(
+                {
+                    "name": name,
+                    "file": filename,
+                    "width": target_width,
+                    "height": target_height,
+                    "format": image_format,
+                }
+            )
+    return {"width": width, "height": height, "variants": variants}
+
+
+def _get_executor() -> Executor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            if IMAGE_WORKERS > 0:
+                # fork는 이벤트 루프/DB 연결까지 복제하므로 spawn으로 깨끗한 워커를 띄웁니다.
+                _executor = ProcessPoolExecutor(
+                    max_workers=IMAGE_WORKERS, mp_context=multiprocessing.get_context("spawn")
+                )
+            else:
+                _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="image-variants")
+        return _executor
+
+
+def _discard_executor(broken: Executor) -> None:
+    """워커 프로세스가 죽어 깨진 풀을 버려, 다음 _get_executor()가 새 풀을 만들게 합니다."""
+    global _executor
+    with _executor_lock:
+        if _executor is broken:
+            _executor = None
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+async def create_variants(source: Path) -> dict | None:
+    """source의 파생 이미지를 워커 풀에서 만듭니다.
+
+    Pillow가 없거나 이미지로 읽을 수 없는 파일이면 None(원본만 사용). 대기열이 가득 차면 ServiceUnavailableError.
+    워커가 죽어(OOM 등) 풀이 깨졌으면 새 풀로 한 번 더 시도하고, 그래도 실패하면 None입니다.
+    """
+    if not PILLOW_AVAILABLE:
+        logger.warning("Pillow가 설치되어 있지 않아 이미지 파생본을 만들지 않습니다.")
+        return None
+    for attempt in range(2):
+        executor = _get_executor()
+        try:
+            return await run_bounded(
+                executor,
+                _slots,
+                render_variants,
+                str(source),
+                IMAGE_VARIANT_WIDTHS,
+                IMAGE_VARIANT_FORMAT,
+                IMAGE_VARIANT_QUALITY,
+            )
+        except ServiceUnavailableError:
+            raise
+        except BrokenProcessPool as exc:
+            logger.warning("이미지 워커 풀이 깨져 새로 만듭니다 (%s, 시도 %d): %s", source.name, attempt + 1, exc)
+            _discard_executor(executor)
+        except Exception as exc:
+            logger.warning("이미지 파생본 생성 실패 (%s): %s", source.name, exc)
+            return None
+    return None
+
+
+def shutdown() -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
@@ -1,5 +1,6 @@
 import logging
 import os
+import re
 import sys
 from types import FrameType
 from typing import cast
@@ -26,6 +27,20 @@ class InterceptHandler(logging.Handler):
         )
 
 
+# WebSocket/SSE는 access token을 ?token= 쿼리로 받을 수 있어, uvicorn이 남기는 요청 경로에서 값을 가립니다.
+_TOKEN_QUERY_PATTERN = re.compile(r"([?&]token=)[^&\s\"]*")
+
+
+class RedactTokenQueryFilter(logging.Filter):
+    def filter(self, record: logging.LogRecord) -> bool:
+        if isinstance(record.args, tuple):
+            record.args = tuple(
+                _TOKEN_QUERY_PATTERN.sub(r"\1[redacted]", arg) if isinstance(arg, str) else arg
+                for arg in record.args
+            )
+        return True
+
+
 def setup_logging() -> None:
     # intercept everything at the root logger
     logging.root.handlers = [InterceptHandler()]
@@ -37,6 +52,12 @@ def setup_logging() -> None:
         logging.getLogger(name).handlers = []
         logging.getLogger(name).propagate = True
 
+    # uvicorn.access는 HTTP 요청 줄을, uvicorn.error는 WebSocket 연결 줄을 남깁니다.
+    for name in ("uvicorn.access", "uvicorn.error"):
+        uvicorn_logger = logging.getLogger(name)
+        if not any(isinstance(existing, RedactTokenQueryFilter) for existing in uvicorn_logger.filters):
+            uvicorn_logger.addFilter(RedactTokenQueryFilter())
+
     log_file_path = os.getenv("APP_LOG_FILE", "debug.log").strip()
 
     handlers = [{"sink": sys.stdout, "serialize": False}]
@@ -0,0 +1,163 @@
+import asyncio
+import json
+import logging
+import os
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from app.core.cache import REDIS_URL
+
+logger = logging.getLogger(__name__)
+
+PUBSUB_BACKEND = os.getenv("PUBSUB_BACKEND", "memory").strip().lower()
+SUBSCRIPTION_QUEUE_SIZE = int(os.getenv("PUBSUB_SUBSCRIPTION_QUEUE_SIZE", "100"))
+
+
+class Subscription:
+    """채널 하나에 대한 구독. 느린 소비자는 가장 오래된 이벤트부터 버립니다."""
+
+    def __init__(self, channel: str, maxsize: int = SUBSCRIPTION_QUEUE_SIZE):
+        self.channel = channel
+        self._queue: asyncio.Queue[dict] = asyncio.Queue(maxsize=maxsize)
+
+    def deliver(self, event: dict) -> None:
+        if self._queue.full():
+            self._queue.get_nowait()
+            logger.warning("Subscription queue full on %s; dropping oldest event", self.channel)
+        self._queue.put_nowait(event)
+
+    async def get(self) -> dict:
+        return await self._queue.get()
+
+
+class MemoryHub:
+    """단일 노드용 프로세스 내 pub/sub. publish는 같은 프로세스의 구독자에게만 전달됩니다."""
+
+    def __init__(self):
+        self._subscribers: dict[str, set[Subscription]] = {}
+
+    def _fan_out(self, channel: str, event: dict) -> None:
+        for subscription in list(self._subscribers.get(channel, ())):
+            subscription.deliver(event)
+
+    async def publish(self, channel: str, event: dict) -> None:
+        self._fan_out(channel, event)
+
+    @asynccontextmanager
+    async def subscribe(self, channel: str) -> AsyncIterator[Subscription]:
+        subscription = Subscription(channel)
+        self._subscribers.setdefault(channel, set()).add(subscription)
+        try:
+            yield subscription
+        finally:
+            subscribers = self._subscribers.get(channel)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[channel]
+
+    async def close(self) -> None:
+        return None
+
+
+class RedisHub(MemoryHub):
+    """여러 노드용 pub/sub. Redis PUBLISH로 보내고, 노드마다 pub/sub 연결 하나로 받아 로컬 구독자에게 나눠 줍니다.
+
+    이 노드에 구독자가 있는 채널만 SUBSCRIBE하므로(첫 구독자가 올 때 SUBSCRIBE, 마지막 구독자가 떠나면 UNSUBSCRIBE)
+    노드가 받는 메시지는 로컬 연결 수에 비례하고, 연결 수는 클라이언트 수와 무관하게 노드당 하나입니다.
+    """
+
+    def __init__(self, url: str = REDIS_URL, prefix: str = "community:pubsub:"):
+        try:
+            import redis.asyncio as redis_asyncio
+        except ImportError as exc:  # pragma: no cover - redis 미설치 환경
+            raise RuntimeError("PUBSUB_BACKEND=redis 를 사용하려면 redis 패키지가 필요합니다.") from exc
+
+        super().__init__()
+        self.prefix = prefix
+        self._client = redis_asyncio.from_url(url, decode_responses=True)
+        self._listener: asyncio.Task | None = None
+        self._pubsub = None
+        # Redis에 SUBSCRIBE되어 있는 채널. _subscribers(로컬 구독자가 있는 채널)에 맞춰 _sync_channel이 맞춥니다.
+        self._subscribed: set[str] = set()
+        self._lock = asyncio.Lock()
+
+    async def publish(self, channel: str, event: dict) -> None:
+        await self._client.publish(self.prefix + channel, json.dumps(event))
+
+    async def _sync_channel(self, channel: str) -> None:
+        """로컬 구독자 유무에 맞춰 채널을 SUBSCRIBE/UNSUBSCRIBE합니다. 실패하면 listener가 재연결하며 다시 맞춥니다."""
+        async with self._lock:
+            if self._pubsub is None:
+                return  # listener가 연결하면서 그 시점의 채널을 모두 구독합니다.
+            wanted = channel in self._subscribers
+            if wanted == (channel in self._subscribed):
+                return
+            try:
+                if wanted:
+                    await self._pubsub.subscribe(self.prefix + channel)
+                    self._subscribed.add(channel)
+                else:
+                    await self._pubsub.unsubscribe(self.prefix + channel)
+                    self._subscribed.discard(channel)
+            except Exception as exc:
+                logger.warning("Redis pub/sub %s update failed: %s", channel, exc)
+
+    async def _listen(self) -> None:
+        while True:
+            pubsub = self._client.pubsub()
+            try:
+                async with self._lock:
+                    self._pubsub = pubsub
+                    self._subscribed = set(self._subscribers)
+                    if self._subscribed:
+                        await pubsub.subscribe(*(self.prefix + channel for channel in self._subscribed))
+                while True:
+                    if pubsub.connection is None:
+                        # 아직 구독한 채널이 없어 연결이 없습니다.
+                        await asyncio.sleep(1)
+                        continue
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=None)
+                    if message is None or message.get("type") != "message":
+                        continue
+                    channel = message["channel"][len(self.prefix):]
+                    self._fan_out(channel, json.loads(message["data"]))
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("Redis pub/sub listener failed, reconnecting: %s", exc)
+                await asyncio.sleep(1)
+            finally:
+                self._pubsub = None
+                await pubsub.aclose()
+
+    @asynccontextmanager
+    async def subscribe(self, channel: str) -> AsyncIterator[Subscription]:
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen(), name="redis-pubsub-listener")
+        try:
+            async with super().subscribe(channel) as subscription:
+                await self._sync_channel(channel)
+                yield subscription
+        finally:
+            # 로컬 구독자를 지운 뒤에 맞춰야 마지막 구독자가 떠날 때 UNSUBSCRIBE됩니다.
+            await self._sync_channel(channel)
+
+    async def close(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        await self._client.aclose()
+
+
+def create_hub(backend: str = PUBSUB_BACKEND):
+    if backend == "redis":
+        return RedisHub()
+    return MemoryHub()
+
+
+message_hub = create_hub()
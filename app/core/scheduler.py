@@ -0,0 +1,50 @@
+import asyncio
+import inspect
+import logging
+from typing import Callable
+
+from starlette.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicJob:
+    """lifespan 동안 interval_seconds마다 func를 실행하는 백그라운드 작업.
+
+    코루틴 함수는 이벤트 루프에서 그대로 await 하고, 동기 함수는 threadpool에서 실행합니다.
+
+    interval_seconds가 0 이하이면 비활성화됩니다.
+    """
+
+    def __init__(self, name: str, interval_seconds: float, func: Callable[[], object]):
+        self.name = name
+        self.interval_seconds = interval_seconds
+        self.func = func
+        self._task: asyncio.Task | None = None
+
+    async def _run_forever(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                if inspect.iscoroutinefunction(self.func):
+                    await self.func()
+                else:
+                    await run_in_threadpool(self.func)
+            except Exception:
+                logger.exception("Periodic job %s failed", self.name)
+
+    def start(self) -> None:
+        if self.interval_seconds <= 0 or self._task is not None:
+            return
+        self._task = asyncio.create_task(self._run_forever(), name=self.name)
+        logger.info("Periodic job %s started (every %ss)", self.name, self.interval_seconds)
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
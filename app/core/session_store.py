@@ -0,0 +1,188 @@
+import logging
+import os
+import secrets
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import REDIS_URL
+from app.database import session_scope
+from app.db_models import Session
+
+logger = logging.getLogger(__name__)
+
+SESSION_STORE_BACKEND = os.getenv("SESSION_STORE_BACKEND", "sql").strip().lower()
+SESSION_PURGE_INTERVAL_SECONDS = float(os.getenv("SESSION_PURGE_INTERVAL_SECONDS", "3600"))
+
+
+def _new_token() -> str:
+    return secrets.token_urlsafe(32)
+
+
+def _as_aware(value: datetime) -> datetime:
+    # SQLite는 timezone-naive datetime을 저장하므로 비교 전 aware로 변환
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+class SqlSessionStore:
+    """sessions 테이블 저장소. 요청 트랜잭션(db) 안에서 동작해 로그인/갱신과 함께 커밋됩니다."""
+
+    async def create(self, db: AsyncSession, user_id: int, ttl_seconds: int) -> str:
+        token = _new_token()
+        expires_at = datetime.now(timezone.utc) + timedelta(seconds=ttl_seconds)
+        await db.execute(insert(Session).values(session_id=token, user_id=user_id, expires_at=expires_at))
+        return token
+
+    async def get_user_id(self, db: AsyncSession, token: str) -> int | None:
+        row = (
+            await db.execute(select(Session.user_id, Session.expires_at).where(Session.session_id == token))
+        ).first()
+        if not row or _as_aware(row.expires_at) <= datetime.now(timezone.utc):
+            return None
+        return row.user_id
+
+    async def rotate(self, db: AsyncSession, token: str, ttl_seconds: int) -> tuple[int, str] | None:
+        """기존 토큰을 지우고 새 토큰을 발급합니다. (user_id, 새 토큰) 또는 유효하지 않으면 None.
+
+        DELETE ... RETURNING 한 문장으로 조회와 삭제를 함께 하므로, 같은 토큰으로 동시에 갱신해도
+        한 요청만 성공합니다. 만료된 토큰도 이때 함께 지워집니다.
+        """
+        query = delete(Session).where(Session.session_id == token)
+        if db.bind.dialect.delete_returning:
+            row = (await db.execute(query.returning(Session.user_id, Session.expires_at))).first()
+        else:  # pragma: no cover - RETURNING 미지원 DB(MySQL)
+            row = (
+                await db.execute(select(Session.user_id, Session.expires_at).where(Session.session_id == token))
+            ).first()
+            if row and not (await db.execute(query)).rowcount:
+                row = None
+        if not row or _as_aware(row.expires_at) <= datetime.now(timezone.utc):
+            return None
+        return row.user_id, await self.create(db, row.user_id, ttl_seconds)
+
+    async def delete(self, db: AsyncSession, token: str) -> None:
+        await db.execute(delete(Session).where(Session.session_id == token))
+
+    async def purge_expired(self) -> int:
+        async with session_scope() as db:
+            result = await db.execute(delete(Session).where(Session.expires_at <= datetime.now(timezone.utc)))
+        return result.rowcount
+
+    async def clear(self) -> None:
+        return None
+
+    async def close(self) -> None:
+        return None
+
+
+class MemorySessionStore:
+    """프로세스 내 저장소. 단일 워커/개발용이며 재시작하면 모든 세션이 사라집니다."""
+
+    def __init__(self):
+        self._sessions: dict[str, tuple[int, float]] = {}
+
+    async def create(self, db: AsyncSession | None, user_id: int, ttl_seconds: int) -> str:
+        token = _new_token()
+        self._sessions[token] = (user_id, time.time() + ttl_seconds)
+        return token
+
+    async def get_user_id(self, db: AsyncSession | None, token: str) -> int | None:
+        entry = self._sessions.get(token)
+        if entry is None:
+            return None
+        user_id, expires_at = entry
+        if expires_at <= time.time():
+            del self._sessions[token]
+            return None
+        return user_id
+
+    async def rotate(self, db: AsyncSession | None, token: str, ttl_seconds: int) -> tuple[int, str] | None:
+        entry = self._sessions.pop(token, None)
+        if entry is None or entry[1] <= time.time():
+            return None
+        return entry[0], await self.create(db, entry[0], ttl_seconds)
+
+    async def delete(self, db: AsyncSession | None, token: str) -> None:
+        self._sessions.pop(token, None)
+
+    async def purge_expired(self) -> int:
+        now = time.time()
+        expired = [token for token, (_, expires_at) in self._sessions.items() if expires_at <= now]
+        for token in expired:
+            del self._sessions[token]
+        return len(expired)
+
+    async def clear(self) -> None:
+        self._sessions.clear()
+
+    async def close(self) -> None:
+        return None
+
+
+# 기존 키를 지우고 새 키를 같은 user_id로 만드는 작업을 한 번의 왕복으로 원자적으로 처리합니다.
+_ROTATE_SCRIPT = """
+local user_id = redis.call('GET', KEYS[1])
+if not user_id then
+    return false
+end
+redis.call('DEL', KEYS[1])
+redis.call('SET', KEYS[2], user_id, 'EX', ARGV[1])
+return user_id
+"""
+
+
+class RedisSessionStore:
+    """Redis 저장소. 세션마다 키 하나(EX=TTL)를 두어 만료는 Redis가 처리합니다."""
+
+    def __init__(self, url: str = REDIS_URL, prefix: str = "community:session:"):
+        try:
+            import redis.asyncio as redis_asyncio
+        except ImportError as exc:  # pragma: no cover - redis 미설치 환경
+            raise RuntimeError("SESSION_STORE_BACKEND=redis 를 사용하려면 redis 패키지가 필요합니다.") from exc
+
+        self.prefix = prefix
+        self._client = redis_asyncio.from_url(url, decode_responses=True)
+        self._rotate = self._client.register_script(_ROTATE_SCRIPT)
+
+    async def create(self, db: AsyncSession | None, user_id: int, ttl_seconds: int) -> str:
+        token = _new_token()
+        await self._client.set(self.prefix + token, user_id, ex=ttl_seconds)
+        return token
+
+    async def get_user_id(self, db: AsyncSession | None, token: str) -> int | None:
+        user_id = await self._client.get(self.prefix + token)
+        return int(user_id) if user_id is not None else None
+
+    async def rotate(self, db: AsyncSession | None, token: str, ttl_seconds: int) -> tuple[int, str] | None:
+        new_token = _new_token()
+        user_id = await self._rotate(keys=[self.prefix + token, self.prefix + new_token], args=[ttl_seconds])
+        if user_id is None:
+            return None
+        return int(user_id), new_token
+
+    async def delete(self, db: AsyncSession | None, token: str) -> None:
+        await self._client.delete(self.prefix + token)
+
+    async def purge_expired(self) -> int:
+        return 0
+
+    async def clear(self) -> None:
+        keys = [key async for key in self._client.scan_iter(match=self.prefix + "*")]
+        if keys:
+            await self._client.delete(*keys)
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+def create_session_store(backend: str = SESSION_STORE_BACKEND):
+    if backend == "redis":
+        return RedisSessionStore()
+    if backend == "memory":
+        return MemorySessionStore()
+    return SqlSessionStore()
+
+
+session_store = create_session_store()
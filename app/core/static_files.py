@@ -0,0 +1,117 @@
+import mimetypes
+import os
+import re
+from pathlib import Path
+
+from starlette.datastructures import Headers
+from starlette.exceptions import HTTPException
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+# 내용 해시 키(<sha256>.ext)와 그 파생본(<sha256>.w320.webp)의 파일명
+_CONTENT_HASH_NAME = re.compile(r"^([0-9a-f]{64}(?:\.w\d+)?)\.[a-z0-9]+$")
+# Accept-Encoding에 따라 옆에 미리 압축해 둔 파일(<name>.br, <name>.gz)을 우선합니다.
+_PRECOMPRESSED_SUFFIXES = (("br", ".br"), ("gzip", ".gz"))
+
+
+def _accepted_encodings(request_headers: Headers) -> set[str]:
+    """Accept-Encoding에서 q=0(거부)이 아닌 인코딩 이름들."""
+    encodings = set()
+    for item in request_headers.get("accept-encoding", "").split(","):
+        name, *params = [part.strip() for part in item.split(";")]
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if name and quality > 0:
+            encodings.add(name.lower())
+    return encodings
+
+
+class CachedStaticFiles(StaticFiles):
+    """Cache-Control, 내용 기반 ETag, 미리 압축한 파일을 지원하는 StaticFiles.
+
+    조건부 요청(If-None-Match → 304), Range(206), 서버가 지원하면 pathsend(sendfile)는 StaticFiles/FileResponse가
+    처리합니다. 여기서는 그 응답이 쓰는 헤더만 정합니다.
+
+    - cache_control: 모든 파일 응답(304 포함)에 붙일 Cache-Control
+    - content_etags: 파일명이 내용 해시면 ETag를 그 해시로 둡니다. mtime 기반 기본 ETag와 달리 서버/배포가 달라도 같습니다.
+    - precompressed: 옆에 .br/.gz 파일이 있으면 Accept-Encoding에 맞춰 대신 보냅니다.
+    - hidden_dirs: 서빙하지 않을 최상위 디렉터리(업로드 작업 디렉터리 등)
+    """
+
+    def __init__(
+        self,
+        *,
+        directory: str | os.PathLike,
+        cache_control: str | None = None,
+        content_etags: bool = False,
+        precompressed: bool = False,
+        hidden_dirs: tuple[str, ...] = (),
+        **kwargs,
+    ):
+        super().__init__(directory=directory, **kwargs)
+        self.cache_control = cache_control
+        self.content_etags = content_etags
+        self.precompressed = precompressed
+        self.hidden_dirs = set(hidden_dirs)
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        parts = Path(path).parts
+        if parts and parts[0] in self.hidden_dirs:
+            raise HTTPException(status_code=404)
+        return await super().get_response(path, scope)
+
+    def _precompressed_file(self, full_path: str, request_headers: Headers) -> tuple[str, str, os.stat_result] | None:
+        accepted = _accepted_encodings(request_headers)
+        for encoding, suffix in _PRECOMPRESSED_SUFFIXES:
+            if encoding in accepted or "*" in accepted:
+                try:
+                    stat_result = os.stat(full_path + suffix)
+                except OSError:
+                    continue
+                return encoding, full_path + suffix, stat_result
+        return None
+
+    def file_response(
+        self,
+        full_path: str | os.PathLike,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        request_headers = Headers(scope=scope)
+        full_path = str(full_path)
+        headers: dict[str, str] = {}
+        if self.cache_control:
+            headers["cache-control"] = self.cache_control
+
+        etag = None
+        if self.content_etags and (match := _CONTENT_HASH_NAME.match(os.path.basename(full_path))):
+            etag = match.group(1)
+
+        media_type = None
+        if self.precompressed:
+            headers["vary"] = "Accept-Encoding"
+            encoded = self._precompressed_file(full_path, request_headers)
+            if encoded is not None:
+                encoding, encoded_path, encoded_stat = encoded
+                media_type = mimetypes.guess_type(full_path)[0] or "application/octet-stream"
+                headers["content-encoding"] = encoding
+                etag = f"{etag}-{encoding}" if etag else None
+                full_path, stat_result = encoded_path, encoded_stat
+        if etag:
+            # FileResponse는 etag가 이미 있으면 mtime 기반 값으로 덮어쓰지 않습니다.
+            headers["etag"] = f'"{etag}"'
+
+        response = FileResponse(
+            full_path, status_code=status_code, stat_result=stat_result, headers=headers, media_type=media_type
+        )
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
@@ -0,0 +1,264 @@
+import base64
+import functools
+import logging
+import os
+import shutil
+import tempfile
+import time
+import uuid
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator
+
+import anyio
+import jwt
+
+from app.common.jwt_tokens import JWT_ALGORITHM, JWT_SECRET_KEY
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_STORAGE_BACKEND = os.getenv("UPLOAD_STORAGE_BACKEND", "local").strip().lower()
+UPLOAD_DIR = Path("uploads")
+UPLOAD_URL_PREFIX = "/uploads/"
+# 업로드를 받거나 파생본을 만들 때 쓰는 로컬 작업 디렉터리. 비우면 local은 uploads/tmp(같은 파일시스템이라
+# rename이 원자적), s3는 시스템 임시 디렉터리(Lambda는 /tmp만 쓰기 가능)를 씁니다.
+UPLOAD_TEMP_DIR = os.getenv("UPLOAD_TEMP_DIR", "")
+PRESIGNED_UPLOAD_TTL_SECONDS = int(os.getenv("PRESIGNED_UPLOAD_TTL_SECONDS", "600"))
+
+S3_BUCKET = os.getenv("S3_BUCKET", "")
+S3_REGION = os.getenv("S3_REGION", "ap-northeast-2")
+# MinIO 등 S3 호환 저장소 주소. 서버에서 접근하는 주소와 브라우저가 접근하는 주소가 다르면 PUBLIC을 따로 지정합니다.
+S3_ENDPOINT_URL = os.getenv("S3_ENDPOINT_URL") or None
+S3_PUBLIC_ENDPOINT_URL = os.getenv("S3_PUBLIC_ENDPOINT_URL") or S3_ENDPOINT_URL
+# 이미지 URL 앞부분(CDN 주소 등). 비우면 버킷 주소를 씁니다.
+S3_PUBLIC_BASE_URL = os.getenv("S3_PUBLIC_BASE_URL", "")
+
+# 키가 내용 해시이므로 같은 URL의 내용은 바뀌지 않습니다.
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# 같은 확장자를 하나로 맞춰 같은 내용이 다른 키로 저장되지 않게 합니다.
+_EXTENSION_ALIASES = {".jpeg": ".jpg"}
+
+
+def content_key(sha256: str, ext: str) -> str:
+    """내용 해시 기반 저장 키. 디렉터리당 파일 수를 줄이려 앞 4글자로 두 단계 샤딩합니다. ("ab/cd/abcd...png")"""
+    ext = _EXTENSION_ALIASES.get(ext.lower(), ext.lower())
+    return f"{sha256[:2]}/{sha256[2:4]}/{sha256}{ext}"
+
+
+def _is_safe_key(key: str) -> bool:
+    return bool(key) and not key.startswith("/") and ".." not in key.split("/")
+
+
+def create_upload_token(key: str, size: int, sha256: str, content_type: str) -> str:
+    """local 저장소의 직접 업로드 URL에 넣는 서명 토큰. S3의 presigned URL과 같은 역할입니다."""
+    payload = {
+        "type": "upload",
+        "key": key,
+        "size": size,
+        "sha256": sha256,
+        "content_type": content_type,
+        "exp": int(time.time()) + PRESIGNED_UPLOAD_TTL_SECONDS,
+    }
+    return jwt.encode(payload, JWT_SECRET_KEY, algorithm=JWT_ALGORITHM)
+
+
+def decode_upload_token(token: str) -> dict | None:
+    try:
+        payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
+    except jwt.PyJWTError:
+        return None
+    if payload.get("type") != "upload" or not _is_safe_key(payload.get("key") or ""):
+        return None
+    return payload
+
+
+class LocalStorage:
+    """로컬 디스크 저장소. 단일 서버/개발용이며 /uploads 경로로 API 프로세스가 직접 서빙합니다."""
+
+    def __init__(self, root: Path = UPLOAD_DIR, url_prefix: str = UPLOAD_URL_PREFIX):
+        self.root = Path(root)
+        self.url_prefix = url_prefix
+        self.temp_dir = Path(UPLOAD_TEMP_DIR) if UPLOAD_TEMP_DIR else self.root / "tmp"
+
+    def url_for(self, key: str) -> str:
+        return self.url_prefix + key
+
+    def key_for_url(self, url: str | None) -> str | None:
+        """이 저장소의 URL이면 저장 키, 외부 URL이면 None."""
+        if not url or not url.startswith(self.url_prefix):
+            return None
+        key = url[len(self.url_prefix):]
+        return key if _is_safe_key(key) else None
+
+    def path_for(self, key: str) -> Path:
+        return self.root / key
+
+    async def size(self, key: str) -> int | None:
+        try:
+            return (await anyio.Path(self.path_for(key)).stat()).st_size
+        except FileNotFoundError:
+            return None
+
+    async def save_file(self, source: Path, key: str, content_type: str) -> bool:
+        """source를 key로 옮깁니다. 같은 키(=같은 내용)가 이미 있으면 source만 지우고 False."""
+        target = self.path_for(key)
+        if await anyio.Path(target).exists():
+            await anyio.Path(source).unlink(missing_ok=True)
+            return False
+        await anyio.Path(target.parent).mkdir(parents=True, exist_ok=True)
+        await anyio.to_thread.run_sync(os.replace, source, target)
+        return True
+
+    async def download(self, key: str, destination: Path) -> None:
+        await anyio.to_thread.run_sync(shutil.copyfile, self.path_for(key), destination)
+
+    async def delete(self, keys) -> None:
+        for key in keys:
+            try:
+                await anyio.Path(self.path_for(key)).unlink(missing_ok=True)
+            except OSError as exc:
+                logger.warning("업로드 파일 삭제 실패 (%s): %s", key, exc)
+
+    async def presign_upload(self, key: str, size: int, sha256: str, content_type: str) -> dict:
+        token = create_upload_token(key, size, sha256, content_type)
+        return {"method": "PUT", "url": f"/images/direct/{token}", "headers": {"Content-Type": content_type}}
+
+    async def close(self) -> None:
+        return None
+
+
+class S3Storage:
+    """S3 호환 저장소(AWS S3, MinIO). 여러 ECS 태스크/Lambda가 같은 버킷을 공유하고,
+    브라우저는 presigned URL로 버킷에 직접 올리므로 이미지 바이트가 API를 거치지 않습니다.
+    """
+
+    def __init__(
+        self,
+        bucket: str = S3_BUCKET,
+        region: str = S3_REGION,
+        endpoint_url: str | None = S3_ENDPOINT_URL,
+        public_endpoint_url: str | None = S3_PUBLIC_ENDPOINT_URL,
+        public_base_url: str = S3_PUBLIC_BASE_URL,
+    ):
+        try:
+            import boto3
+            from botocore.config import Config
+            from botocore.exceptions import ClientError
+        except ImportError as exc:  # pragma: no cover - boto3 미설치 환경
+            raise RuntimeError("UPLOAD_STORAGE_BACKEND=s3 를 사용하려면 boto3 패키지가 필요합니다.") from exc
+        if not bucket:
+            raise RuntimeError("UPLOAD_STORAGE_BACKEND=s3 를 사용하려면 S3_BUCKET이 필요합니다.")
+
+        config = Config(signature_version="s3v4", s3={"addressing_style": "path" if endpoint_url else "auto"})
+        self.bucket = bucket
+        self._client_error = ClientError
+        self._client = boto3.client("s3", region_name=region, endpoint_url=endpoint_url, config=config)
+        # 서명은 호스트를 포함하므로 브라우저가 접근하는 주소로 만든 클라이언트로 presign합니다(네트워크 호출 없음).
+        self._presign_client = (
+            self._client
+            if public_endpoint_url == endpoint_url
+            else boto3.client("s3", region_name=region, endpoint_url=public_endpoint_url, config=config)
+        )
+        if public_base_url:
+            self.public_base_url = public_base_url.rstrip("/") + "/"
+        elif public_endpoint_url:
+            self.public_base_url = f"{public_endpoint_url.rstrip('/')}/{bucket}/"
+        else:
+            self.public_base_url = f"https://{bucket}.s3.{region}.amazonaws.com/"
+        self.temp_dir = Path(UPLOAD_TEMP_DIR or tempfile.gettempdir()) / "community-uploads"
+
+    async def _call(self, method, **kwargs):
+        return await anyio.to_thread.run_sync(functools.partial(method, **kwargs))
+
+    def url_for(self, key: str) -> str:
+        return self.public_base_url + key
+
+    def key_for_url(self, url: str | None) -> str | None:
+        if not url or not url.startswith(self.public_base_url):
+            return None
+        key = url[len(self.public_base_url):]
+        return key if _is_safe_key(key) else None
+
+    async def size(self, key: str) -> int | None:
+        try:
+            head = await self._call(self._client.head_object, Bucket=self.bucket, Key=key)
+        except self._client_error as exc:
+            if exc.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return None
+            raise
+        return head["ContentLength"]
+
+    async def save_file(self, source: Path, key: str, content_type: str) -> bool:
+        try:
+            if await self.size(key) is not None:
+                return False
+            await self._call(
+                self._client.upload_file,
+                Filename=str(source),
+                Bucket=self.bucket,
+                Key=key,
+                ExtraArgs={"ContentType": content_type, "CacheControl": IMMUTABLE_CACHE_CONTROL},
+            )
+            return True
+        finally:
+            await anyio.Path(source).unlink(missing_ok=True)
+
+    async def download(self, key: str, destination: Path) -> None:
+        await self._call(self._client.download_file, Bucket=self.bucket, Key=key, Filename=str(destination))
+
+    async def delete(self, keys) -> None:
+        keys = list(keys)
+        for start in range(0, len(keys), 1000):  # DeleteObjects 한 번에 최대 1000개
+            batch = [{"Key": key} for key in keys[start:start + 1000]]
+            try:
+                await self._call(
+                    self._client.delete_objects, Bucket=self.bucket, Delete={"Objects": batch, "Quiet": True}
+                )
+            except self._client_error as exc:
+                logger.warning("S3 객체 삭제 실패 (%d개): %s", len(batch), exc)
+
+    async def presign_upload(self, key: str, size: int, sha256: str, content_type: str) -> dict:
+        """PUT presigned URL. 크기/Content-Type/SHA-256 체크섬을 서명에 넣어 S3가 다른 내용을 거절합니다."""
+        checksum = base64.b64encode(bytes.fromhex(sha256)).decode()
+        url = self._presign_client.generate_presigned_url(
+            "put_object",
+            Params={
+                "Bucket": self.bucket,
+                "Key": key,
+                "ContentType": content_type,
+                "ContentLength": size,
+                "ChecksumSHA256": checksum,
+                "CacheControl": IMMUTABLE_CACHE_CONTROL,
+            },
+            ExpiresIn=PRESIGNED_UPLOAD_TTL_SECONDS,
+        )
+        headers = {
+            "Content-Type": content_type,
+            "Cache-Control": IMMUTABLE_CACHE_CONTROL,
+            "x-amz-checksum-sha256": checksum,
+        }
+        return {"method": "PUT", "url": url, "headers": headers}
+
+    async def close(self) -> None:
+        await anyio.to_thread.run_sync(self._client.close)
+
+
+@asynccontextmanager
+async def work_dir() -> AsyncIterator[Path]:
+    """요청 하나가 쓰는 임시 디렉터리. 끝나면 안에 남은 파일과 함께 지웁니다."""
+    path = storage.temp_dir / uuid.uuid4().hex
+    await anyio.Path(path).mkdir(parents=True, exist_ok=True)
+    try:
+        yield path
+    finally:
+        await anyio.to_thread.run_sync(functools.partial(shutil.rmtree, path, ignore_errors=True))
+
+
+def create_storage(backend: str = UPLOAD_STORAGE_BACKEND):
+    if backend == "s3":
+        return S3Storage()
+    return LocalStorage()
+
+
+storage = create_storage()
@@ -0,0 +1,182 @@
+import asyncio
+import logging
+import os
+import uuid
+from abc import ABC, abstractmethod
+from typing import Awaitable, Callable
+
+from app.core.cache import REDIS_URL
+
+logger = logging.getLogger(__name__)
+
+VIEW_COUNT_BACKEND = os.getenv("VIEW_COUNT_BACKEND", "memory").strip().lower()
+VIEW_COUNT_FLUSH_INTERVAL_SECONDS = float(os.getenv("VIEW_COUNT_FLUSH_INTERVAL_SECONDS", "10"))
+VIEW_COUNT_FLUSH_EVENTS = int(os.getenv("VIEW_COUNT_FLUSH_EVENTS", "1000"))
+
+ApplyCounts = Callable[[dict[int, int]], Awaitable[object]]
+
+
+class _BufferedCounter(ABC):
+    """조회수 증가분을 모아 두었다가 apply로 한 번에 반영하는 누산기의 공통 동작.
+
+    interval마다 PeriodicJob이 flush()를 호출하고, 이 프로세스에서 flush_events건이 쌓이면
+    즉시 flush를 예약합니다. 반영에 실패한 증가분은 다시 버퍼로 되돌립니다.
+    """
+
+    def __init__(self, apply: ApplyCounts, flush_events: int = VIEW_COUNT_FLUSH_EVENTS):
+        self.apply = apply
+        self.flush_events = flush_events
+        self._events_since_flush = 0
+        self._flush_lock = asyncio.Lock()
+        self._flush_task: asyncio.Task | None = None
+
+    async def add(self, key: int, amount: int = 1) -> None:
+        await self._incr(key, amount)
+        self._events_since_flush += amount
+        if self.flush_events > 0 and self._events_since_flush >= self.flush_events:
+            self._events_since_flush = 0
+            if self._flush_task is None or self._flush_task.done():
+                self._flush_task = asyncio.create_task(self.flush())
+                self._flush_task.add_done_callback(_log_flush_failure)
+
+    async def flush(self) -> int:
+        """쌓인 증가분을 apply로 반영하고 반영한 키 개수를 반환합니다."""
+        async with self._flush_lock:
+            counts = await self._drain()
+            if not counts:
+                return 0
+            try:
+                await self.apply(counts)
+            except Exception:
+                logger.exception("View count flush failed; re-queueing %d posts", len(counts))
+                for key, amount in counts.items():
+                    await self._incr(key, amount)
+                raise
+            return len(counts)
+
+    @abstractmethod
+    async def pending(self, key: int) -> int:
+        ...
+
+    @abstractmethod
+    async def pending_many(self, keys: list[int]) -> dict[int, int]:
+        """{key: 아직 flush되지 않은 증가분}. 증가분이 없는 키는 빠질 수 있습니다."""
+
+    async def clear(self) -> None:
+        await self._drain()
+        self._events_since_flush = 0
+
+    async def close(self) -> None:
+        return None
+
+    @abstractmethod
+    async def _incr(self, key: int, amount: int) -> None:
+        ...
+
+    @abstractmethod
+    async def _drain(self) -> dict[int, int]:
+        ...
+
+
+def _log_flush_failure(task: asyncio.Task) -> None:
+    """add()가 예약한 flush는 기다리는 곳이 없으므로 실패를 여기서 꺼내 로그로 남깁니다."""
+    if task.cancelled():
+        return
+    exc = task.exception()
+    if exc is not None:
+        logger.error("Scheduled view count flush failed", exc_info=exc)
+
+
+class MemoryViewCounter(_BufferedCounter):
+    """프로세스 내 누산기. 워커마다 따로 쌓이고 각자 flush 합니다."""
+
+    def __init__(self, apply: ApplyCounts, flush_events: int = VIEW_COUNT_FLUSH_EVENTS):
+        super().__init__(apply, flush_events)
+        self._counts: dict[int, int] = {}
+
+    async def pending(self, key: int) -> int:
+        return self._counts.get(key, 0)
+
+    async def pending_many(self, keys: list[int]) -> dict[int, int]:
+        return {key: self._counts[key] for key in keys if key in self._counts}
+
+    async def _incr(self, key: int, amount: int) -> None:
+        self._counts[key] = self._counts.get(key, 0) + amount
+
+    async def _drain(self) -> dict[int, int]:
+        counts, self._counts = self._counts, {}
+        return counts
+
+
+class RedisViewCounter(_BufferedCounter):
+    """Redis 해시(HINCRBY)에 누적해 여러 워커가 하나의 버퍼를 공유합니다.
+
+    flush 시 해시를 임시 키로 RENAME 해 원자적으로 떼어 낸 뒤 반영합니다.
+    """
+
+    def __init__(
+        self,
+        apply: ApplyCounts,
+        flush_events: int = VIEW_COUNT_FLUSH_EVENTS,
+        url: str = REDIS_URL,
+        key: str = "community:views:pending",
+    ):
+        try:
+            import redis.asyncio as redis_asyncio
+        except ImportError as exc:  # pragma: no cover - redis 미설치 환경
+            raise RuntimeError("VIEW_COUNT_BACKEND=redis 를 사용하려면 redis 패키지가 필요합니다.") from exc
+
+        super().__init__(apply, flush_events)
+        self.key = key
+        self._client = redis_asyncio.from_url(url, decode_responses=True)
+
+    async def pending(self, key: int) -> int:
+        try:
+            return int(await self._client.hget(self.key, str(key)) or 0)
+        except Exception as exc:
+            logger.warning("Redis view counter read failed: %s", exc)
+            return 0
+
+    async def pending_many(self, keys: list[int]) -> dict[int, int]:
+        if not keys:
+            return {}
+        try:
+            values = await self._client.hmget(self.key, [str(key) for key in keys])
+        except Exception as exc:
+            logger.warning("Redis view counter read failed: %s", exc)
+            return {}
+        return {key: int(value) for key, value in zip(keys, values) if value}
+
+    async def _incr(self, key: int, amount: int) -> None:
+        # 조회수 때문에 게시글 조회가 실패하지 않도록 Redis 장애 시 증가분은 버립니다.
+        try:
+            await self._client.hincrby(self.key, str(key), amount)
+        except Exception as exc:
+            logger.warning("Redis view counter increment failed; dropping %d views of post %s: %s", amount, key, exc)
+
+    async def _drain(self) -> dict[int, int]:
+        flushing_key = f"{self.key}:flushing:{uuid.uuid4().hex}"
+        if not await self._rename(flushing_key):
+            return {}
+        raw = await self._client.hgetall(flushing_key)
+        await self._client.delete(flushing_key)
+        return {int(post_id): int(amount) for post_id, amount in raw.items()}
+
+    async def _rename(self, flushing_key: str) -> bool:
+        if not await self._client.exists(self.key):
+            return False
+        try:
+            await self._client.rename(self.key, flushing_key)
+        except Exception:
+            # exists 확인 직후 다른 워커가 먼저 가져간 경우
+            return False
+        return True
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+def create_view_counter(apply: ApplyCounts, backend: str = VIEW_COUNT_BACKEND) -> _BufferedCounter:
+    if backend == "redis":
+        return RedisViewCounter(apply)
+    return MemoryViewCounter(apply)
@@ -1,23 +1,97 @@
+import logging
 import os
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
 
+logger = logging.getLogger(__name__)
+
 DEFAULT_SQLITE_URL = "sqlite:///./community.db"
 SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL", DEFAULT_SQLITE_URL)
 
+# 동기 드라이버 URL을 같은 DB의 asyncio 드라이버 URL로 매핑합니다.
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "mysql": "mysql+aiomysql",
+    "mysql+pymysql": "mysql+aiomysql",
+}
+
+
+def to_async_url(url: str) -> str:
+    parsed = make_url(url)
+    drivername = ASYNC_DRIVERS.get(parsed.drivername, parsed.drivername)
+    return parsed.set(drivername=drivername).render_as_string(hide_password=False)
+
+
+ASYNC_SQLALCHEMY_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or to_async_url(SQLALCHEMY_DATABASE_URL)
+
 engine_kwargs = {"pool_pre_ping": True}
 if SQLALCHEMY_DATABASE_URL.startswith("sqlite"):
     engine_kwargs["connect_args"] = {"check_same_thread": False}
 
+# 동기 엔진은 Alembic, create_all, 스크립트(dummy_data 등)에서 사용합니다.
 engine = create_engine(SQLALCHEMY_DATABASE_URL, **engine_kwargs)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+# API 요청 경로는 asyncio 엔진을 사용해 DB I/O 동안 이벤트 루프를 막지 않습니다.
+async_engine = create_async_engine(ASYNC_SQLALCHEMY_DATABASE_URL, pool_pre_ping=True)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+
+if async_engine.dialect.name == "sqlite":
+    # pysqlite 계열 드라이버는 첫 DML 직전에야 BEGIN을 보내므로, 요청 단위 트랜잭션과
+    # SAVEPOINT(begin_nested)가 의도대로 동작하도록 BEGIN을 직접 발행합니다.
+    @event.listens_for(async_engine.sync_engine, "connect")
+    def _disable_pysqlite_transaction(dbapi_connection, _):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(async_engine.sync_engine, "begin")
+    def _emit_sqlite_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+
+_AFTER_COMMIT_KEY = "after_commit_callbacks"
+
+
+def after_commit(db: AsyncSession, callback: Callable[[], Awaitable[None]]) -> None:
+    """현재 트랜잭션이 커밋된 뒤에 실행할 작업(캐시 무효화 등)을 등록합니다. 롤백되면 버려집니다."""
+    db.info.setdefault(_AFTER_COMMIT_KEY, []).append(callback)
+
+
+async def _run_after_commit(db: AsyncSession) -> None:
+    for callback in db.info.pop(_AFTER_COMMIT_KEY, []):
+        try:
+            await callback()
+        except Exception:
+            logger.exception("after_commit callback failed")
+
+
+@asynccontextmanager
+async def session_scope() -> AsyncIterator[AsyncSession]:
+    """세션 하나와 트랜잭션 하나를 묶은 작업 단위. 정상 종료 시 커밋, 예외 시 롤백합니다."""
+    async with AsyncSessionLocal() as db:
+        try:
+            yield db
+            await db.commit()
+        except BaseException:
+            db.info.pop(_AFTER_COMMIT_KEY, None)
+            await db.rollback()
+            raise
+        await _run_after_commit(db)
+
+
+async def get_db() -> AsyncIterator[AsyncSession]:
+    """요청 하나가 커넥션 하나, 트랜잭션 하나를 쓰도록 세션을 주입하는 의존성.
 
-def get_db():
-    db = SessionLocal()
-    try:
+    라우트에서는 응답 전송 전에 커밋되도록 ``app.common.deps.DbSession``으로 사용합니다.
+    """
+    async with session_scope() as db:
         yield db
-    finally:
-        db.close()
@@ -1,6 +1,6 @@
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String, Text, UniqueConstraint
+from sqlalchemy import Boolean, Column, DateTime, Float, ForeignKey, Index, Integer, JSON, String, Text, UniqueConstraint
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import false, func
 
 from app.database import Base
 
@@ -44,10 +44,21 @@ class Post(Base):
     content = Column(Text, nullable=False)
     image_url = Column(String(2048), nullable=True)
     view_count = Column(Integer, default=0)
+    # likes/comments 집계를 읽기 시점에 GROUP BY 하지 않도록 쓰기 시점에 유지하는 카운터
+    likes_count = Column(Integer, nullable=False, default=0, server_default="0")
+    comments_count = Column(Integer, nullable=False, default=0, server_default="0")
+    # likes*3 + comments*2 + min(views, 200)*0.1 — 이벤트마다 갱신하고 주기 작업으로 재계산
+    hot_score = Column(Float, nullable=False, default=0, server_default="0")
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
     deleted_at = Column(DateTime, nullable=True)
 
+    __table_args__ = (
+        Index("ix_posts_latest", deleted_at, created_at.desc(), id.desc()),
+        Index("ix_posts_hot", deleted_at, hot_score.desc(), created_at.desc(), id.desc()),
+        Index("ix_posts_discussed", deleted_at, comments_count.desc(), created_at.desc(), id.desc()),
+    )
+
     owner = relationship("User", back_populates="posts")
     comments = relationship("Comment", back_populates="post", cascade="all, delete-orphan")
     likes = relationship("Like", back_populates="post", cascade="all, delete-orphan")
@@ -65,13 +76,18 @@ class Comment(Base):
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
     deleted_at = Column(DateTime, nullable=True)
 
+    __table_args__ = (Index("ix_comments_post_created", post_id, deleted_at, created_at, id),)
+
     post = relationship("Post", back_populates="comments")
     owner = relationship("User", back_populates="comments")
 
 
 class Like(Base):
     __tablename__ = "likes"
-    __table_args__ = (UniqueConstraint("user_id", "post_id", name="uq_like_user_post"),)
+    __table_args__ = (
+        UniqueConstraint("user_id", "post_id", name="uq_like_user_post"),
+        Index("ix_likes_post_id", "post_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -94,7 +110,10 @@ class Tag(Base):
 
 class PostTag(Base):
     __tablename__ = "post_tags"
-    __table_args__ = (UniqueConstraint("post_id", "tag_id", name="uq_post_tag"),)
+    __table_args__ = (
+        UniqueConstraint("post_id", "tag_id", name="uq_post_tag"),
+        Index("ix_post_tags_tag_id", "tag_id", "post_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     post_id = Column(Integer, ForeignKey("posts.id"), nullable=False)
@@ -129,5 +148,108 @@ class DirectMessage(Base):
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
     deleted_at = Column(DateTime, nullable=True)
 
+    __table_args__ = (Index("ix_direct_messages_pair", sender_id, recipient_id, created_at, id),)
+
     sender = relationship("User", foreign_keys=[sender_id], back_populates="sent_messages")
     recipient = relationship("User", foreign_keys=[recipient_id], back_populates="received_messages")
+
+
+class Conversation(Base):
+    """사용자별 대화 요약. 메시지 한 건마다 (보낸 사람, 받는 사람) 양쪽 행을 갱신합니다."""
+
+    __tablename__ = "conversations"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    partner_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    last_message_id = Column(Integer, ForeignKey("direct_messages.id"), nullable=False)
+    unread_count = Column(Integer, nullable=False, default=0, server_default="0")
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
+    # 메시지 id는 단조 증가하므로 last_message_id 역순이 곧 최근 대화 순서입니다.
+    __table_args__ = (
+        UniqueConstraint("user_id", "partner_id", name="uq_conversation_pair"),
+        Index("ix_conversations_inbox", user_id, last_message_id.desc()),
+    )
+
+    partner = relationship("User", foreign_keys=[partner_id])
+    last_message = relationship("DirectMessage", foreign_keys=[last_message_id])
+
+
+class PostSearchTerm(Base):
+    """게시글 검색용 역색인. 게시글 본문(comment_id 없음)과 댓글마다 검색어별 가중치 행을 둡니다."""
+
+    __tablename__ = "post_search_terms"
+
+    id = Column(Integer, primary_key=True)
+    term = Column(String(32), nullable=False)
+    post_id = Column(Integer, ForeignKey("posts.id"), nullable=False)
+    comment_id = Column(Integer, ForeignKey("comments.id"), nullable=True)
+    weight = Column(Integer, nullable=False)
+
+    # lookup은 (term → post_id, weight)만 읽도록 커버링, source는 재색인/삭제용입니다.
+    __table_args__ = (
+        Index("ix_post_search_terms_lookup", term, post_id, weight),
+        Index("ix_post_search_terms_source", post_id, comment_id),
+        Index("ix_post_search_terms_comment", comment_id),
+    )
+
+
+class UserSearchPrefix(Base):
+    """DM 상대 검색용 prefix 색인. 닉네임/이메일 아이디의 앞부분마다 한 행을 둡니다."""
+
+    __tablename__ = "user_search_prefixes"
+
+    id = Column(Integer, primary_key=True)
+    prefix = Column(String(10), nullable=False)
+    nickname = Column(String(20), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+
+    # prefix 일치 + 닉네임 순으로 바로 읽히므로 검색 한 번이 LIMIT개 인덱스 항목만 읽습니다.
+    __table_args__ = (
+        Index("ix_user_search_prefixes_lookup", prefix, nickname, user_id),
+        Index("ix_user_search_prefixes_user", user_id),
+    )
+
+
+class UploadedImage(Base):
+    """업로드된 원본 이미지와 파생본(썸네일/WebP) 목록. url은 Post.image_url / User.profile_image_url 값과 같습니다.
+
+    url은 내용의 SHA-256으로 정해지므로 같은 파일을 여러 번 올려도 행과 파일은 하나입니다.
+    """
+
+    __tablename__ = "uploaded_images"
+
+    id = Column(Integer, primary_key=True)
+    url = Column(String(512), nullable=False, unique=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    size_bytes = Column(Integer, nullable=False)
+    sha256 = Column(String(64), nullable=False)
+    width = Column(Integer, nullable=True)
+    height = Column(Integer, nullable=True)
+    # [{"name", "url", "width", "height", "format"}] — 폭 오름차순
+    variants = Column(JSON, nullable=False, default=list)
+    created_at = Column(DateTime, default=func.now())
+    # 같은 내용이 다시 올라올 때마다 갱신합니다. GC는 이 시각부터 유예 기간이 지난 미참조 이미지만 지웁니다.
+    last_uploaded_at = Column(DateTime, nullable=False, default=func.now(), server_default=func.now())
+    # 직접 업로드 URL을 발급하면서 미리 만든 행은 /complete로 확인될 때까지 True. GC는 미참조 이미지와 같이 지웁니다.
+    pending = Column(Boolean, nullable=False, default=False, server_default=false())
+
+    __table_args__ = (Index("ix_uploaded_images_last_uploaded", last_uploaded_at),)
+
+
+class ImageReference(Base):
+    """업로드 이미지를 쓰는 게시글(Post.image_url)/사용자(User.profile_image_url). 참조가 없는 이미지는 GC 대상입니다."""
+
+    __tablename__ = "image_references"
+
+    id = Column(Integer, primary_key=True)
+    image_id = Column(Integer, ForeignKey("uploaded_images.id"), nullable=False)
+    owner_type = Column(String(10), nullable=False)  # "post" | "user"
+    owner_id = Column(Integer, nullable=False)
+
+    # 게시글/사용자마다 이미지는 하나이므로 (owner_type, owner_id)로 교체하고, image_id로 참조 여부를 봅니다.
+    __table_args__ = (
+        UniqueConstraint("owner_type", "owner_id", name="uq_image_reference_owner"),
+        Index("ix_image_references_image", image_id),
+    )
@@ -7,15 +7,22 @@ from fastapi import FastAPI, Request
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
-from fastapi.staticfiles import StaticFiles
 from sqlalchemy import text
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
 from app import db_models
 from app.common.exceptions import BusinessException
 from app.common.responses import fail
+from app.core import image_variants, upload_storage
+from app.core.cache import cache
 from app.core.logger import setup_logging
-from app.database import engine
+from app.core.pubsub import message_hub
+from app.core.scheduler import PeriodicJob
+from app.core.session_store import SESSION_PURGE_INTERVAL_SECONDS, session_store
+from app.core.static_files import CachedStaticFiles
+from app.core.view_counter import VIEW_COUNT_FLUSH_INTERVAL_SECONDS
+from app.database import async_engine
+from app.models import images_model, posts_model
 from app.routes import auth, comments, images, messages, posts, users
 
 
@@ -32,13 +39,45 @@ def ensure_runtime_directories() -> None:
 setup_logging()
 logger = logging.getLogger(__name__)
 
+HOT_SCORE_RECOMPUTE_INTERVAL_SECONDS = float(os.getenv("HOT_SCORE_RECOMPUTE_INTERVAL_SECONDS", "300"))
+STATIC_CACHE_CONTROL = os.getenv("STATIC_CACHE_CONTROL", "public, no-cache")
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("Application starting up...")
     ensure_runtime_directories()
-    db_models.Base.metadata.create_all(bind=engine)
+    async with async_engine.begin() as conn:
+        await conn.run_sync(db_models.Base.metadata.create_all)
+
+    jobs = [
+        PeriodicJob("hot-score-recompute", HOT_SCORE_RECOMPUTE_INTERVAL_SECONDS, posts_model.recompute_hot_scores),
+        PeriodicJob("view-count-flush", VIEW_COUNT_FLUSH_INTERVAL_SECONDS, posts_model.flush_view_counts),
+        PeriodicJob(
+            "trending-refresh",
+            posts_model.TRENDING_REFRESH_INTERVAL_SECONDS,
+            posts_model.refresh_trending_snapshots,
+        ),
+        PeriodicJob("session-purge", SESSION_PURGE_INTERVAL_SECONDS, session_store.purge_expired),
+        PeriodicJob("image-gc", images_model.IMAGE_GC_INTERVAL_SECONDS, images_model.collect_garbage),
+    ]
+    for job in jobs:
+        job.start()
     yield
+    for job in jobs:
+        await job.stop()
+    # 버퍼에 남은 조회수는 종료 전에 반영합니다.
+    try:
+        await posts_model.flush_view_counts()
+    except Exception:
+        logger.exception("Final view count flush failed")
+    await posts_model.view_counter.close()
+    image_variants.shutdown()
+    await message_hub.close()
+    await session_store.close()
+    await upload_storage.storage.close()
+    await cache.close()
+    await async_engine.dispose()
     logger.info("Application shutting down...")
 
 
@@ -61,8 +100,23 @@ app.add_middleware(
 )
 
 ensure_runtime_directories()
-app.mount("/static", StaticFiles(directory="static"), name="static")
-app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
+# 약관 등 정적 파일은 바뀔 수 있으므로 매번 ETag로 재검증(대부분 304)하고, 미리 압축한 .br/.gz가 있으면 그것을 보냅니다.
+app.mount(
+    "/static",
+    CachedStaticFiles(directory="static", cache_control=STATIC_CACHE_CONTROL, precompressed=True),
+    name="static",
+)
+# 업로드 파일명은 내용 해시(이전 업로드는 uuid)라 같은 URL의 내용이 바뀌지 않으므로 1년 immutable로 캐시합니다.
+app.mount(
+    "/uploads",
+    CachedStaticFiles(
+        directory=upload_storage.UPLOAD_DIR,
+        cache_control=upload_storage.IMMUTABLE_CACHE_CONTROL,
+        content_etags=True,
+        hidden_dirs=("tmp",),
+    ),
+    name="uploads",
+)
 
 app.include_router(auth.router)
 app.include_router(users.router)
@@ -80,8 +134,8 @@ async def root():
 @app.get("/health")
 async def health_check():
     try:
-        with engine.connect() as conn:
-            conn.execute(text("SELECT 1"))
+        async with async_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
         return {"status": "healthy", "db": "ok"}
     except Exception as exc:
         logger.error("Health check DB connection failed: %s", exc)
@@ -1,89 +1,93 @@
-from datetime import datetime
+from sqlalchemy import delete, literal, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from sqlalchemy.exc import IntegrityError
-
-from app.database import SessionLocal
 from app.db_models import Comment
+from app.models import search_model, users_model
 from app.models.base import to_dict as _to_dict
+from app.models.posts_model import adjust_post_counters
+
+COMMENT_LIMIT = 50
+
+
+async def _load_comment(db: AsyncSession, comment_id: int) -> Comment | None:
+    return await db.scalar(
+        select(Comment).where(Comment.id == comment_id).execution_options(populate_existing=True)
+    )
+
+
+def _serialize_comment(comment: Comment, users: dict[int, dict], user_id: int | None = None) -> dict:
+    author = users.get(comment.user_id)
+    data = _to_dict(comment)
+    data["author_nickname"] = author["nickname"] if author else "Unknown"
+    data["author_profile_image"] = author["profile_image_url"] if author else None
+    data["is_author"] = bool(user_id and comment.user_id == user_id)
+    return data
+
+
+async def list_comments(
+    db: AsyncSession,
+    post_id: int,
+    user_id: int | None = None,
+    limit: int = COMMENT_LIMIT,
+    after_id: int | None = None,
+) -> tuple[list[dict], bool]:
+    """댓글을 (created_at, id) 오름차순으로 limit개 반환합니다. (댓글 목록, 더 있는지 여부)
+
+    after_id가 있으면 그 댓글 다음부터 ix_comments_post_created 범위를 읽습니다.
+    """
+    query = select(Comment).where(Comment.post_id == post_id, Comment.deleted_at.is_(None))
+    if after_id:
+        anchor = select(Comment.created_at).where(Comment.id == after_id, Comment.post_id == post_id)
+        if await db.scalar(anchor) is not None:
+            # created_at은 DB에 저장된 값 그대로 비교하도록 서브쿼리로 넘깁니다.
+            query = query.where(
+                tuple_(Comment.created_at, Comment.id) > tuple_(anchor.scalar_subquery(), literal(after_id))
+            )
+        else:
+            # 기준 댓글이 그 사이 삭제된 경우 id 순서로 이어 갑니다.
+            query = query.where(Comment.id > after_id)
+
+    comments = (
+        await db.scalars(query.order_by(Comment.created_at.asc(), Comment.id.asc()).limit(limit + 1))
+    ).all()
+    has_more = len(comments) > limit
+    comments = comments[:limit]
+    users = await users_model.get_user_summaries(db, [c.user_id for c in comments])
+    return [_serialize_comment(c, users, user_id) for c in comments], has_more
+
+
+async def find_comment(db: AsyncSession, comment_id: int) -> dict | None:
+    comment = await db.scalar(select(Comment).where(Comment.id == comment_id))
+    return _to_dict(comment)
+
+
+async def create_comment(db: AsyncSession, user_id: int, post_id: int, content: str) -> dict:
+    new_comment = Comment(user_id=user_id, post_id=post_id, content=content)
+    db.add(new_comment)
+    await db.flush()
+    await adjust_post_counters(db, post_id, comments_delta=1)
+    await search_model.index_comment(db, post_id, new_comment.id, content)
+    new_comment = await _load_comment(db, new_comment.id)
+    users = await users_model.get_user_summaries(db, [user_id])
+    return _serialize_comment(new_comment, users, user_id)
+
+
+async def update_comment(db: AsyncSession, comment_id: int, content: str) -> dict | None:
+    comment = await db.scalar(select(Comment).where(Comment.id == comment_id))
+    if not comment:
+        return None
+
+    comment.content = content
+    await search_model.index_comment(db, comment.post_id, comment_id, content)
+    await db.flush()
+    comment = await _load_comment(db, comment_id)
+    users = await users_model.get_user_summaries(db, [comment.user_id])
+    return _serialize_comment(comment, users, comment.user_id)
 
 
-def list_comments(post_id: int, user_id: int | None = None) -> list[dict]:
-    db = SessionLocal()
-    try:
-        comments = (
-            db.query(Comment)
-            .filter(Comment.post_id == post_id, Comment.deleted_at.is_(None))
-            .all()
-        )
-        results = []
-        for c in comments:
-            c_dict = _to_dict(c)
-            c_dict["author_nickname"] = c.owner.nickname if c.owner else "Unknown"
-            c_dict["author_profile_image"] = c.owner.profile_image_url if c.owner else None
-            c_dict["is_author"] = bool(user_id and c.user_id == user_id)
-            results.append(c_dict)
-        return results
-    finally:
-        db.close()
-
-
-def find_comment(comment_id: int) -> dict | None:
-    db = SessionLocal()
-    try:
-        comment = db.query(Comment).filter(Comment.id == comment_id).first()
-        return _to_dict(comment)
-    finally:
-        db.close()
-
-
-def create_comment(user_id: int, post_id: int, content: str) -> dict:
-    db = SessionLocal()
-    try:
-        new_comment = Comment(user_id=user_id, post_id=post_id, content=content)
-        db.add(new_comment)
-        db.commit()
-        db.refresh(new_comment)
-
-        res = _to_dict(new_comment)
-        res["author_nickname"] = new_comment.owner.nickname
-        res["author_profile_image"] = new_comment.owner.profile_image_url
-        return res
-    except Exception:
-        db.rollback()
-        raise
-    finally:
-        db.close()
-
-
-def update_comment(comment_id: int, content: str) -> dict | None:
-    db = SessionLocal()
-    try:
-        comment = db.query(Comment).filter(Comment.id == comment_id).first()
-        if not comment:
-            return None
-
-        comment.content = content
-        db.commit()
-        db.refresh(comment)
-
-        res = _to_dict(comment)
-        res["author_nickname"] = comment.owner.nickname
-        res["author_profile_image"] = comment.owner.profile_image_url
-        return res
-    except Exception:
-        db.rollback()
-        raise
-    finally:
-        db.close()
-
-
-def delete_comment(comment_id: int) -> None:
-    db = SessionLocal()
-    try:
-        db.query(Comment).filter(Comment.id == comment_id).delete()
-        db.commit()
-    except Exception:
-        db.rollback()
-        raise
-    finally:
-        db.close()
\ No newline at end of file
+async def delete_comment(db: AsyncSession, comment_id: int) -> None:
+    post_id = await db.scalar(select(Comment.post_id).where(Comment.id == comment_id))
+    await search_model.remove_comment(db, comment_id)
+    result = await db.execute(delete(Comment).where(Comment.id == comment_id))
+    if result.rowcount:
+        await adjust_post_counters(db, post_id, comments_delta=-result.rowcount)
@@ -0,0 +1,179 @@
+import os
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import and_, delete, exists, insert, literal, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import func
+
+from app.core import upload_storage
+from app.database import after_commit, session_scope
+from app.db_models import ImageReference, UploadedImage
+
+# 업로드 후 게시글/프로필에 연결되기 전까지, 그리고 참조가 끊긴 뒤 다시 쓰일 수 있도록 이 기간 동안은 지우지 않습니다.
+IMAGE_GC_GRACE_SECONDS = int(os.getenv("IMAGE_GC_GRACE_SECONDS", "86400"))
+IMAGE_GC_INTERVAL_SECONDS = float(os.getenv("IMAGE_GC_INTERVAL_SECONDS", "3600"))
+IMAGE_GC_BATCH_SIZE = int(os.getenv("IMAGE_GC_BATCH_SIZE", "500"))
+
+OWNER_POST = "post"
+OWNER_USER = "user"
+
+
+async def find_upload(db: AsyncSession, url: str) -> dict | None:
+    """{url, width, height, variants, pending} 또는 None."""
+    row = (
+        await db.execute(
+            select(
+                UploadedImage.url,
+                UploadedImage.width,
+                UploadedImage.height,
+                UploadedImage.variants,
+                UploadedImage.pending,
+            )
+            .where(UploadedImage.url == url)
+        )
+    ).first()
+    return dict(row._mapping) if row else None
+
+
+async def touch_upload(db: AsyncSession, url: str) -> bool:
+    """같은 내용이 다시 업로드되면 GC 유예 기간을 새로 시작합니다. 그 사이 GC가 행을 지웠으면 False."""
+    result = await db.execute(
+        update(UploadedImage).where(UploadedImage.url == url).values(last_uploaded_at=func.now())
+    )
+    return result.rowcount > 0
+
+
+async def reserve_upload(db: AsyncSession, url: str, user_id: int, size_bytes: int, sha256: str) -> None:
+    """직접 업로드 URL을 발급하기 전에 pending 행을 만듭니다.
+
+    저장소에 올라온 파일이 /complete 전에도 GC 대상이 되고, 그 사이 게시글/프로필에 붙인 URL도 참조로 기록됩니다.
+    """
+    try:
+        async with db.begin_nested():
+            await db.execute(
+                insert(UploadedImage).values(
+                    url=url, user_id=user_id, size_bytes=size_bytes, sha256=sha256, variants=[], pending=True
+                )
+            )
+    except IntegrityError:
+        await touch_upload(db, url)
+
+
+async def record_upload(
+    db: AsyncSession,
+    url: str,
+    user_id: int,
+    size_bytes: int,
+    sha256: str,
+    width: int | None = None,
+    height: int | None = None,
+    variants: list[dict] | None = None,
+) -> None:
+    try:
+        # 같은 파일을 동시에 올린 경쟁에서 요청 트랜잭션 전체가 깨지지 않도록 SAVEPOINT 안에서 INSERT
+        async with db.begin_nested():
+            await db.execute(
+                insert(UploadedImage).values(
+                    url=url,
+                    user_id=user_id,
+                    size_bytes=size_bytes,
+                    sha256=sha256,
+                    width=width,
+                    height=height,
+                    variants=variants or [],
+                )
+            )
+    except IntegrityError:
+        # 이미 있는 행(동시 업로드 또는 reserve_upload의 pending 행)을 완료 상태로 채웁니다.
+        await db.execute(
+            update(UploadedImage)
+            .where(UploadedImage.url == url)
+            .values(
+                size_bytes=size_bytes,
+                width=width,
+                height=height,
+                variants=variants or [],
+                pending=False,
+                last_uploaded_at=func.now(),
+            )
+        )
+
+
+async def get_variants_map(db: AsyncSession, urls) -> dict[str, list[dict]]:
+    """{url: variants}. 파생본이 없는 URL(외부 URL, 이전 업로드)은 결과에 포함되지 않습니다."""
+    urls = [url for url in dict.fromkeys(urls) if url]
+    if not urls:
+        return {}
+    rows = await db.execute(
+        select(UploadedImage.url, UploadedImage.variants).where(UploadedImage.url.in_(urls))
+    )
+    return {url: variants for url, variants in rows if variants}
+
+
+def build_srcset(variants: list[dict] | None) -> str | None:
+    """<img srcset>용 문자열. ("/a.w320.webp 320w, /a.w960.webp 960w")"""
+    if not variants:
+        return None
+    return ", ".join(f"{variant['url']} {variant['width']}w" for variant in variants)
+
+
+async def set_reference(db: AsyncSession, owner_type: str, owner_id: int, url: str | None) -> None:
+    """게시글/사용자가 쓰는 이미지를 url로 바꿉니다. 업로드 기록이 없는 URL(외부 URL)이면 참조만 지웁니다.
+
+    /complete 전의 직접 업로드도 pending 행이 있으므로 참조가 기록되어 GC에서 지워지지 않습니다.
+    """
+    await db.execute(
+        delete(ImageReference).where(ImageReference.owner_type == owner_type, ImageReference.owner_id == owner_id)
+    )
+    if not url:
+        return
+    await db.execute(
+        insert(ImageReference).from_select(
+            ["image_id", "owner_type", "owner_id"],
+            select(UploadedImage.id, literal(owner_type), literal(owner_id)).where(UploadedImage.url == url),
+        )
+    )
+
+
+async def collect_garbage(grace_seconds: int = IMAGE_GC_GRACE_SECONDS, batch_size: int = IMAGE_GC_BATCH_SIZE) -> int:
+    """참조가 없고 유예 기간이 지난 업로드를 한 배치 지웁니다. 행은 트랜잭션으로, 파일은 커밋 후에 지웁니다.
+
+    삭제 조건을 DELETE에도 다시 걸어, 후보를 고른 사이 다시 업로드되거나 참조된 이미지는 남깁니다.
+    완료되지 않은 직접 업로드(pending 행)도 같은 기준으로 지우므로 버려진 업로드 파일이 남지 않습니다.
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=grace_seconds)
+    unreferenced = and_(
+        UploadedImage.last_uploaded_at < cutoff,
+        ~exists().where(ImageReference.image_id == UploadedImage.id),
+    )
+    async with session_scope() as db:
+        candidates = (
+            await db.execute(
+                select(UploadedImage.id, UploadedImage.url, UploadedImage.variants)
+                .where(unreferenced)
+                .order_by(UploadedImage.last_uploaded_at.asc())
+                .limit(batch_size)
+            )
+        ).all()
+        if not candidates:
+            return 0
+
+        candidate_ids = [image_id for image_id, _, _ in candidates]
+        await db.execute(delete(UploadedImage).where(UploadedImage.id.in_(candidate_ids), unreferenced))
+        kept = set(await db.scalars(select(UploadedImage.id).where(UploadedImage.id.in_(candidate_ids))))
+
+        keys = []
+        for image_id, url, variants in candidates:
+            if image_id in kept:
+                continue
+            for image_url in [url, *(variant["url"] for variant in variants or [])]:
+                key = upload_storage.storage.key_for_url(image_url)
+                if key:
+                    keys.append(key)
+
+        async def _delete_files() -> None:
+            await upload_storage.storage.delete(keys)
+
+        after_commit(db, _delete_files)
+    return len(candidates) - len(kept)
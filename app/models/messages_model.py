@@ -1,14 +1,19 @@
-from collections import OrderedDict
-
-from sqlalchemy import and_, or_
+from sqlalchemy import asc, case, desc, literal, select, tuple_, union_all, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
+from sqlalchemy.orm.attributes import set_committed_value
 
-from app.database import SessionLocal
-from app.db_models import DirectMessage, User
+from app.common.exceptions import InvalidPagingParamsError
+from app.common.pagination import decode_cursor, encode_cursor
+from app.common.search_tokens import normalize_user_query
+from app.db_models import Conversation, DirectMessage, User
+from app.models import search_model, users_model
 from app.models.base import to_dict as _to_dict
 
 SEARCH_LIMIT = 20
-MESSAGE_LIMIT = 100
+MESSAGE_LIMIT = 50
+CONVERSATION_LIMIT = 20
 
 
 def _serialize_user(user: User) -> dict:
@@ -20,133 +25,227 @@ def _serialize_user(user: User) -> dict:
     }
 
 
-def _serialize_message(message: DirectMessage, current_user_id: int) -> dict:
+def _serialize_message(message: DirectMessage, current_user_id: int, users: dict[int, dict]) -> dict:
     data = _to_dict(message)
-    data["sender"] = _serialize_user(message.sender)
-    data["recipient"] = _serialize_user(message.recipient)
+    data["sender"] = users.get(message.sender_id)
+    data["recipient"] = users.get(message.recipient_id)
     data["is_mine"] = message.sender_id == current_user_id
     return data
 
 
-def search_users(user_id: int, query: str | None = None) -> list[dict]:
-    db = SessionLocal()
-    try:
-        users_query = db.query(User).filter(User.deleted_at.is_(None), User.id != user_id)
-        normalized_query = (query or "").strip()
-        if normalized_query:
-            keyword = f"%{normalized_query}%"
-            users_query = users_query.filter(
-                or_(User.nickname.ilike(keyword), User.email.ilike(keyword))
-            )
-
-        users = users_query.order_by(User.nickname.asc(), User.id.asc()).limit(SEARCH_LIMIT).all()
-        return [_serialize_user(user) for user in users]
-    finally:
-        db.close()
-
-
-def list_conversations(user_id: int) -> list[dict]:
-    db = SessionLocal()
-    try:
-        messages = (
-            db.query(DirectMessage)
-            .options(joinedload(DirectMessage.sender), joinedload(DirectMessage.recipient))
-            .filter(
-                DirectMessage.deleted_at.is_(None),
-                or_(DirectMessage.sender_id == user_id, DirectMessage.recipient_id == user_id),
-            )
-            .order_by(DirectMessage.created_at.desc(), DirectMessage.id.desc())
-            .all()
+async def search_users(db: AsyncSession, user_id: int, query: str | None = None) -> list[dict]:
+    """DM 상대 검색. 검색어가 있으면 닉네임/이메일 아이디 prefix 색인으로 찾습니다."""
+    normalized_query = normalize_user_query(query)
+    if normalized_query:
+        users = await search_model.search_users(
+            db, normalized_query, exclude_user_id=user_id, limit=SEARCH_LIMIT
         )
-
-        conversation_map: OrderedDict[int, dict] = OrderedDict()
-        unread_counts: dict[int, int] = {}
-
-        for message in messages:
-            partner = message.recipient if message.sender_id == user_id else message.sender
-            partner_id = partner.id
-            unread_counts.setdefault(partner_id, 0)
-            if message.recipient_id == user_id and not message.is_read:
-                unread_counts[partner_id] += 1
-
-            if partner_id in conversation_map:
-                continue
-
-            conversation_map[partner_id] = {
-                "partner": _serialize_user(partner),
-                "last_message": {
-                    "id": message.id,
-                    "content": message.content,
-                    "created_at": message.created_at.isoformat() if message.created_at else None,
-                    "sender_id": message.sender_id,
-                    "recipient_id": message.recipient_id,
-                    "is_mine": message.sender_id == user_id,
-                },
-                "unread_count": 0,
-            }
-
-        results = []
-        for partner_id, item in conversation_map.items():
-            item["unread_count"] = unread_counts.get(partner_id, 0)
-            results.append(item)
-
-        return results
-    finally:
-        db.close()
-
-
-def list_messages(user_id: int, other_user_id: int) -> list[dict]:
-    db = SessionLocal()
-    try:
-        messages = (
-            db.query(DirectMessage)
-            .options(joinedload(DirectMessage.sender), joinedload(DirectMessage.recipient))
-            .filter(
-                DirectMessage.deleted_at.is_(None),
-                or_(
-                    and_(DirectMessage.sender_id == user_id, DirectMessage.recipient_id == other_user_id),
-                    and_(DirectMessage.sender_id == other_user_id, DirectMessage.recipient_id == user_id),
-                ),
-            )
-            .order_by(DirectMessage.created_at.asc(), DirectMessage.id.asc())
-            .limit(MESSAGE_LIMIT)
-            .all()
+    else:
+        users = await db.scalars(
+            select(User)
+            .where(User.deleted_at.is_(None), User.id != user_id)
+            .order_by(User.nickname.asc(), User.id.asc())
+            .limit(SEARCH_LIMIT)
         )
+    return [_serialize_user(user) for user in users]
 
-        unread_messages = [
-            message
-            for message in messages
-            if message.sender_id == other_user_id and message.recipient_id == user_id and not message.is_read
-        ]
-        for message in unread_messages:
-            message.is_read = True
 
-        if unread_messages:
-            db.commit()
-            for message in unread_messages:
-                db.refresh(message)
-
-        return [_serialize_message(message, user_id) for message in messages]
-    finally:
-        db.close()
+def _serialize_conversation(conversation: Conversation, users: dict[int, dict]) -> dict:
+    message = conversation.last_message
+    return {
+        "partner": users.get(conversation.partner_id),
+        "last_message": {
+            "id": message.id,
+            "content": message.content,
+            "created_at": message.created_at.isoformat() if message.created_at else None,
+            "sender_id": message.sender_id,
+            "recipient_id": message.recipient_id,
+            "is_mine": message.sender_id == conversation.user_id,
+        },
+        "unread_count": conversation.unread_count,
+    }
 
 
-def create_message(sender_id: int, recipient_id: int, content: str) -> dict:
-    db = SessionLocal()
+async def list_conversations(
+    db: AsyncSession,
+    user_id: int,
+    limit: int = CONVERSATION_LIMIT,
+    cursor: str | None = None,
+) -> tuple[list[dict], str | None]:
+    """conversations 요약 테이블에서 최근 대화 순으로 한 페이지를 읽습니다. (목록, 다음 cursor) 반환."""
+    query = (
+        select(Conversation)
+        .options(joinedload(Conversation.last_message))
+        .where(Conversation.user_id == user_id)
+        .order_by(Conversation.last_message_id.desc())
+    )
+    if cursor:
+        last_message_id = decode_cursor(cursor).get("m")
+        if not isinstance(last_message_id, int):
+            raise InvalidPagingParamsError("cursor 값이 올바르지 않습니다.")
+        query = query.where(Conversation.last_message_id < last_message_id)
+
+    conversations = (await db.scalars(query.limit(limit + 1))).all()
+    next_cursor = None
+    if len(conversations) > limit:
+        conversations = conversations[:limit]
+        next_cursor = encode_cursor({"m": conversations[-1].last_message_id})
+
+    users = await users_model.get_user_summaries(db, [conversation.partner_id for conversation in conversations])
+    return [_serialize_conversation(conversation, users) for conversation in conversations], next_cursor
+
+
+async def _touch_conversation(
+    db: AsyncSession,
+    user_id: int,
+    partner_id: int,
+    message_id: int,
+    unread_delta: int,
+) -> None:
+    """(user_id, partner_id) 요약 행의 마지막 메시지와 안 읽은 수를 갱신하고, 없으면 만듭니다."""
+    values = {"last_message_id": message_id, "unread_count": Conversation.unread_count + unread_delta}
+    pair = (Conversation.user_id == user_id, Conversation.partner_id == partner_id)
+
+    result = await db.execute(update(Conversation).where(*pair).values(**values))
+    if result.rowcount:
+        return
     try:
-        message = DirectMessage(
-            sender_id=sender_id,
-            recipient_id=recipient_id,
-            content=content,
+        # 같은 쌍의 첫 메시지가 동시에 들어오면 한쪽만 INSERT에 성공하므로 나머지는 UPDATE로 재시도
+        async with db.begin_nested():
+            db.add(
+                Conversation(
+                    user_id=user_id,
+                    partner_id=partner_id,
+                    last_message_id=message_id,
+                    unread_count=unread_delta,
+                )
+            )
+    except IntegrityError:
+        await db.execute(update(Conversation).where(*pair).values(**values))
+
+
+async def _mark_conversation_read(db: AsyncSession, user_id: int, partner_id: int, read_count: int) -> None:
+    remaining = Conversation.unread_count - read_count
+    await db.execute(
+        update(Conversation)
+        .where(Conversation.user_id == user_id, Conversation.partner_id == partner_id)
+        .values(unread_count=case((remaining > 0, remaining), else_=0))
+    )
+
+
+def _direction_page(sender_id: int, recipient_id: int, limit: int, before_id: int | None, after_id: int | None):
+    """한 방향(sender→recipient) 메시지 id를 ix_direct_messages_pair 범위 읽기로 최대 limit개 가져옵니다."""
+    keys = tuple_(DirectMessage.created_at, DirectMessage.id)
+    query = select(DirectMessage.id).where(
+        DirectMessage.sender_id == sender_id,
+        DirectMessage.recipient_id == recipient_id,
+        DirectMessage.deleted_at.is_(None),
+    )
+    if after_id:
+        anchor = select(DirectMessage.created_at).where(DirectMessage.id == after_id).scalar_subquery()
+        query = query.where(keys > tuple_(anchor, literal(after_id))).order_by(
+            DirectMessage.created_at.asc(), DirectMessage.id.asc()
+        )
+    else:
+        if before_id:
+            anchor = select(DirectMessage.created_at).where(DirectMessage.id == before_id).scalar_subquery()
+            query = query.where(keys < tuple_(anchor, literal(before_id)))
+        query = query.order_by(DirectMessage.created_at.desc(), DirectMessage.id.desc())
+    return select(query.limit(limit).subquery().c.id)
+
+
+async def list_messages(
+    db: AsyncSession,
+    user_id: int,
+    other_user_id: int,
+    limit: int = MESSAGE_LIMIT,
+    before_id: int | None = None,
+    after_id: int | None = None,
+) -> tuple[list[dict], bool]:
+    """두 사용자 간 메시지 한 페이지를 오래된 순으로 반환합니다. (메시지 목록, 더 있는지 여부)
+
+    기본/before_id는 최신 쪽부터 limit개를 읽어 뒤집고(위로 스크롤), after_id는 그 이후 메시지를
+    오래된 순으로 읽습니다(새 메시지 폴링). 방향별로 인덱스 범위를 limit+1개만 읽어 합칩니다.
+    """
+    newest_first = after_id is None
+    page_ids = union_all(
+        _direction_page(user_id, other_user_id, limit + 1, before_id, after_id),
+        _direction_page(other_user_id, user_id, limit + 1, before_id, after_id),
+    ).subquery()
+    order = desc if newest_first else asc
+
+    messages = (
+        await db.scalars(
+            select(DirectMessage)
+            .where(DirectMessage.id.in_(select(page_ids.c.id)))
+            .order_by(order(DirectMessage.created_at), order(DirectMessage.id))
+            .limit(limit + 1)
+        )
+    ).all()
+    has_more = len(messages) > limit
+    messages = messages[:limit]
+    if newest_first:
+        messages.reverse()
+
+    received_unread = [
+        message for message in messages if message.sender_id == other_user_id and not message.is_read
+    ]
+    if received_unread:
+        await mark_messages_read(db, user_id, other_user_id, up_to_id=max(m.id for m in received_unread))
+        # 행을 다시 읽지 않고 응답에 쓸 값만 맞춰 둡니다.
+        for message in received_unread:
+            set_committed_value(message, "is_read", True)
+
+    users = await users_model.get_user_summaries(db, [user_id, other_user_id])
+    return [_serialize_message(message, user_id, users) for message in messages], has_more
+
+
+async def mark_messages_read(
+    db: AsyncSession,
+    user_id: int,
+    other_user_id: int,
+    up_to_id: int | None = None,
+) -> int:
+    """other_user_id가 보낸 안 읽은 메시지를 UPDATE 한 번으로 읽음 처리합니다. 처리한 개수를 반환.
+
+    up_to_id가 있으면 그 id까지만(읽음 확인 위치) 처리합니다.
+    """
+    query = update(DirectMessage).where(
+        DirectMessage.sender_id == other_user_id,
+        DirectMessage.recipient_id == user_id,
+        DirectMessage.is_read.is_(False),
+        DirectMessage.deleted_at.is_(None),
+    )
+    if up_to_id is not None:
+        query = query.where(DirectMessage.id <= up_to_id)
+
+    result = await db.execute(query.values(is_read=True).execution_options(synchronize_session=False))
+    if result.rowcount:
+        await _mark_conversation_read(db, user_id, other_user_id, result.rowcount)
+    return result.rowcount
+
+
+async def get_unread_count(db: AsyncSession, user_id: int, partner_id: int) -> int:
+    unread_count = await db.scalar(
+        select(Conversation.unread_count).where(
+            Conversation.user_id == user_id, Conversation.partner_id == partner_id
         )
-        db.add(message)
-        db.commit()
-        db.refresh(message)
-        _ = message.sender
-        _ = message.recipient
-        return _serialize_message(message, sender_id)
-    except Exception:
-        db.rollback()
-        raise
-    finally:
-        db.close()
+    )
+    return unread_count or 0
+
+
+async def create_message(db: AsyncSession, sender_id: int, recipient_id: int, content: str) -> dict:
+    message = DirectMessage(
+        sender_id=sender_id,
+        recipient_id=recipient_id,
+        content=content,
+    )
+    db.add(message)
+    await db.flush()
+    await _touch_conversation(db, sender_id, recipient_id, message.id, unread_delta=0)
+    await _touch_conversation(db, recipient_id, sender_id, message.id, unread_delta=1)
+    message = await db.scalar(
+        select(DirectMessage).where(DirectMessage.id == message.id).execution_options(populate_existing=True)
+    )
+    users = await users_model.get_user_summaries(db, [sender_id, recipient_id])
+    return _serialize_message(message, sender_id, users)
@@ -1,53 +1,56 @@
 from datetime import datetime, timedelta, timezone
 import logging
+import os
 
-from sqlalchemy import case, desc, func, update
+from sqlalchemy import DateTime, case, delete, desc, func, literal, select, tuple_, update
+from sqlalchemy.dialects import sqlite
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import joinedload
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import SessionLocal
+from app.common.exceptions import InvalidPagingParamsError
+from app.common.pagination import decode_cursor, encode_cursor
+from app.core.cache import CACHE_TTL_SECONDS, cache
+from app.core.view_counter import create_view_counter
+from app.database import after_commit, session_scope
 from app.db_models import Comment, Like, Post, PostTag, Tag
+from app.models import images_model, search_model, users_model
 from app.models.base import to_dict as _to_dict
 
 logger = logging.getLogger(__name__)
 
+# SQLite는 func.now() 기본값을 마이크로초 없이 문자열로 저장하므로,
+# cursor의 created_at도 같은 형식으로 바인딩해야 문자열 비교가 어긋나지 않습니다.
+_CURSOR_DATETIME = DateTime().with_variant(sqlite.DATETIME(truncate_microseconds=True), "sqlite")
 
 
+HOT_SCORE_VIEW_CAP = 200
+HOT_SCORE_VIEW_WEIGHT = 0.1
+VIEW_FLUSH_BATCH_SIZE = 500
 
+TRENDING_SNAPSHOT_LIMIT = 20
+TRENDING_MAX_DAYS = 30
+TRENDING_REFRESH_INTERVAL_SECONDS = float(os.getenv("TRENDING_REFRESH_INTERVAL_SECONDS", "60"))
+# 스냅샷을 미리 갱신할 days 구간. 기본 7일 + 한 번이라도 요청된 구간을 담습니다.
+_trending_windows: set[int] = {7}
 
-def _build_likes_map(db, post_ids: list[int]) -> dict[int, int]:
-    if not post_ids:
-        return {}
-    rows = (
-        db.query(Like.post_id, func.count(Like.id))
-        .filter(Like.post_id.in_(post_ids))
-        .group_by(Like.post_id)
-        .all()
-    )
-    return {post_id: count for post_id, count in rows}
+# 목록 캐시 키에 포함되는 세대 번호. 게시글/좋아요/댓글 변경 시 증가시켜 이전 페이지를 모두 무효화합니다.
+LIST_CACHE_GENERATION_KEY = "posts:list:generation"
 
 
-def _build_comments_map(db, post_ids: list[int]) -> dict[int, int]:
-    if not post_ids:
-        return {}
-    rows = (
-        db.query(Comment.post_id, func.count(Comment.id))
-        .filter(Comment.post_id.in_(post_ids))
-        .group_by(Comment.post_id)
-        .all()
-    )
-    return {post_id: count for post_id, count in rows}
+def _hot_score_expression(likes=Post.likes_count, comments=Post.comments_count, views=Post.view_count):
+    """hot_score 계산식. 증감 UPDATE에서는 변경 후 값을 나타내는 식을 인자로 넘깁니다."""
+    capped_views = case((views > HOT_SCORE_VIEW_CAP, HOT_SCORE_VIEW_CAP), else_=func.coalesce(views, 0))
+    return (likes * 3.0) + (comments * 2.0) + (capped_views * HOT_SCORE_VIEW_WEIGHT)
 
 
-def _build_tags_map(db, post_ids: list[int]) -> dict[int, list[str]]:
+async def _build_tags_map(db, post_ids: list[int]) -> dict[int, list[str]]:
     if not post_ids:
         return {}
-    rows = (
-        db.query(PostTag.post_id, Tag.name)
+    rows = await db.execute(
+        select(PostTag.post_id, Tag.name)
         .join(Tag, Tag.id == PostTag.tag_id)
-        .filter(PostTag.post_id.in_(post_ids))
+        .where(PostTag.post_id.in_(post_ids))
         .order_by(Tag.name.asc())
-        .all()
     )
     tags_map: dict[int, list[str]] = {}
     for post_id, tag_name in rows:
@@ -55,30 +58,33 @@ def _build_tags_map(db, post_ids: list[int]) -> dict[int, list[str]]:
     return tags_map
 
 
-def _build_liked_set(db, post_ids: list[int], current_user_id: int | None) -> set[int]:
+async def _build_liked_set(db, post_ids: list[int], current_user_id: int | None) -> set[int]:
     if not post_ids or not current_user_id:
         return set()
-    rows = (
-        db.query(Like.post_id)
-        .filter(Like.user_id == current_user_id, Like.post_id.in_(post_ids))
-        .all()
+    rows = await db.scalars(
+        select(Like.post_id).where(Like.user_id == current_user_id, Like.post_id.in_(post_ids))
     )
-    return {post_id for (post_id,) in rows}
+    return set(rows)
 
 
 def _serialize_post(
     post: Post,
-    likes_count: int,
-    comments_count: int,
     tags: list[str],
     current_user_id: int | None,
     liked_post_ids: set[int],
+    author: dict | None,
+    variants_map: dict[str, list[dict]],
 ) -> dict:
     data = _to_dict(post)
-    data["author_nickname"] = post.owner.nickname if post.owner else "Unknown"
-    data["author_profile_image"] = post.owner.profile_image_url if post.owner else None
-    data["likes_count"] = likes_count
-    data["comments_count"] = comments_count
+    # hot_score는 정렬용 내부 값이므로 응답에 넣지 않습니다. (트렌딩은 trending_score로 따로 내려 줍니다)
+    data.pop("hot_score", None)
+    data["author_nickname"] = author["nickname"] if author else "Unknown"
+    data["author_profile_image"] = author["profile_image_url"] if author else None
+    # 목록은 원본 대신 srcset의 작은 파생본을 내려받도록 합니다. 파생본이 없으면 None(원본 URL 사용).
+    data["image_srcset"] = images_model.build_srcset(variants_map.get(post.image_url))
+    data["author_profile_image_srcset"] = images_model.build_srcset(variants_map.get(data["author_profile_image"]))
+    data["likes_count"] = post.likes_count or 0
+    data["comments_count"] = post.comments_count or 0
     data["views"] = post.view_count
     data["view_count"] = post.view_count
     data["tags"] = tags
@@ -87,327 +93,548 @@ def _serialize_post(
     return data
 
 
-def _serialize_posts_batch(db, posts: list[Post], current_user_id: int | None) -> list[dict]:
+async def _serialize_posts_batch(db, posts: list[Post], current_user_id: int | None) -> list[dict]:
     post_ids = [p.id for p in posts]
-    likes_map = _build_likes_map(db, post_ids)
-    comments_map = _build_comments_map(db, post_ids)
-    tags_map = _build_tags_map(db, post_ids)
-    liked_set = _build_liked_set(db, post_ids, current_user_id)
+    tags_map = await _build_tags_map(db, post_ids)
+    liked_set = await _build_liked_set(db, post_ids, current_user_id)
+    users = await users_model.get_user_summaries(db, [p.user_id for p in posts])
+    variants_map = await images_model.get_variants_map(
+        db, [p.image_url for p in posts] + [user["profile_image_url"] for user in users.values()]
+    )
 
     return [
         _serialize_post(
             post=p,
-            likes_count=likes_map.get(p.id, 0),
-            comments_count=comments_map.get(p.id, 0),
             tags=tags_map.get(p.id, []),
             current_user_id=current_user_id,
             liked_post_ids=liked_set,
+            author=users.get(p.user_id),
+            variants_map=variants_map,
         )
         for p in posts
     ]
 
 
-def list_posts(
+async def _load_post(db, post_id: int) -> Post | None:
+    """커밋 후 server-side 기본값을 다시 읽을 때도 사용합니다. 작성자는 직렬화 시 따로 채웁니다."""
+    return await db.scalar(
+        select(Post).where(Post.id == post_id).execution_options(populate_existing=True)
+    )
+
+
+async def _overlay_viewer_fields(db, items: list[dict], current_user_id: int | None) -> None:
+    """캐시된 공용 본문 위에 요청 사용자별 필드(is_author, is_liked)를 채웁니다."""
+    liked_set = await _build_liked_set(db, [item["id"] for item in items], current_user_id)
+    for item in items:
+        item["is_author"] = bool(current_user_id and item["user_id"] == current_user_id)
+        item["is_liked"] = item["id"] in liked_set
+
+
+async def _overlay_counters(db, items: list[dict]) -> None:
+    """캐시된 목록 항목에 좋아요/댓글 수와 조회수(flush 전 증가분 포함)를 PK IN 조회 한 번으로 덮어씁니다.
+
+    카운터 변경은 목록 캐시를 무효화하지 않으므로 숫자는 여기서 최신으로 맞추고, hot/discussed 순서만 TTL 동안 늦게 반영됩니다.
+    """
+    if not items:
+        return
+    post_ids = [item["id"] for item in items]
+    rows = await db.execute(
+        select(Post.id, Post.likes_count, Post.comments_count, Post.view_count).where(Post.id.in_(post_ids))
+    )
+    counters = {post_id: (likes, comments, views) for post_id, likes, comments, views in rows}
+    pending_views = await view_counter.pending_many(post_ids)
+    for item in items:
+        if item["id"] not in counters:
+            continue
+        likes_count, comments_count, view_count = counters[item["id"]]
+        view_count = (view_count or 0) + pending_views.get(item["id"], 0)
+        item["likes_count"] = likes_count or 0
+        item["comments_count"] = comments_count or 0
+        item["views"] = view_count
+        item["view_count"] = view_count
+
+
+def _detail_cache_key(post_id: int) -> str:
+    return f"posts:detail:{post_id}"
+
+
+def _author_generation_key(user_id: int) -> str:
+    return f"posts:author:{user_id}:generation"
+
+
+def _invalidate_post_cache(db: AsyncSession, post_id: int | None = None) -> None:
+    """커밋 후 상세 캐시(post_id)와 목록 캐시 전체(세대 증가)를 무효화하도록 등록합니다."""
+
+    async def _invalidate() -> None:
+        if post_id is not None:
+            await cache.delete(_detail_cache_key(post_id))
+        await cache.incr(LIST_CACHE_GENERATION_KEY)
+
+    after_commit(db, _invalidate)
+
+
+def invalidate_author_cache(db: AsyncSession, user_id: int) -> None:
+    """작성자 닉네임/프로필 이미지가 바뀌면 커밋 후 그 사용자의 글 상세 캐시와 목록 캐시 전체를 무효화하도록 등록합니다.
+
+    작성자의 글 id를 모두 찾는 대신 작성자별 세대를 올리고, 상세 캐시는 읽을 때 세대가 다르면 다시 만듭니다.
+    """
+
+    async def _invalidate() -> None:
+        await cache.incr(_author_generation_key(user_id))
+        await cache.incr(LIST_CACHE_GENERATION_KEY)
+
+    after_commit(db, _invalidate)
+
+
+def _cursor_value(value):
+    if isinstance(value, datetime):
+        return literal(value, _CURSOR_DATETIME)
+    return literal(value)
+
+
+def _decode_posts_cursor(cursor: str, sort: str, key_count: int) -> list:
+    payload = decode_cursor(cursor)
+    keys = payload.get("k")
+    if payload.get("s") != sort or not isinstance(keys, list) or len(keys) != key_count:
+        raise InvalidPagingParamsError("cursor가 현재 정렬 방식과 일치하지 않습니다.")
+    return keys
+
+
+async def _query_posts_page(
+    db: AsyncSession,
+    page: int,
+    limit: int,
+    sort: str,
+    tag: str | None,
+    cursor: str | None,
+) -> tuple[list[dict], str | None]:
+    if sort == "hot":
+        sort_keys = [Post.hot_score, Post.created_at, Post.id]
+    elif sort == "discussed":
+        sort_keys = [Post.comments_count, Post.created_at, Post.id]
+    else:
+        sort_keys = [Post.created_at, Post.id]
+
+    query = select(Post, *sort_keys).where(Post.deleted_at.is_(None))
+    if tag:
+        query = (
+            query.join(PostTag, PostTag.post_id == Post.id)
+            .join(Tag, Tag.id == PostTag.tag_id)
+            .where(Tag.name == tag)
+        )
+
+    query = query.order_by(*[desc(key) for key in sort_keys])
+    if cursor:
+        last_keys = _decode_posts_cursor(cursor, sort, len(sort_keys))
+        query = query.where(tuple_(*sort_keys) < tuple_(*[_cursor_value(v) for v in last_keys]))
+    else:
+        query = query.offset((page - 1) * limit)
+
+    rows = (await db.execute(query.limit(limit + 1))).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    next_cursor = None
+    if has_more:
+        next_cursor = encode_cursor({"s": sort, "k": list(rows[-1][1:])})
+
+    posts = [row[0] for row in rows]
+    return await _serialize_posts_batch(db, posts, current_user_id=None), next_cursor
+
+
+async def list_posts(
+    db: AsyncSession,
     page: int = 1,
     limit: int = 10,
     current_user_id: int | None = None,
     sort: str = "latest",
     tag: str | None = None,
-) -> list[dict]:
-    db = SessionLocal()
-    try:
-        offset = (page - 1) * limit
-
-        likes_subq = (
-            db.query(Like.post_id.label("post_id"), func.count(Like.id).label("likes_count"))
-            .group_by(Like.post_id)
-            .subquery()
-        )
-        comments_subq = (
-            db.query(Comment.post_id.label("post_id"), func.count(Comment.id).label("comments_count"))
-            .group_by(Comment.post_id)
-            .subquery()
-        )
-
-        query = db.query(Post).options(joinedload(Post.owner)).filter(Post.deleted_at.is_(None))
-        if tag:
-            query = (
-                query.join(PostTag, PostTag.post_id == Post.id)
-                .join(Tag, Tag.id == PostTag.tag_id)
-                .filter(Tag.name == tag)
-            )
+    cursor: str | None = None,
+) -> tuple[list[dict], str | None]:
+    """게시글 목록과 다음 페이지 cursor를 반환합니다.
 
-        if sort == "hot":
-            capped_views = case((Post.view_count > 200, 200), else_=Post.view_count)
-            hot_score = (
-                (func.coalesce(likes_subq.c.likes_count, 0) * 3.0)
-                + (func.coalesce(comments_subq.c.comments_count, 0) * 2.0)
-                + (capped_views * 0.1)
-            )
-            query = (
-                query.outerjoin(likes_subq, likes_subq.c.post_id == Post.id)
-                .outerjoin(comments_subq, comments_subq.c.post_id == Post.id)
-                .order_by(desc(hot_score), desc(Post.created_at))
-            )
-        elif sort == "discussed":
-            query = (
-                query.outerjoin(comments_subq, comments_subq.c.post_id == Post.id)
-                .order_by(desc(func.coalesce(comments_subq.c.comments_count, 0)), desc(Post.created_at))
-            )
+    cursor가 주어지면 OFFSET 대신 (정렬 키, created_at, id) 기준 keyset 탐색을 사용합니다.
+    페이지 본문은 사용자와 무관하게 캐시하고, 카운터와 is_liked/is_author는 요청마다 덧씌웁니다.
+    """
+    try:
+        generation = await cache.get(LIST_CACHE_GENERATION_KEY) or 0
+        cache_key = f"posts:list:{generation}:{sort}:{tag or ''}:{limit}:{cursor or page}"
+        cached = await cache.get(cache_key)
+        if cached is None:
+            items, next_cursor = await _query_posts_page(db, page, limit, sort, tag, cursor)
+            await cache.set(cache_key, {"items": items, "next_cursor": next_cursor})
         else:
-            query = query.order_by(desc(Post.created_at))
+            items, next_cursor = cached["items"], cached["next_cursor"]
 
-        posts = query.offset(offset).limit(limit).all()
-        return _serialize_posts_batch(db, posts, current_user_id)
+        await _overlay_counters(db, items)
+        await _overlay_viewer_fields(db, items, current_user_id)
+        return items, next_cursor
     except Exception as e:
         logger.error("failed to list posts: %s", e)
         raise
-    finally:
-        db.close()
 
 
-def _get_or_create_tag(db, tag_name: str) -> Tag:
-    tag = db.query(Tag).filter(Tag.name == tag_name).first()
+async def _get_or_create_tag(db, tag_name: str) -> Tag:
+    tag = await db.scalar(select(Tag).where(Tag.name == tag_name))
     if tag:
         return tag
     tag = Tag(name=tag_name)
     db.add(tag)
-    db.flush()
+    await db.flush()
     return tag
 
 
-def _replace_post_tags(db, post: Post, tags: list[str]) -> None:
-    if post.post_tags:
-        for post_tag in list(post.post_tags):
-            db.delete(post_tag)
-        db.flush()
+async def _replace_post_tags(db, post: Post, tags: list[str]) -> None:
+    await db.execute(delete(PostTag).where(PostTag.post_id == post.id))
 
     for tag_name in tags:
-        tag = _get_or_create_tag(db, tag_name)
+        tag = await _get_or_create_tag(db, tag_name)
         db.add(PostTag(post_id=post.id, tag_id=tag.id))
 
 
-def create_post(
+async def create_post(
+    db: AsyncSession,
     user_id: int,
     title: str,
     content: str,
     image_url: str | None = None,
     tags: list[str] | None = None,
 ) -> dict:
-    db = SessionLocal()
-    try:
-        new_post = Post(user_id=user_id, title=title, content=content, image_url=image_url)
-        db.add(new_post)
-        db.flush()
-
-        if tags:
-            _replace_post_tags(db, new_post, tags)
-
-        db.commit()
-        db.refresh(new_post)
-        return _serialize_posts_batch(db, [new_post], current_user_id=user_id)[0]
-    except Exception:
-        db.rollback()
-        raise
-    finally:
-        db.close()
-
-
-def find_post(post_id: int, current_user_id: int | None = None) -> dict | None:
-    db = SessionLocal()
-    try:
-        post = (
-            db.query(Post)
-            .options(joinedload(Post.owner))
-            .filter(Post.id == post_id, Post.deleted_at.is_(None))
-            .first()
+    new_post = Post(user_id=user_id, title=title, content=content, image_url=image_url)
+    db.add(new_post)
+    await db.flush()
+
+    if tags:
+        await _replace_post_tags(db, new_post, tags)
+    if image_url:
+        await images_model.set_reference(db, images_model.OWNER_POST, new_post.id, image_url)
+
+    await search_model.index_post(db, new_post.id, title, content)
+    await db.flush()
+    _invalidate_post_cache(db)
+    new_post = await _load_post(db, new_post.id)
+    return (await _serialize_posts_batch(db, [new_post], current_user_id=user_id))[0]
+
+
+async def find_post(db: AsyncSession, post_id: int, current_user_id: int | None = None) -> dict | None:
+    """게시글 상세. 본문/작성자/태그는 캐시에서, 카운터와 사용자별 필드는 DB에서 읽어 합칩니다.
+
+    카운터는 조회마다 바뀌므로 PK 한 건 조회로 최신 값을 덮어쓰고, 삭제 여부도 함께 확인합니다.
+    캐시 항목은 만들 때의 작성자 세대를 함께 저장해, 작성자 프로필이 바뀐 뒤에는 다시 만듭니다.
+    """
+    counters = (
+        await db.execute(
+            select(Post.user_id, Post.likes_count, Post.comments_count, Post.view_count)
+            .where(Post.id == post_id, Post.deleted_at.is_(None))
         )
-        if not post:
-            return None
-        return _serialize_posts_batch(db, [post], current_user_id)[0]
-    finally:
-        db.close()
+    ).first()
+    if not counters:
+        return None
+
+    author_id, likes_count, comments_count, view_count = counters
+    author_generation = await cache.get(_author_generation_key(author_id)) or 0
+    cached = await cache.get(_detail_cache_key(post_id))
+    if cached is None or cached.get("author_generation") != author_generation:
+        post = await _load_post(db, post_id)
+        data = (await _serialize_posts_batch(db, [post], current_user_id=None))[0]
+        await cache.set(_detail_cache_key(post_id), {"author_generation": author_generation, "data": data})
+    else:
+        data = cached["data"]
+
+    # 아직 flush되지 않은 조회수 증가분을 더해 보여 줍니다.
+    pending_views = await view_counter.pending(post_id)
+    if pending_views:
+        view_count = (view_count or 0) + pending_views
+
+    data["likes_count"] = likes_count or 0
+    data["comments_count"] = comments_count or 0
+    data["views"] = view_count
+    data["view_count"] = view_count
+    await _overlay_viewer_fields(db, [data], current_user_id)
+    return data
 
 
-def update_post(
+async def update_post(
+    db: AsyncSession,
     post_id: int,
     title: str,
     content: str,
     image_url: str | None = None,
     tags: list[str] | None = None,
 ) -> dict | None:
-    db = SessionLocal()
-    try:
-        # BE-H4: 처음부터 joinedload로 조회하여 커밋 후 재쿼리 방지
-        post = db.query(Post).options(joinedload(Post.owner)).filter(Post.id == post_id).first()
-        if not post:
-            return None
-
-        post.title = title
-        post.content = content
-        if image_url is not None:
-            post.image_url = image_url
-        if tags is not None:
-            _replace_post_tags(db, post, tags)
-
-        db.commit()
-        db.refresh(post)
-        return _serialize_posts_batch(db, [post], current_user_id=None)[0]
-    except Exception:
-        db.rollback()
-        raise
-    finally:
-        db.close()
+    # BE-H4: 수정 전 한 번만 조회하고, 작성자는 직렬화 시 요약 캐시에서 채웁니다.
+    post = await _load_post(db, post_id)
+    if not post:
+        return None
+
+    post.title = title
+    post.content = content
+    if image_url is not None and image_url != post.image_url:
+        post.image_url = image_url
+        await images_model.set_reference(db, images_model.OWNER_POST, post_id, image_url)
+    if tags is not None:
+        await _replace_post_tags(db, post, tags)
+
+    await search_model.index_post(db, post_id, title, content)
+    await db.flush()
+    _invalidate_post_cache(db, post_id)
+    post = await _load_post(db, post_id)
+    return (await _serialize_posts_batch(db, [post], current_user_id=None))[0]
+
+
+async def delete_post(db: AsyncSession, post_id: int) -> None:
+    """BE-H3: Hard Delete → Soft Delete. deleted_at 컬럼 활용."""
+    await db.execute(
+        update(Post)
+        .where(Post.id == post_id)
+        .values(deleted_at=datetime.now(timezone.utc))
+    )
+    await search_model.remove_post(db, post_id)
+    # 삭제된 글은 더 이상 표시되지 않으므로 이미지 참조를 풀어 GC 대상이 되게 합니다.
+    await images_model.set_reference(db, images_model.OWNER_POST, post_id, None)
+    _invalidate_post_cache(db, post_id)
 
+    async def _drop_trending_snapshots() -> None:
+        await cache.delete(*[_trending_cache_key(days) for days in range(1, TRENDING_MAX_DAYS + 1)])
 
-def delete_post(post_id: int) -> None:
-    """BE-H3: Hard Delete → Soft Delete. deleted_at 컬럼 활용."""
-    db = SessionLocal()
-    try:
-        db.execute(
-            update(Post)
-            .where(Post.id == post_id)
-            .values(deleted_at=datetime.now(timezone.utc))
-        )
-        db.commit()
-    except Exception:
-        db.rollback()
-        raise
-    finally:
-        db.close()
+    # 삭제된 글이 다음 갱신 전까지 트렌딩에 남지 않도록 스냅샷을 버립니다.
+    after_commit(db, _drop_trending_snapshots)
 
 
-def increment_views(post_id: int) -> None:
-    """BE-H2: Read→Modify→Write 경쟁 조건 제거. 단일 원자적 UPDATE로 처리."""
-    db = SessionLocal()
-    try:
-        db.execute(
-            update(Post)
-            .where(Post.id == post_id)
-            .values(view_count=Post.view_count + 1)
-        )
-        db.commit()
-    except Exception:
-        db.rollback()
-        raise
-    finally:
-        db.close()
+async def search_posts(
+    db: AsyncSession,
+    query: str,
+    limit: int = 10,
+    cursor: str | None = None,
+    current_user_id: int | None = None,
+) -> tuple[list[dict], str | None]:
+    """검색 역색인으로 찾은 게시글을 관련도 순으로 반환합니다."""
+    post_ids, next_cursor = await search_model.search_post_ids(db, query, limit, cursor)
+    if not post_ids:
+        return [], next_cursor
+
+    posts = (
+        await db.scalars(select(Post).where(Post.id.in_(post_ids)))
+    ).all()
+    posts_by_id = {post.id: post for post in posts}
+    ranked = [posts_by_id[post_id] for post_id in post_ids if post_id in posts_by_id]
+    return await _serialize_posts_batch(db, ranked, current_user_id), next_cursor
+
+
+async def increment_views(post_id: int) -> None:
+    """조회수 +1을 버퍼에 쌓습니다. DB 반영은 apply_view_counts가 묶어서 처리합니다."""
+    await view_counter.add(post_id)
+
+
+async def apply_view_counts(counts: dict[int, int]) -> int:
+    """버퍼에 모인 {post_id: 증가분}을 묶음마다 UPDATE ... CASE 한 번으로 반영합니다.
+
+    view_count와 함께 hot_score도 같은 문장에서 갱신합니다. 갱신된 행 수를 반환.
+    """
+    post_ids = list(counts)
+    updated = 0
+    async with session_scope() as db:
+        for start in range(0, len(post_ids), VIEW_FLUSH_BATCH_SIZE):
+            chunk = post_ids[start:start + VIEW_FLUSH_BATCH_SIZE]
+            delta = case({post_id: counts[post_id] for post_id in chunk}, value=Post.id, else_=0)
+            views = func.coalesce(Post.view_count, 0) + delta
+            result = await db.execute(
+                update(Post)
+                .where(Post.id.in_(chunk))
+                .ordered_values(
+                    (Post.hot_score, _hot_score_expression(views=views)),
+                    (Post.view_count, views),
+                    (Post.updated_at, Post.updated_at),
+                )
+            )
+            updated += result.rowcount
+    return updated
 
 
-def get_like_count(post_id: int) -> int:
-    db = SessionLocal()
-    try:
-        return db.query(Like).filter(Like.post_id == post_id).count()
-    finally:
-        db.close()
+view_counter = create_view_counter(apply_view_counts)
 
 
-def is_liked(user_id: int, post_id: int) -> bool:
-    db = SessionLocal()
-    try:
-        like = db.query(Like).filter(Like.user_id == user_id, Like.post_id == post_id).first()
-        return like is not None
-    finally:
-        db.close()
+async def flush_view_counts() -> int:
+    """버퍼의 조회수를 즉시 DB에 반영합니다. 주기 작업과 종료 시점에 호출됩니다."""
+    return await view_counter.flush()
 
 
-def add_like(user_id: int, post_id: int) -> bool:
-    db = SessionLocal()
-    try:
-        db.add(Like(user_id=user_id, post_id=post_id))
-        db.commit()
-        return True
-    except IntegrityError:
-        db.rollback()
-        return False
-    except Exception:
-        db.rollback()
-        raise
-    finally:
-        db.close()
+def _counter_update(post_id: int, likes_delta: int = 0, comments_delta: int = 0):
+    likes = Post.likes_count + likes_delta
+    comments = Post.comments_count + comments_delta
+    # MySQL은 SET 절을 왼쪽부터 갱신된 값으로 평가하므로 hot_score를 가장 먼저,
+    # 변경 전 컬럼 + delta 식으로 계산해 모든 DB에서 같은 결과가 나오게 합니다.
+    # 카운터 변경은 게시글 수정이 아니므로 updated_at은 그대로 유지합니다.
+    return (
+        update(Post)
+        .where(Post.id == post_id)
+        .ordered_values(
+            (Post.hot_score, _hot_score_expression(likes, comments)),
+            (Post.likes_count, likes),
+            (Post.comments_count, comments),
+            (Post.updated_at, Post.updated_at),
+        )
+    )
 
 
-def remove_like(user_id: int, post_id: int) -> None:
-    db = SessionLocal()
-    try:
-        db.query(Like).filter(Like.user_id == user_id, Like.post_id == post_id).delete()
-        db.commit()
-    except Exception:
-        db.rollback()
-        raise
-    finally:
-        db.close()
+async def adjust_post_counters(db: AsyncSession, post_id: int, likes_delta: int = 0, comments_delta: int = 0) -> None:
+    """posts의 likes_count/comments_count와 hot_score를 호출자의 트랜잭션 안에서 원자적으로 증감합니다.
 
+    상세/목록 캐시는 카운터를 읽을 때마다 DB 값으로 덮어쓰므로 여기서는 무효화하지 않습니다.
+    """
+    if likes_delta or comments_delta:
+        await db.execute(_counter_update(post_id, likes_delta=likes_delta, comments_delta=comments_delta))
 
-def get_trending(
-    days: int = 7,
-    limit: int = 5,
-    current_user_id: int | None = None,
-) -> dict:
-    db = SessionLocal()
+
+async def get_like_count(db: AsyncSession, post_id: int) -> int:
+    likes_count = await db.scalar(select(Post.likes_count).where(Post.id == post_id))
+    return likes_count or 0
+
+
+async def is_liked(db: AsyncSession, user_id: int, post_id: int) -> bool:
+    like_id = await db.scalar(
+        select(Like.id).where(Like.user_id == user_id, Like.post_id == post_id)
+    )
+    return like_id is not None
+
+
+async def add_like(db: AsyncSession, user_id: int, post_id: int) -> bool:
     try:
-        cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+        # 중복 좋아요 경쟁에서 요청 트랜잭션 전체가 깨지지 않도록 SAVEPOINT 안에서 INSERT
+        async with db.begin_nested():
+            db.add(Like(user_id=user_id, post_id=post_id))
+    except IntegrityError:
+        return False
+    await adjust_post_counters(db, post_id, likes_delta=1)
+    return True
+
 
-        likes_subq = (
-            db.query(Like.post_id.label("post_id"), func.count(Like.id).label("likes_count"))
-            .group_by(Like.post_id)
-            .subquery()
+async def remove_like(db: AsyncSession, user_id: int, post_id: int) -> None:
+    result = await db.execute(
+        delete(Like).where(Like.user_id == user_id, Like.post_id == post_id)
+    )
+    if result.rowcount:
+        await adjust_post_counters(db, post_id, likes_delta=-result.rowcount)
+
+
+async def reconcile_post_counters() -> int:
+    """likes/comments 테이블 기준으로 모든 게시글의 카운터와 hot_score를 다시 계산합니다. 갱신된 행 수를 반환."""
+    async with session_scope() as db:
+        likes_total = (
+            select(func.count(Like.id))
+            .where(Like.post_id == Post.id)
+            .correlate(Post)
+            .scalar_subquery()
+        )
+        comments_total = (
+            select(func.count(Comment.id))
+            .where(Comment.post_id == Post.id, Comment.deleted_at.is_(None))
+            .correlate(Post)
+            .scalar_subquery()
         )
-        comments_subq = (
-            db.query(Comment.post_id.label("post_id"), func.count(Comment.id).label("comments_count"))
-            .group_by(Comment.post_id)
-            .subquery()
+        result = await db.execute(
+            update(Post).ordered_values(
+                (Post.hot_score, _hot_score_expression(likes_total, comments_total)),
+                (Post.likes_count, likes_total),
+                (Post.comments_count, comments_total),
+                (Post.updated_at, Post.updated_at),
+            )
         )
+        _invalidate_post_cache(db)
+        return result.rowcount
+
 
-        capped_views = case((Post.view_count > 200, 200), else_=Post.view_count)
-        hot_score = (
-            (func.coalesce(likes_subq.c.likes_count, 0) * 3.0)
-            + (func.coalesce(comments_subq.c.comments_count, 0) * 2.0)
-            + (capped_views * 0.1)
+async def recompute_hot_scores() -> int:
+    """저장된 카운터 기준으로 모든 게시글의 hot_score를 일괄 재계산합니다. 갱신된 행 수를 반환."""
+    async with session_scope() as db:
+        hot_score = _hot_score_expression()
+        result = await db.execute(
+            update(Post)
+            .where(Post.hot_score != hot_score)
+            .values(hot_score=hot_score, updated_at=Post.updated_at)
         )
+        if result.rowcount:
+            _invalidate_post_cache(db)
+        return result.rowcount
+
+
+def _trending_cache_key(days: int) -> str:
+    return f"posts:trending:{days}"
 
-        top_posts = (
-            db.query(Post)
-            .options(joinedload(Post.owner))
-            .outerjoin(likes_subq, likes_subq.c.post_id == Post.id)
-            .outerjoin(comments_subq, comments_subq.c.post_id == Post.id)
-            .filter(Post.created_at >= cutoff, Post.deleted_at.is_(None))
-            .order_by(desc(hot_score), desc(Post.created_at))
-            .limit(limit)
-            .all()
+
+def _trending_snapshot_ttl() -> int:
+    # 갱신 작업이 한두 번 실패해도 스냅샷이 비지 않도록 주기보다 넉넉하게 유지합니다.
+    if TRENDING_REFRESH_INTERVAL_SECONDS > 0:
+        return max(int(TRENDING_REFRESH_INTERVAL_SECONDS * 3), CACHE_TTL_SECONDS)
+    return CACHE_TTL_SECONDS
+
+
+async def _build_trending_snapshot(db: AsyncSession, days: int) -> dict:
+    """days 기간의 트렌딩 게시글/태그 상위 TRENDING_SNAPSHOT_LIMIT개를 사용자와 무관하게 계산합니다."""
+    cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+
+    top_posts = (
+        await db.scalars(
+            select(Post)
+            .where(Post.created_at >= cutoff, Post.deleted_at.is_(None))
+            .order_by(desc(Post.hot_score), desc(Post.created_at))
+            .limit(TRENDING_SNAPSHOT_LIMIT)
         )
+    ).all()
 
-        top_tags_rows = (
-            db.query(Tag.name, func.count(PostTag.id).label("count"))
+    top_tags_rows = (
+        await db.execute(
+            select(Tag.name, func.count(PostTag.id).label("count"))
             .join(PostTag, Tag.id == PostTag.tag_id)
             .join(Post, Post.id == PostTag.post_id)
-            .filter(Post.created_at >= cutoff, Post.deleted_at.is_(None))
+            .where(Post.created_at >= cutoff, Post.deleted_at.is_(None))
             .group_by(Tag.name)
             .order_by(desc(func.count(PostTag.id)), Tag.name.asc())
-            .limit(limit)
-            .all()
+            .limit(TRENDING_SNAPSHOT_LIMIT)
         )
+    ).all()
 
-        posts_payload = _serialize_posts_batch(db, top_posts, current_user_id)
-        post_ids = [p["id"] for p in posts_payload]
-        score_map = {}
-        if post_ids:
-            score_rows = (
-                db.query(Post.id, hot_score)
-                .outerjoin(likes_subq, likes_subq.c.post_id == Post.id)
-                .outerjoin(comments_subq, comments_subq.c.post_id == Post.id)
-                .filter(Post.id.in_(post_ids))
-                .all()
-            )
-            score_map = {post_id: float(score) for post_id, score in score_rows}
-
-        for item in posts_payload:
-            item["trending_score"] = round(score_map.get(item["id"], 0.0), 2)
-
-        return {
-            "period_days": days,
-            "top_tags": [{"name": name, "count": count} for name, count in top_tags_rows],
-            "posts": posts_payload,
-        }
-    finally:
-        db.close()
+    posts_payload = await _serialize_posts_batch(db, top_posts, current_user_id=None)
+    for post, item in zip(top_posts, posts_payload):
+        item["trending_score"] = round(float(post.hot_score or 0.0), 2)
+
+    return {
+        "period_days": days,
+        "top_tags": [{"name": name, "count": count} for name, count in top_tags_rows],
+        "posts": posts_payload,
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+async def refresh_trending_snapshots() -> int:
+    """요청된 적 있는 days 구간의 트렌딩 스냅샷을 다시 만들어 캐시에 저장합니다. 갱신한 구간 수를 반환."""
+    windows = sorted(_trending_windows)
+    async with session_scope() as db:
+        for days in windows:
+            snapshot = await _build_trending_snapshot(db, days)
+            await cache.set(_trending_cache_key(days), snapshot, ttl=_trending_snapshot_ttl())
+    return len(windows)
+
+
+async def get_trending(
+    db: AsyncSession,
+    days: int = 7,
+    limit: int = 5,
+    current_user_id: int | None = None,
+) -> dict:
+    """백그라운드에서 갱신되는 스냅샷을 내려주고, 카운터와 is_liked/is_author는 요청마다 덧씌웁니다."""
+    _trending_windows.add(days)
+    snapshot = await cache.get(_trending_cache_key(days))
+    if snapshot is None:
+        snapshot = await _build_trending_snapshot(db, days)
+        await cache.set(_trending_cache_key(days), snapshot, ttl=_trending_snapshot_ttl())
+
+    posts_payload = snapshot["posts"][:limit]
+    await _overlay_counters(db, posts_payload)
+    await _overlay_viewer_fields(db, posts_payload, current_user_id)
+    return {
+        "period_days": days,
+        "top_tags": snapshot["top_tags"][:limit],
+        "posts": posts_payload,
+        "generated_at": snapshot["generated_at"],
+    }
@@ -0,0 +1,138 @@
+from sqlalchemy import and_, delete, desc, func, insert, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.common.exceptions import InvalidPagingParamsError
+from app.common.pagination import decode_cursor, encode_cursor
+from app.common.search_tokens import USER_PREFIX_LENGTH, query_terms, tokenize, user_prefixes
+from app.db_models import Post, PostSearchTerm, User, UserSearchPrefix
+
+TITLE_WEIGHT = 3
+CONTENT_WEIGHT = 1
+COMMENT_WEIGHT = 1
+
+
+async def _insert_terms(db: AsyncSession, post_id: int, comment_id: int | None, weights: dict[str, int]) -> None:
+    if not weights:
+        return
+    await db.execute(
+        insert(PostSearchTerm),
+        [
+            {"term": term, "post_id": post_id, "comment_id": comment_id, "weight": weight}
+            for term, weight in weights.items()
+        ],
+    )
+
+
+async def index_post(db: AsyncSession, post_id: int, title: str, content: str) -> None:
+    """게시글 제목/본문의 색인을 다시 만듭니다. 댓글 색인은 그대로 둡니다."""
+    await db.execute(
+        delete(PostSearchTerm).where(PostSearchTerm.post_id == post_id, PostSearchTerm.comment_id.is_(None))
+    )
+    weights: dict[str, int] = {}
+    for term, count in tokenize(title).items():
+        weights[term] = weights.get(term, 0) + count * TITLE_WEIGHT
+    for term, count in tokenize(content).items():
+        weights[term] = weights.get(term, 0) + count * CONTENT_WEIGHT
+    await _insert_terms(db, post_id, None, weights)
+
+
+async def index_comment(db: AsyncSession, post_id: int, comment_id: int, content: str) -> None:
+    await remove_comment(db, comment_id)
+    weights = {term: count * COMMENT_WEIGHT for term, count in tokenize(content).items()}
+    await _insert_terms(db, post_id, comment_id, weights)
+
+
+async def remove_post(db: AsyncSession, post_id: int) -> None:
+    """게시글과 그 댓글의 색인을 모두 지웁니다."""
+    await db.execute(delete(PostSearchTerm).where(PostSearchTerm.post_id == post_id))
+
+
+async def remove_comment(db: AsyncSession, comment_id: int) -> None:
+    await db.execute(delete(PostSearchTerm).where(PostSearchTerm.comment_id == comment_id))
+
+
+async def search_post_ids(
+    db: AsyncSession,
+    query: str,
+    limit: int,
+    cursor: str | None = None,
+) -> tuple[list[int], str | None]:
+    """모든 검색어를 포함하는 게시글 id를 점수(가중치 합) 내림차순으로 반환합니다.
+
+    cursor는 마지막 결과의 (score, post_id)이며 같은 검색어로만 이어서 조회할 수 있습니다.
+    """
+    terms = query_terms(query)
+    if not terms:
+        return [], None
+
+    score = func.sum(PostSearchTerm.weight)
+    search_query = (
+        select(PostSearchTerm.post_id, score.label("score"))
+        .join(Post, Post.id == PostSearchTerm.post_id)
+        .where(PostSearchTerm.term.in_(terms), Post.deleted_at.is_(None))
+        .group_by(PostSearchTerm.post_id)
+        .having(func.count(PostSearchTerm.term.distinct()) == len(terms))
+        .order_by(desc("score"), PostSearchTerm.post_id.desc())
+    )
+    if cursor:
+        payload = decode_cursor(cursor)
+        keys = payload.get("k")
+        if payload.get("q") != terms or not isinstance(keys, list) or len(keys) != 2:
+            raise InvalidPagingParamsError("cursor가 현재 검색어와 일치하지 않습니다.")
+        last_score, last_post_id = keys
+        search_query = search_query.having(
+            or_(score < last_score, and_(score == last_score, PostSearchTerm.post_id < last_post_id))
+        )
+
+    rows = (await db.execute(search_query.limit(limit + 1))).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    next_cursor = None
+    if has_more:
+        last_post_id, last_score = rows[-1]
+        next_cursor = encode_cursor({"q": terms, "k": [int(last_score), last_post_id]})
+    return [post_id for post_id, _ in rows], next_cursor
+
+
+async def index_user(db: AsyncSession, user_id: int, nickname: str, email: str) -> None:
+    """가입/닉네임 변경 시 사용자 prefix 색인을 다시 만듭니다."""
+    await remove_user(db, user_id)
+    await db.execute(
+        insert(UserSearchPrefix),
+        [
+            {"prefix": prefix, "nickname": nickname, "user_id": user_id}
+            for prefix in user_prefixes(nickname, email)
+        ],
+    )
+
+
+async def remove_user(db: AsyncSession, user_id: int) -> None:
+    await db.execute(delete(UserSearchPrefix).where(UserSearchPrefix.user_id == user_id))
+
+
+async def search_users(db: AsyncSession, query: str, exclude_user_id: int, limit: int) -> list[User]:
+    """닉네임 또는 이메일이 query로 시작하는 사용자를 닉네임 순으로 반환합니다.
+
+    query는 normalize_user_query로 정규화된 값이어야 합니다. prefix 색인을 등호로 찾고
+    닉네임 순으로 저장된 인덱스를 그대로 읽으므로 사용자 수와 관계없이 LIMIT개만 읽습니다.
+    """
+    search_query = (
+        select(User)
+        .join(UserSearchPrefix, UserSearchPrefix.user_id == User.id)
+        .where(
+            UserSearchPrefix.prefix == query[:USER_PREFIX_LENGTH],
+            UserSearchPrefix.user_id != exclude_user_id,
+            User.deleted_at.is_(None),
+        )
+        .order_by(UserSearchPrefix.nickname.asc(), UserSearchPrefix.user_id.asc())
+        .limit(limit)
+    )
+    if len(query) > USER_PREFIX_LENGTH:
+        search_query = search_query.where(
+            or_(
+                func.lower(User.nickname).startswith(query, autoescape=True),
+                func.lower(User.email).startswith(query, autoescape=True),
+            )
+        )
+    return list(await db.scalars(search_query))
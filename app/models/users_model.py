@@ -1,151 +1,157 @@
-from datetime import datetime, timedelta, timezone
-from uuid import uuid4
+import os
+from datetime import datetime, timezone
 
-from sqlalchemy import update
+from sqlalchemy import select, update
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import SessionLocal
-from app.db_models import Session, User
+from app.core.cache import MemoryCache
+from app.database import after_commit
+from app.db_models import User
+from app.models import images_model, search_model
 from app.models.base import to_dict as _to_dict
 
-SESSION_TTL_DAYS = 7
+USER_SUMMARY_CACHE_SIZE = int(os.getenv("USER_SUMMARY_CACHE_SIZE", "10000"))
+USER_SUMMARY_TTL_SECONDS = int(os.getenv("USER_SUMMARY_TTL_SECONDS", "30"))
 
+# 작성자/상대방 표시용 요약의 프로세스 내 LRU. 이 프로세스의 변경은 커밋 즉시, 다른 워커의 변경은 TTL 안에 반영됩니다.
+user_summary_cache = MemoryCache(max_entries=USER_SUMMARY_CACHE_SIZE, default_ttl=USER_SUMMARY_TTL_SECONDS)
 
 
-def find_user_by_email(email: str) -> dict | None:
-    db = SessionLocal()
-    try:
-        user = db.query(User).filter(User.email == email, User.deleted_at.is_(None)).first()
-        return _to_dict(user)
-    finally:
-        db.close()
+def _summary_cache_key(user_id: int) -> str:
+    return f"users:summary:{user_id}"
 
 
-def get_user_by_id(user_id: int) -> dict | None:
-    db = SessionLocal()
-    try:
-        user = db.query(User).filter(User.id == user_id, User.deleted_at.is_(None)).first()
-        return _to_dict(user)
-    finally:
-        db.close()
+def _invalidate_user_summary(db: AsyncSession, user_id: int) -> None:
+    async def _invalidate() -> None:
+        await user_summary_cache.delete(_summary_cache_key(user_id))
 
+    after_commit(db, _invalidate)
 
-def is_email_exists(email: str) -> bool:
-    return find_user_by_email(email) is not None
 
+_SUMMARY_FIELDS = ("id", "email", "nickname", "profile_image_url")
 
-def is_nickname_exists(nickname: str) -> bool:
-    db = SessionLocal()
-    try:
-        exists = db.query(User.id).filter(User.nickname == nickname, User.deleted_at.is_(None)).first()
-        return exists is not None
-    finally:
-        db.close()
 
+async def _load_cached_users(db: AsyncSession, user_ids) -> dict[int, dict]:
+    """요약 필드 + active 여부. 캐시에 없는 사용자만 IN 쿼리 한 번으로 읽어 채웁니다."""
+    users: dict[int, dict] = {}
+    missing: list[int] = []
+    for user_id in dict.fromkeys(user_ids):
+        cached = await user_summary_cache.get(_summary_cache_key(user_id))
+        if cached is None:
+            missing.append(user_id)
+        else:
+            users[user_id] = cached
 
-def create_user(
-    email: str,
-    password_hash: str,
-    nickname: str,
-    profile_image_url: str | None = None,
-) -> dict | None:
-    db = SessionLocal()
-    try:
-        new_user = User(
-            email=email,
-            password=password_hash,
-            nickname=nickname,
-            profile_image_url=profile_image_url,
+    if missing:
+        rows = await db.execute(
+            select(User.id, User.email, User.nickname, User.profile_image_url, User.deleted_at)
+            .where(User.id.in_(missing))
         )
-        db.add(new_user)
-        db.commit()
-        db.refresh(new_user)
-        return _to_dict(new_user)
-    except IntegrityError:
-        db.rollback()
+        for user_id, email, nickname, profile_image_url, deleted_at in rows:
+            entry = {
+                "id": user_id,
+                "email": email,
+                "nickname": nickname,
+                "profile_image_url": profile_image_url,
+                "active": deleted_at is None,
+            }
+            users[user_id] = entry
+            await user_summary_cache.set(_summary_cache_key(user_id), entry)
+    return users
+
+
+async def get_user_summaries(db: AsyncSession, user_ids) -> dict[int, dict]:
+    """{user_id: {id, email, nickname, profile_image_url}}. 작성자/상대방 표시용 배치 조회.
+
+    탈퇴한 사용자도 기존 글/메시지에 표시해야 하므로 deleted_at과 관계없이 반환합니다.
+    """
+    users = await _load_cached_users(db, user_ids)
+    return {user_id: {field: user[field] for field in _SUMMARY_FIELDS} for user_id, user in users.items()}
+
+
+async def get_active_user_summary(db: AsyncSession, user_id: int) -> dict | None:
+    """탈퇴하지 않은 사용자의 요약. 요청마다 인증 사용자를 확인할 때 사용합니다."""
+    user = (await _load_cached_users(db, [user_id])).get(user_id)
+    if not user or not user["active"]:
         return None
-    finally:
-        db.close()
+    return {field: user[field] for field in _SUMMARY_FIELDS}
 
 
-def update_user(user_id: int, **kwargs) -> dict | None:
-    db = SessionLocal()
-    try:
-        user = db.query(User).filter(User.id == user_id).first()
-        if not user:
-            return None
+async def find_user_by_email(db: AsyncSession, email: str) -> dict | None:
+    user = await db.scalar(select(User).where(User.email == email, User.deleted_at.is_(None)))
+    return _to_dict(user)
 
-        if "nickname" in kwargs and kwargs["nickname"] is not None:
-            user.nickname = kwargs["nickname"]
-        if "profile_image_url" in kwargs:
-            user.profile_image_url = kwargs["profile_image_url"]
-        if "password_hash" in kwargs and kwargs["password_hash"]:
-            user.password = kwargs["password_hash"]
 
-        db.commit()
-        db.refresh(user)
-        return _to_dict(user)
-    finally:
-        db.close()
+async def get_user_by_id(db: AsyncSession, user_id: int) -> dict | None:
+    user = await db.scalar(select(User).where(User.id == user_id, User.deleted_at.is_(None)))
+    return _to_dict(user)
 
 
-def delete_user(user_id: int) -> None:
-    """BE-L2: Hard Delete → Soft Delete. deleted_at 커럼 활용."""
-    db = SessionLocal()
-    try:
-        db.execute(
-            update(User)
-            .where(User.id == user_id)
-            .values(deleted_at=datetime.now(timezone.utc))
-        )
-        db.commit()
-    except Exception:
-        db.rollback()
-        raise
-    finally:
-        db.close()
+async def is_email_exists(db: AsyncSession, email: str) -> bool:
+    return await find_user_by_email(db, email) is not None
 
 
-def create_session(user_id: int, ttl_days: int = SESSION_TTL_DAYS) -> str:
-    db = SessionLocal()
-    try:
-        session_id = str(uuid4())
-        expires_at = datetime.now(timezone.utc) + timedelta(days=ttl_days)
-        db.add(Session(session_id=session_id, user_id=user_id, expires_at=expires_at))
-        db.commit()
-        return session_id
-    finally:
-        db.close()
+async def is_nickname_exists(db: AsyncSession, nickname: str) -> bool:
+    exists = await db.scalar(
+        select(User.id).where(User.nickname == nickname, User.deleted_at.is_(None))
+    )
+    return exists is not None
 
 
-def get_user_id_by_session(session_id: str) -> int | None:
-    db = SessionLocal()
+async def create_user(
+    db: AsyncSession,
+    email: str,
+    password_hash: str,
+    nickname: str,
+    profile_image_url: str | None = None,
+) -> dict | None:
+    new_user = User(
+        email=email,
+        password=password_hash,
+        nickname=nickname,
+        profile_image_url=profile_image_url,
+    )
     try:
-        now = datetime.now(timezone.utc)
-        session = db.query(Session).filter(Session.session_id == session_id).first()
-        if not session:
-            return None
+        # 중복 가입 경쟁에서 요청 트랜잭션 전체가 깨지지 않도록 SAVEPOINT 안에서 INSERT
+        async with db.begin_nested():
+            db.add(new_user)
+    except IntegrityError:
+        return None
+    await search_model.index_user(db, new_user.id, nickname, email)
+    if profile_image_url:
+        await images_model.set_reference(db, images_model.OWNER_USER, new_user.id, profile_image_url)
+    await db.refresh(new_user)
+    return _to_dict(new_user)
 
-        # SQLite는 timezone-naive datetime을 저장하므로 비교 전 aware로 변환
-        expires_at = session.expires_at
-        if expires_at.tzinfo is None:
-            expires_at = expires_at.replace(tzinfo=timezone.utc)
 
-        if expires_at <= now:
-            db.delete(session)
-            db.commit()
-            return None
+async def update_user(db: AsyncSession, user_id: int, **kwargs) -> dict | None:
+    user = await db.scalar(select(User).where(User.id == user_id))
+    if not user:
+        return None
 
-        return session.user_id
-    finally:
-        db.close()
+    if "nickname" in kwargs and kwargs["nickname"] is not None and kwargs["nickname"] != user.nickname:
+        user.nickname = kwargs["nickname"]
+        await search_model.index_user(db, user_id, user.nickname, user.email)
+    if "profile_image_url" in kwargs and kwargs["profile_image_url"] != user.profile_image_url:
+        user.profile_image_url = kwargs["profile_image_url"]
+        await images_model.set_reference(db, images_model.OWNER_USER, user_id, user.profile_image_url)
+    if "password_hash" in kwargs and kwargs["password_hash"]:
+        user.password = kwargs["password_hash"]
 
+    _invalidate_user_summary(db, user_id)
+    await db.flush()
+    await db.refresh(user)
+    return _to_dict(user)
 
 
-def delete_session(session_id: str) -> None:
-    db = SessionLocal()
-    try:
-        db.query(Session).filter(Session.session_id == session_id).delete()
-        db.commit()
-    finally:
-        db.close()
+async def delete_user(db: AsyncSession, user_id: int) -> None:
+    """BE-L2: Hard Delete → Soft Delete. deleted_at 커럼 활용."""
+    await db.execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(deleted_at=datetime.now(timezone.utc))
+    )
+    await search_model.remove_user(db, user_id)
+    # 탈퇴한 사용자의 기존 글에도 프로필 이미지가 표시되므로 이미지 참조는 유지합니다.
+    _invalidate_user_summary(db, user_id)
@@ -2,6 +2,7 @@ from fastapi import APIRouter, status
 from pydantic import BaseModel, EmailStr, Field
 
 from app.common import responses
+from app.common.deps import DbSession
 from app.controllers import auth_controller
 
 router = APIRouter(prefix="/auth", tags=["auth"])
@@ -35,8 +36,9 @@ class LogoutRequest(BaseModel):
 
 
 @router.post("/signup", status_code=status.HTTP_201_CREATED)
-async def signup(payload: SignupRequest):
-    result = auth_controller.signup(
+async def signup(db: DbSession, payload: SignupRequest):
+    result = await auth_controller.signup(
+        db,
         email=payload.email,
         password=payload.password,
         nickname=payload.nickname,
@@ -45,8 +47,9 @@ async def signup(payload: SignupRequest):
 
 
 @router.post("/login")
-async def login(payload: LoginRequest):
-    result = auth_controller.login(
+async def login(db: DbSession, payload: LoginRequest):
+    result = await auth_controller.login(
+        db,
         email=payload.email,
         password=payload.password,
     )
@@ -54,25 +57,25 @@ async def login(payload: LoginRequest):
 
 
 @router.post("/refresh")
-async def refresh(payload: RefreshRequest):
-    result = auth_controller.refresh(payload.refresh_token)
+async def refresh(db: DbSession, payload: RefreshRequest):
+    result = await auth_controller.refresh(db, payload.refresh_token)
     return responses.ok("refresh_success", result)
 
 
 @router.post("/logout")
-async def logout(payload: LogoutRequest | None = None):
+async def logout(db: DbSession, payload: LogoutRequest | None = None):
     refresh_token = payload.refresh_token if payload else None
-    auth_controller.logout(refresh_token)
+    await auth_controller.logout(db, refresh_token)
     return responses.ok("logout_success", None)
 
 
 @router.post("/check-email")
-async def check_email(payload: CheckEmailRequest):
-    result = auth_controller.check_email(email=payload.email)
+async def check_email(db: DbSession, payload: CheckEmailRequest):
+    result = await auth_controller.check_email(db, email=payload.email)
     return responses.ok("email_available", result)
 
 
 @router.post("/check-nickname")
-async def check_nickname(payload: CheckNicknameRequest):
-    result = auth_controller.check_nickname(nickname=payload.nickname)
+async def check_nickname(db: DbSession, payload: CheckNicknameRequest):
+    result = await auth_controller.check_nickname(db, nickname=payload.nickname)
     return responses.ok("nickname_available", result)
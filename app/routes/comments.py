@@ -1,7 +1,7 @@
-from fastapi import APIRouter, Depends, Request
+from fastapi import APIRouter, Depends, Query, Request
 from pydantic import BaseModel, Field
 
-from app.common.deps import get_current_user_id_optional, require_user_id
+from app.common.deps import DbSession, get_current_user_id_optional, require_user_id
 from app.controllers import comments_controller
 
 router = APIRouter(prefix="/posts/{post_id}/comments", tags=["comments"])
@@ -12,26 +12,29 @@ class CommentRequest(BaseModel):
 
 
 @router.get("")
-def list_comments(
+async def list_comments(
+    db: DbSession,
     post_id: int,
+    limit: int = Query(50, ge=1, le=100, description="페이지당 댓글 수 (1~100)"),
+    after_id: int | None = Query(None, ge=1, description="이 댓글 이후부터 (paging.next_after_id)"),
     user_id: int | None = Depends(get_current_user_id_optional),
 ):
-    return comments_controller.list_comments(post_id, user_id)
+    return await comments_controller.list_comments(db, post_id, user_id, limit=limit, after_id=after_id)
 
 
 @router.post("")
-def create_comment(post_id: int, payload: CommentRequest, request: Request):
+async def create_comment(db: DbSession, post_id: int, payload: CommentRequest, request: Request):
     user_id = require_user_id(request)
-    return comments_controller.create_comment(user_id, post_id, {"content": payload.content})
+    return await comments_controller.create_comment(db, user_id, post_id, {"content": payload.content})
 
 
 @router.put("/{comment_id}")
-def update_comment(post_id: int, comment_id: int, payload: CommentRequest, request: Request):
+async def update_comment(db: DbSession, post_id: int, comment_id: int, payload: CommentRequest, request: Request):
     user_id = require_user_id(request)
-    return comments_controller.update_comment(user_id, post_id, comment_id, {"content": payload.content})
+    return await comments_controller.update_comment(db, user_id, post_id, comment_id, {"content": payload.content})
 
 
 @router.delete("/{comment_id}")
-def delete_comment(post_id: int, comment_id: int, request: Request):
+async def delete_comment(db: DbSession, post_id: int, comment_id: int, request: Request):
     user_id = require_user_id(request)
-    return comments_controller.delete_comment(user_id, post_id, comment_id)
\ No newline at end of file
+    return await comments_controller.delete_comment(db, user_id, post_id, comment_id)
\ No newline at end of file
@@ -1,57 +1,67 @@
-from fastapi import APIRouter, Request, UploadFile, File
-from pathlib import Path
-import uuid
-import logging
+from fastapi import APIRouter, File, Request, UploadFile
+from fastapi.routing import APIRoute
+from pydantic import BaseModel, Field
 
-from app.common import responses
-from app.common.deps import require_user_id
-from app.common.exceptions import BusinessException, ErrorCode
+from app.common.deps import DbSession, require_user_id
+from app.controllers import images_controller
 
-router = APIRouter(prefix="/images", tags=["images"])
-logger = logging.getLogger(__name__)
+# multipart 경계/헤더 여유분. Content-Length가 이보다 크면 본문을 읽기 전에 거절합니다.
+MULTIPART_OVERHEAD = 16 * 1024
 
-UPLOAD_DIR = Path("uploads")
-ALLOWED_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".webp"}
-MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB
 
+class UploadSizeLimitRoute(APIRoute):
+    """multipart 본문을 파싱(임시 파일로 스풀)하기 전에 Content-Length로 크기 초과 요청을 거절합니다."""
 
-async def _save_upload_file(file: UploadFile, subdir: str) -> str:
-    """파일 유효성 검사 후 저장하고 public URL을 반환합니다."""
-    file_ext = Path(file.filename or "").suffix.lower()
-    if file_ext not in ALLOWED_EXTENSIONS:
-        raise BusinessException(
-            ErrorCode.INVALID_REQUEST_FORMAT,
-            f"허용되지 않는 파일 형식입니다. 허용: {', '.join(sorted(ALLOWED_EXTENSIONS))}",
-        )
+    def get_route_handler(self):
+        handler = super().get_route_handler()
 
-    content = await file.read()
-    if len(content) > MAX_FILE_SIZE:
-        raise BusinessException(
-            ErrorCode.INVALID_REQUEST_FORMAT,
-            f"파일 크기는 {MAX_FILE_SIZE // (1024 * 1024)}MB 이하여야 합니다.",
-        )
+        async def _limited_handler(request: Request):
+            content_length = request.headers.get("content-length")
+            limit = images_controller.MAX_FILE_SIZE + MULTIPART_OVERHEAD
+            if content_length and content_length.isdigit() and int(content_length) > limit:
+                raise images_controller.file_too_large()
+            return await handler(request)
 
-    unique_filename = f"{uuid.uuid4()}{file_ext}"
-    file_path = UPLOAD_DIR / subdir / unique_filename
-    file_path.parent.mkdir(parents=True, exist_ok=True)
+        return _limited_handler
 
-    with open(file_path, "wb") as f:
-        f.write(content)
 
-    image_url = f"/uploads/{subdir}/{unique_filename}"
-    logger.info("이미지 업로드 성공: %s", image_url)
-    return image_url
+router = APIRouter(prefix="/images", tags=["images"], route_class=UploadSizeLimitRoute)
+
+
+class DirectUploadRequest(BaseModel):
+    filename: str = Field(..., min_length=1, max_length=255)
+    size: int = Field(..., gt=0)
+    sha256: str = Field(..., min_length=64, max_length=64)
+
+
+class CompleteUploadRequest(BaseModel):
+    image_url: str = Field(..., min_length=1, max_length=512)
 
 
 @router.post("/profile")
-async def upload_profile_image(request: Request, file: UploadFile = File(...)):
-    require_user_id(request)
-    image_url = await _save_upload_file(file, "profile")
-    return responses.ok("upload_success", {"image_url": image_url})
+async def upload_profile_image(request: Request, db: DbSession, file: UploadFile = File(...)):
+    user_id = require_user_id(request)
+    return await images_controller.upload_image(db, user_id, file)
 
 
 @router.post("/post")
-async def upload_post_image(request: Request, file: UploadFile = File(...)):
-    require_user_id(request)
-    image_url = await _save_upload_file(file, "post")
-    return responses.ok("upload_success", {"image_url": image_url})
\ No newline at end of file
+async def upload_post_image(request: Request, db: DbSession, file: UploadFile = File(...)):
+    user_id = require_user_id(request)
+    return await images_controller.upload_image(db, user_id, file)
+
+
+@router.post("/uploads")
+async def create_direct_upload(request: Request, db: DbSession, payload: DirectUploadRequest):
+    user_id = require_user_id(request)
+    return await images_controller.create_direct_upload(db, user_id, payload.model_dump())
+
+
+@router.put("/direct/{token}")
+async def receive_direct_upload(token: str, request: Request):
+    return await images_controller.receive_direct_upload(token, request.stream())
+
+
+@router.post("/uploads/complete")
+async def complete_direct_upload(request: Request, db: DbSession, payload: CompleteUploadRequest):
+    user_id = require_user_id(request)
+    return await images_controller.complete_direct_upload(db, user_id, payload.image_url)
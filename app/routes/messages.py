@@ -1,40 +1,142 @@
-from fastapi import APIRouter, Depends, Query, Request
+import asyncio
+import time
+from collections.abc import AsyncIterable
+
+from fastapi import APIRouter, Depends, Query, Request, WebSocket, status
+from fastapi.sse import EventSourceResponse, ServerSentEvent
 from pydantic import BaseModel, Field
 
-from app.common.deps import get_current_user_id, require_user_id
+from app.common.auth import get_stream_token_from_connection
+from app.common.deps import DbSession, get_current_user_id, get_stream_token, require_user_id
 from app.controllers import messages_controller
+from app.core.pubsub import message_hub
 
 router = APIRouter(prefix="/messages", tags=["messages"])
 
+# 스트림은 연결할 때 한 번만 인증하므로 access token의 exp가 지나면 닫고, 클라이언트가 새 토큰으로 다시 연결하게 합니다.
+TOKEN_EXPIRED_EVENT = "token_expired"
+
 
 class DirectMessageRequest(BaseModel):
     recipient_id: int = Field(..., ge=1)
     content: str = Field(..., min_length=1, max_length=1000)
 
 
+class MarkReadRequest(BaseModel):
+    up_to_id: int | None = Field(None, ge=1, description="이 메시지 id까지 읽음 처리 (생략 시 전체)")
+
+
 @router.get("/users")
-def search_users(
+async def search_users(
+    db: DbSession,
     query: str | None = Query(None, description="닉네임 또는 이메일 검색어"),
     user_id: int = Depends(get_current_user_id),
 ):
-    return messages_controller.search_users(user_id=user_id, query=query)
+    return await messages_controller.search_users(db, user_id=user_id, query=query)
 
 
 @router.get("/conversations")
-def list_conversations(user_id: int = Depends(get_current_user_id)):
-    return messages_controller.list_conversations(user_id=user_id)
+async def list_conversations(
+    db: DbSession,
+    limit: int = Query(20, ge=1, le=50, description="페이지당 대화 수 (1~50)"),
+    cursor: str | None = Query(None, description="이전 응답의 paging.next_cursor"),
+    user_id: int = Depends(get_current_user_id),
+):
+    return await messages_controller.list_conversations(db, user_id=user_id, limit=limit, cursor=cursor)
 
 
 @router.get("/with/{other_user_id}")
-def list_messages(other_user_id: int, user_id: int = Depends(get_current_user_id)):
-    return messages_controller.list_messages(user_id=user_id, other_user_id=other_user_id)
+async def list_messages(
+    db: DbSession,
+    other_user_id: int,
+    limit: int = Query(50, ge=1, le=100, description="페이지당 메시지 수 (1~100)"),
+    before_id: int | None = Query(None, ge=1, description="이 메시지보다 이전 메시지 (paging.oldest_id)"),
+    after_id: int | None = Query(None, ge=1, description="이 메시지보다 이후 메시지 (paging.newest_id)"),
+    user_id: int = Depends(get_current_user_id),
+):
+    return await messages_controller.list_messages(
+        db,
+        user_id=user_id,
+        other_user_id=other_user_id,
+        limit=limit,
+        before_id=before_id,
+        after_id=after_id,
+    )
+
+
+@router.post("/with/{other_user_id}/read")
+async def mark_read(
+    db: DbSession,
+    other_user_id: int,
+    payload: MarkReadRequest | None = None,
+    user_id: int = Depends(get_current_user_id),
+):
+    up_to_id = payload.up_to_id if payload else None
+    return await messages_controller.mark_read(db, user_id=user_id, other_user_id=other_user_id, up_to_id=up_to_id)
 
 
 @router.post("")
-def send_message(payload: DirectMessageRequest, request: Request):
+async def send_message(db: DbSession, payload: DirectMessageRequest, request: Request):
     user_id = require_user_id(request)
-    return messages_controller.send_message(
+    return await messages_controller.send_message(
+        db,
         user_id=user_id,
         recipient_id=payload.recipient_id,
         content=payload.content,
     )
+
+
+async def _wait_for_disconnect(websocket: WebSocket) -> None:
+    # 클라이언트가 보내는 프레임(ping 등)은 무시하고 연결 종료만 감지합니다.
+    while True:
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            return
+
+
+@router.websocket("/stream")
+async def message_stream(websocket: WebSocket):
+    verified = get_stream_token_from_connection(websocket)
+    if not verified:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    user_id, expires_at = verified
+
+    # accept 전에 구독해 연결 직후 발행된 메시지도 놓치지 않습니다.
+    async with message_hub.subscribe(messages_controller.user_channel(user_id)) as subscription:
+        await websocket.accept()
+        disconnected = asyncio.create_task(_wait_for_disconnect(websocket))
+        expired = asyncio.create_task(asyncio.sleep(max(expires_at - time.time(), 0)))
+        try:
+            while True:
+                next_event = asyncio.create_task(subscription.get())
+                done, _ = await asyncio.wait(
+                    {next_event, disconnected, expired}, return_when=asyncio.FIRST_COMPLETED
+                )
+                if disconnected in done:
+                    next_event.cancel()
+                    break
+                if expired in done:
+                    next_event.cancel()
+                    await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=TOKEN_EXPIRED_EVENT)
+                    break
+                await websocket.send_json(next_event.result())
+        finally:
+            disconnected.cancel()
+            expired.cancel()
+
+
+@router.get("/stream", response_class=EventSourceResponse)
+async def message_event_stream(
+    token: tuple[int, int] = Depends(get_stream_token),
+) -> AsyncIterable[ServerSentEvent]:
+    """WebSocket을 쓸 수 없는 클라이언트용 SSE 스트림. 토큰이 만료되면 token_expired 이벤트를 보내고 닫습니다."""
+    user_id, expires_at = token
+    async with message_hub.subscribe(messages_controller.user_channel(user_id)) as subscription:
+        while True:
+            try:
+                event = await asyncio.wait_for(subscription.get(), timeout=expires_at - time.time())
+            except TimeoutError:
+                yield ServerSentEvent(data={"reason": "access token expired"}, event=TOKEN_EXPIRED_EVENT)
+                return
+            yield ServerSentEvent(data=event["data"], event=event["type"])
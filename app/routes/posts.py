@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, Query, Request
 from pydantic import BaseModel, Field
 
-from app.common.deps import get_current_user_id_optional, require_user_id
+from app.common.deps import DbSession, get_current_user_id_optional, require_user_id
 from app.controllers import posts_controller
 
 router = APIRouter(prefix="/posts", tags=["posts"])
@@ -22,29 +22,44 @@ class PostUpdateRequest(BaseModel):
 
 
 @router.get("")
-def list_posts(
+async def list_posts(
+    db: DbSession,
     page: int = Query(1, ge=1, description="페이지 번호 (1부터 시작)"),
     limit: int = Query(10, ge=1, le=50, description="페이지당 개수 (1~50)"),
     sort: str = Query("latest", description="정렬 방식: latest | hot | discussed"),
     tag: str | None = Query(None, description="태그 필터"),
+    cursor: str | None = Query(None, description="이전 응답의 paging.next_cursor (지정 시 page 무시)"),
     user_id: int | None = Depends(get_current_user_id_optional),
 ):
-    return posts_controller.list_posts(page, limit, user_id, sort=sort, tag=tag)
+    return await posts_controller.list_posts(db, page, limit, user_id, sort=sort, tag=tag, cursor=cursor)
 
 
 @router.get("/trending")
-def get_trending(
+async def get_trending(
+    db: DbSession,
     days: int = Query(7, ge=1, le=30, description="트렌드 집계 기간(일)"),
     limit: int = Query(5, ge=1, le=20, description="반환 개수"),
     user_id: int | None = Depends(get_current_user_id_optional),
 ):
-    return posts_controller.get_trending(days=days, limit=limit, current_user_id=user_id)
+    return await posts_controller.get_trending(db, days=days, limit=limit, current_user_id=user_id)
+
+
+@router.get("/search")
+async def search_posts(
+    db: DbSession,
+    q: str | None = Query(None, description="검색어 (제목/본문/댓글, 모든 단어 포함)"),
+    limit: int = Query(10, ge=1, le=50, description="페이지당 개수 (1~50)"),
+    cursor: str | None = Query(None, description="이전 응답의 paging.next_cursor"),
+    user_id: int | None = Depends(get_current_user_id_optional),
+):
+    return await posts_controller.search_posts(db, q, limit=limit, cursor=cursor, current_user_id=user_id)
 
 
 @router.post("")
-def create_post(payload: PostCreateRequest, request: Request):
+async def create_post(db: DbSession, payload: PostCreateRequest, request: Request):
     user_id = require_user_id(request)
-    return posts_controller.create_post(
+    return await posts_controller.create_post(
+        db,
         user_id=user_id,
         title=payload.title,
         content=payload.content,
@@ -54,14 +69,15 @@ def create_post(payload: PostCreateRequest, request: Request):
 
 
 @router.get("/{post_id}")
-def get_post(post_id: int, user_id: int | None = Depends(get_current_user_id_optional)):
-    return posts_controller.get_post(post_id, user_id)
+async def get_post(db: DbSession, post_id: int, user_id: int | None = Depends(get_current_user_id_optional)):
+    return await posts_controller.get_post(db, post_id, user_id)
 
 
 @router.put("/{post_id}")
-def update_post(post_id: int, payload: PostUpdateRequest, request: Request):
+async def update_post(db: DbSession, post_id: int, payload: PostUpdateRequest, request: Request):
     user_id = require_user_id(request)
-    return posts_controller.update_post(
+    return await posts_controller.update_post(
+        db,
         user_id=user_id,
         post_id=post_id,
         title=payload.title,
@@ -72,18 +88,18 @@ def update_post(post_id: int, payload: PostUpdateRequest, request: Request):
 
 
 @router.delete("/{post_id}")
-def delete_post(post_id: int, request: Request):
+async def delete_post(db: DbSession, post_id: int, request: Request):
     user_id = require_user_id(request)
-    return posts_controller.delete_post(user_id, post_id)
+    return await posts_controller.delete_post(db, user_id, post_id)
 
 
 @router.post("/{post_id}/likes")
-def like_post(post_id: int, request: Request):
+async def like_post(db: DbSession, post_id: int, request: Request):
     user_id = require_user_id(request)
-    return posts_controller.like_post(user_id, post_id)
+    return await posts_controller.like_post(db, user_id, post_id)
 
 
 @router.delete("/{post_id}/likes")
-def unlike_post(post_id: int, request: Request):
+async def unlike_post(db: DbSession, post_id: int, request: Request):
     user_id = require_user_id(request)
-    return posts_controller.unlike_post(user_id, post_id)
+    return await posts_controller.unlike_post(db, user_id, post_id)
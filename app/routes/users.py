@@ -3,7 +3,7 @@ from typing import Optional
 from fastapi import APIRouter, Depends
 from pydantic import BaseModel, Field
 
-from app.common.deps import get_current_user_id
+from app.common.deps import CurrentUser, DbSession, get_current_user_id
 from app.controllers import users_controller
 
 router = APIRouter(prefix="/users", tags=["users"])
@@ -20,20 +20,18 @@ class UpdatePasswordRequest(BaseModel):
 
 
 @router.get("/me")
-async def get_my_profile(user_id: int = Depends(get_current_user_id)):
-    return users_controller.get_me(user_id)
+async def get_my_profile(current_user: CurrentUser):
+    return await users_controller.get_me(current_user)
 
 
 @router.patch("/me")
-async def update_profile(
-    payload: UpdateProfileRequest,
-    user_id: int = Depends(get_current_user_id),
-):
-    return users_controller.update_me(user_id, payload.model_dump(exclude_unset=True))
+async def update_profile(db: DbSession, payload: UpdateProfileRequest, current_user: CurrentUser):
+    return await users_controller.update_me(db, current_user, payload.model_dump(exclude_unset=True))
 
 
 @router.patch("/me/password")
 async def update_password(
+    db: DbSession,
     payload: UpdatePasswordRequest,
     user_id: int = Depends(get_current_user_id),
 ):
@@ -41,9 +39,9 @@ async def update_password(
         "old_password": payload.current_password,
         "new_password": payload.new_password,
     }
-    return users_controller.update_password(user_id, controller_payload)
+    return await users_controller.update_password(db, user_id, controller_payload)
 
 
 @router.delete("/me")
-async def delete_account(user_id: int = Depends(get_current_user_id)):
-    return users_controller.withdraw(user_id)
+async def delete_account(db: DbSession, user_id: int = Depends(get_current_user_id)):
+    return await users_controller.withdraw(db, user_id)
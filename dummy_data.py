@@ -1,9 +1,11 @@
+import asyncio
 import random
 from faker import Faker
-from app.database import SessionLocal, engine
+from app.database import SessionLocal, engine, session_scope
 from app import db_models as models # 이름 충돌 방지용 별칭
 from app.common.security import hash_password
-from sqlalchemy import text
+from app.models import posts_model, search_model
+from sqlalchemy import select, text
 
 # DB 테이블 생성 확인
 models.Base.metadata.create_all(bind=engine)
@@ -11,6 +13,48 @@ models.Base.metadata.create_all(bind=engine)
 db = SessionLocal()
 fake = Faker('ko_KR') # 한국어 데이터 생성
 
+
+async def index_seeded_posts() -> int:
+    """bulk insert된 게시글/댓글을 앱과 같은 search_model 헬퍼로 색인합니다. 색인한 행 수를 반환."""
+    async with session_scope() as db:
+        posts = (await db.execute(select(models.Post.id, models.Post.title, models.Post.content))).all()
+        for post_id, title, content in posts:
+            await search_model.index_post(db, post_id, title, content)
+        comments = (
+            await db.execute(
+                select(models.Comment.id, models.Comment.post_id, models.Comment.content).where(
+                    models.Comment.deleted_at.is_(None)
+                )
+            )
+        ).all()
+        for comment_id, post_id, content in comments:
+            await search_model.index_comment(db, post_id, comment_id, content)
+    return len(posts) + len(comments)
+
+
+async def index_seeded_users() -> int:
+    """bulk insert된 사용자를 create_user와 같은 search_model.index_user로 prefix 색인합니다."""
+    async with session_scope() as db:
+        users = (await db.execute(select(models.User.id, models.User.nickname, models.User.email))).all()
+        for user_id, nickname, email in users:
+            await search_model.index_user(db, user_id, nickname, email)
+    return len(users)
+
+
+async def finish_seeding():
+    # 4. 검색 색인 (bulk insert는 search_model을 거치지 않음)
+    print("🔎 게시글/댓글/유저 검색 색인 생성 중...")
+    indexed = await index_seeded_posts()
+    print(f"✅ 게시글/댓글 {indexed}개 색인 완료!")
+    indexed = await index_seeded_users()
+    print(f"✅ 유저 {indexed}명 검색 색인 완료!")
+
+    # 5. bulk insert는 카운터 증감을 거치지 않으므로 likes_count/comments_count/hot_score를 한 번에 다시 계산
+    print("🔢 게시글 카운터와 hot_score 재계산 중...")
+    updated = await posts_model.reconcile_post_counters()
+    print(f"✅ 게시글 {updated}개 카운터 재계산 완료!")
+
+
 def init_dummy_data():
     print("🚀 더미 데이터 생성을 시작합니다...")
 
@@ -18,9 +62,11 @@ def init_dummy_data():
     print("🧹 기존 데이터를 청소하는 중...")
     try:
         # 외래키 제약조건 때문에 순서가 중요합니다. (자식 -> 부모 순서로 삭제)
+        db.query(models.PostSearchTerm).delete()
         db.query(models.Comment).delete()
         db.query(models.Like).delete()
         db.query(models.Post).delete()
+        db.query(models.UserSearchPrefix).delete()
         db.query(models.User).delete()
         db.commit()
     except Exception as e:
@@ -101,7 +147,10 @@ def init_dummy_data():
         db.bulk_save_objects(comments)
         db.commit()
     print("\n✅ 댓글 생성 완료!")
-    
+
+    # 4~5. 검색 색인과 카운터 재계산 (이벤트 루프를 하나만 써야 비동기 커넥션 풀이 루프를 넘나들지 않습니다)
+    asyncio.run(finish_seeding())
+
     print("🎉 모든 더미 데이터(총 10만건 이상) 생성이 완료되었습니다!")
     db.close()
 
@@ -0,0 +1,39 @@
+"""post likes/comments counter columns
+
+Revision ID: 20261017_000002
+Revises: 20260211_000001
+Create Date: 2026-10-17 10:00:00
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20261017_000002"
+down_revision: Union[str, Sequence[str], None] = "20260211_000001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("posts", sa.Column("likes_count", sa.Integer(), nullable=False, server_default="0"))
+    op.add_column("posts", sa.Column("comments_count", sa.Integer(), nullable=False, server_default="0"))
+
+    op.execute(
+        """
+        UPDATE posts SET
+            likes_count = (SELECT COUNT(*) FROM likes WHERE likes.post_id = posts.id),
+            comments_count = (
+                SELECT COUNT(*) FROM comments
+                WHERE comments.post_id = posts.id AND comments.deleted_at IS NULL
+            )
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("posts", "comments_count")
+    op.drop_column("posts", "likes_count")
@@ -0,0 +1,43 @@
+"""post hot_score column and index
+
+Revision ID: 20261017_000003
+Revises: 20261017_000002
+Create Date: 2026-10-17 11:00:00
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20261017_000003"
+down_revision: Union[str, Sequence[str], None] = "20261017_000002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("posts", sa.Column("hot_score", sa.Float(), nullable=False, server_default="0"))
+
+    op.execute(
+        """
+        UPDATE posts SET hot_score =
+            likes_count * 3.0
+            + comments_count * 2.0
+            + (CASE WHEN view_count > 200 THEN 200 ELSE COALESCE(view_count, 0) END) * 0.1
+        """
+    )
+
+    op.create_index(
+        "ix_posts_hot",
+        "posts",
+        ["deleted_at", sa.text("hot_score DESC"), sa.text("created_at DESC"), sa.text("id DESC")],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_posts_hot", table_name="posts")
+    op.drop_column("posts", "hot_score")
@@ -0,0 +1,81 @@
+"""composite indexes for model query predicates
+
+Revision ID: 20261017_000004
+Revises: 20261017_000003
+Create Date: 2026-10-17 12:00:00
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20261017_000004"
+down_revision: Union[str, Sequence[str], None] = "20261017_000003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _create_direct_messages_if_missing() -> None:
+    # 초기 마이그레이션에는 direct_messages가 빠져 있어 create_all로만 생성되던 테이블입니다.
+    if sa.inspect(op.get_bind()).has_table("direct_messages"):
+        return
+    op.create_table(
+        "direct_messages",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("sender_id", sa.Integer(), nullable=False),
+        sa.Column("recipient_id", sa.Integer(), nullable=False),
+        sa.Column("content", sa.Text(), nullable=False),
+        sa.Column("is_read", sa.Boolean(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.Column("deleted_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["recipient_id"], ["users.id"]),
+        sa.ForeignKeyConstraint(["sender_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_direct_messages_id"), "direct_messages", ["id"], unique=False)
+    op.create_index(op.f("ix_direct_messages_sender_id"), "direct_messages", ["sender_id"], unique=False)
+    op.create_index(op.f("ix_direct_messages_recipient_id"), "direct_messages", ["recipient_id"], unique=False)
+
+
+def upgrade() -> None:
+    _create_direct_messages_if_missing()
+
+    op.create_index(
+        "ix_posts_latest",
+        "posts",
+        ["deleted_at", sa.text("created_at DESC"), sa.text("id DESC")],
+        unique=False,
+    )
+    op.create_index(
+        "ix_posts_discussed",
+        "posts",
+        ["deleted_at", sa.text("comments_count DESC"), sa.text("created_at DESC"), sa.text("id DESC")],
+        unique=False,
+    )
+    op.create_index(
+        "ix_comments_post_created",
+        "comments",
+        ["post_id", "deleted_at", "created_at", "id"],
+        unique=False,
+    )
+    op.create_index("ix_likes_post_id", "likes", ["post_id"], unique=False)
+    op.create_index("ix_post_tags_tag_id", "post_tags", ["tag_id", "post_id"], unique=False)
+    op.create_index(
+        "ix_direct_messages_pair",
+        "direct_messages",
+        ["sender_id", "recipient_id", "created_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_direct_messages_pair", table_name="direct_messages")
+    op.drop_index("ix_post_tags_tag_id", table_name="post_tags")
+    op.drop_index("ix_likes_post_id", table_name="likes")
+    op.drop_index("ix_comments_post_created", table_name="comments")
+    op.drop_index("ix_posts_discussed", table_name="posts")
+    op.drop_index("ix_posts_latest", table_name="posts")
@@ -0,0 +1,66 @@
+"""conversation summary table for the DM inbox
+
+Revision ID: 20261017_000005
+Revises: 20261017_000004
+Create Date: 2026-10-17 13:00:00
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20261017_000005"
+down_revision: Union[str, Sequence[str], None] = "20261017_000004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "conversations",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("partner_id", sa.Integer(), nullable=False),
+        sa.Column("last_message_id", sa.Integer(), nullable=False),
+        sa.Column("unread_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["last_message_id"], ["direct_messages.id"]),
+        sa.ForeignKeyConstraint(["partner_id"], ["users.id"]),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("user_id", "partner_id", name="uq_conversation_pair"),
+    )
+    op.create_index(op.f("ix_conversations_id"), "conversations", ["id"], unique=False)
+    op.create_index(
+        "ix_conversations_inbox",
+        "conversations",
+        ["user_id", sa.text("last_message_id DESC")],
+        unique=False,
+    )
+
+    # 기존 메시지로 (user, partner)별 마지막 메시지와 안 읽은 수를 채웁니다.
+    op.execute(
+        """
+        INSERT INTO conversations (user_id, partner_id, last_message_id, unread_count, updated_at)
+        SELECT pairs.user_id, pairs.partner_id, MAX(pairs.message_id), SUM(pairs.unread), MAX(pairs.created_at)
+        FROM (
+            SELECT sender_id AS user_id, recipient_id AS partner_id, id AS message_id,
+                   0 AS unread, created_at
+            FROM direct_messages WHERE deleted_at IS NULL
+            UNION ALL
+            SELECT recipient_id AS user_id, sender_id AS partner_id, id AS message_id,
+                   CASE WHEN is_read THEN 0 ELSE 1 END AS unread, created_at
+            FROM direct_messages WHERE deleted_at IS NULL
+        ) pairs
+        GROUP BY pairs.user_id, pairs.partner_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_conversations_inbox", table_name="conversations")
+    op.drop_index(op.f("ix_conversations_id"), table_name="conversations")
+    op.drop_table("conversations")
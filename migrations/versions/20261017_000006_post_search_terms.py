@@ -0,0 +1,114 @@
+"""inverted index for post search
+
+Revision ID: 20261017_000006
+Revises: 20261017_000005
+Create Date: 2026-10-17 16:00:00
+"""
+
+import re
+import unicodedata
+from collections import Counter
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20261017_000006"
+down_revision: Union[str, Sequence[str], None] = "20261017_000005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+
+# 이 리비전 시점의 토크나이저/가중치 사본입니다. 이후 app.common.search_tokens가 바뀌어도 이 마이그레이션의 결과는 같아야 합니다.
+TITLE_WEIGHT = 3
+CONTENT_WEIGHT = 1
+COMMENT_WEIGHT = 1
+MAX_TERM_LENGTH = 32
+_TOKEN_PATTERN = re.compile(r"[가-힣]+|[^\W_가-힣]+")
+_HANGUL_PATTERN = re.compile(r"^[가-힣]+$")
+
+
+def _tokenize(text: str) -> Counter:
+    normalized = unicodedata.normalize("NFKC", text or "").lower()
+    terms: list[str] = []
+    for run in _TOKEN_PATTERN.findall(normalized):
+        if _HANGUL_PATTERN.match(run) and len(run) > 1:
+            terms.extend(run[i:i + 2] for i in range(len(run) - 1))
+            terms.extend(run)
+        else:
+            terms.append(run[:MAX_TERM_LENGTH])
+    return Counter(terms)
+
+
+def _select_batches(bind, query: str):
+    """첫 컬럼(id) 기준 keyset으로 BATCH_SIZE행씩 읽습니다."""
+    last_id = 0
+    while True:
+        rows = bind.execute(sa.text(query), {"last_id": last_id, "limit": BATCH_SIZE}).all()
+        if not rows:
+            return
+        yield rows
+        last_id = rows[-1][0]
+
+
+def upgrade() -> None:
+    search_terms = op.create_table(
+        "post_search_terms",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("term", sa.String(length=32), nullable=False),
+        sa.Column("post_id", sa.Integer(), nullable=False),
+        sa.Column("comment_id", sa.Integer(), nullable=True),
+        sa.Column("weight", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["comment_id"], ["comments.id"]),
+        sa.ForeignKeyConstraint(["post_id"], ["posts.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_post_search_terms_lookup", "post_search_terms", ["term", "post_id", "weight"], unique=False)
+    op.create_index("ix_post_search_terms_source", "post_search_terms", ["post_id", "comment_id"], unique=False)
+    op.create_index("ix_post_search_terms_comment", "post_search_terms", ["comment_id"], unique=False)
+
+    # 토크나이저가 Python에 있으므로 기존 게시글/댓글 색인은 Python에서 만들어 배치 단위로 넣습니다.
+    bind = op.get_bind()
+    for posts in _select_batches(
+        bind,
+        "SELECT id, title, content FROM posts "
+        "WHERE deleted_at IS NULL AND id > :last_id ORDER BY id LIMIT :limit",
+    ):
+        rows = []
+        for post_id, title, content in posts:
+            weights: dict[str, int] = {}
+            for term, count in _tokenize(title).items():
+                weights[term] = weights.get(term, 0) + count * TITLE_WEIGHT
+            for term, count in _tokenize(content).items():
+                weights[term] = weights.get(term, 0) + count * CONTENT_WEIGHT
+            rows.extend(
+                {"term": term, "post_id": post_id, "comment_id": None, "weight": weight}
+                for term, weight in weights.items()
+            )
+        if rows:
+            op.bulk_insert(search_terms, rows)
+
+    for comments in _select_batches(
+        bind,
+        "SELECT c.id, c.post_id, c.content FROM comments c "
+        "JOIN posts p ON p.id = c.post_id "
+        "WHERE c.deleted_at IS NULL AND p.deleted_at IS NULL AND c.id > :last_id "
+        "ORDER BY c.id LIMIT :limit",
+    ):
+        rows = [
+            {"term": term, "post_id": post_id, "comment_id": comment_id, "weight": count * COMMENT_WEIGHT}
+            for comment_id, post_id, content in comments
+            for term, count in _tokenize(content).items()
+        ]
+        if rows:
+            op.bulk_insert(search_terms, rows)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_post_search_terms_comment", table_name="post_search_terms")
+    op.drop_index("ix_post_search_terms_source", table_name="post_search_terms")
+    op.drop_index("ix_post_search_terms_lookup", table_name="post_search_terms")
+    op.drop_table("post_search_terms")
@@ -0,0 +1,77 @@
+"""prefix index for DM user search
+
+Revision ID: 20261017_000007
+Revises: 20261017_000006
+Create Date: 2026-10-17 17:00:00
+"""
+
+import unicodedata
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20261017_000007"
+down_revision: Union[str, Sequence[str], None] = "20261017_000006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+
+# 이 리비전 시점의 prefix 규칙 사본입니다. 이후 app.common.search_tokens가 바뀌어도 이 마이그레이션의 결과는 같아야 합니다.
+USER_PREFIX_LENGTH = 10
+
+
+def _user_prefixes(nickname: str, email: str) -> list[str]:
+    prefixes: dict[str, None] = {}
+    for value in (nickname, email):
+        normalized = unicodedata.normalize("NFKC", value or "").strip().lower()
+        for length in range(1, min(len(normalized), USER_PREFIX_LENGTH) + 1):
+            prefixes[normalized[:length]] = None
+    return list(prefixes)
+
+
+def upgrade() -> None:
+    prefixes = op.create_table(
+        "user_search_prefixes",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("prefix", sa.String(length=10), nullable=False),
+        sa.Column("nickname", sa.String(length=20), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_user_search_prefixes_lookup", "user_search_prefixes", ["prefix", "nickname", "user_id"], unique=False
+    )
+    op.create_index("ix_user_search_prefixes_user", "user_search_prefixes", ["user_id"], unique=False)
+
+    bind = op.get_bind()
+    last_id = 0
+    while True:
+        users = bind.execute(
+            sa.text(
+                "SELECT id, nickname, email FROM users "
+                "WHERE deleted_at IS NULL AND id > :last_id ORDER BY id LIMIT :limit"
+            ),
+            {"last_id": last_id, "limit": BATCH_SIZE},
+        ).all()
+        if not users:
+            break
+        op.bulk_insert(
+            prefixes,
+            [
+                {"prefix": prefix, "nickname": nickname, "user_id": user_id}
+                for user_id, nickname, email in users
+                for prefix in _user_prefixes(nickname, email)
+            ],
+        )
+        last_id = users[-1][0]
+
+
+def downgrade() -> None:
+    op.drop_index("ix_user_search_prefixes_user", table_name="user_search_prefixes")
+    op.drop_index("ix_user_search_prefixes_lookup", table_name="user_search_prefixes")
+    op.drop_table("user_search_prefixes")
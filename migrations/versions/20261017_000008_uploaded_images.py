@@ -0,0 +1,41 @@
+"""uploaded images with derived variants
+
+Revision ID: 20261017_000008
+Revises: 20261017_000007
+Create Date: 2026-10-17 18:00:00
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20261017_000008"
+down_revision: Union[str, Sequence[str], None] = "20261017_000007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 기존 업로드는 행이 없으면 원본 URL만 내려가므로 별도 backfill 없이 그대로 동작합니다.
+    op.create_table(
+        "uploaded_images",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("url", sa.String(length=512), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=True),
+        sa.Column("size_bytes", sa.Integer(), nullable=False),
+        sa.Column("sha256", sa.String(length=64), nullable=False),
+        sa.Column("width", sa.Integer(), nullable=True),
+        sa.Column("height", sa.Integer(), nullable=True),
+        sa.Column("variants", sa.JSON(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("url"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("uploaded_images")
@@ -0,0 +1,63 @@
+"""content-addressed uploads with image references for GC
+
+Revision ID: 20261017_000009
+Revises: 20261017_000008
+Create Date: 2026-10-17 19:00:00
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20261017_000009"
+down_revision: Union[str, Sequence[str], None] = "20261017_000008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("uploaded_images") as batch_op:
+        batch_op.add_column(
+            sa.Column("last_uploaded_at", sa.DateTime(), server_default=sa.func.now(), nullable=False)
+        )
+        batch_op.create_index("ix_uploaded_images_last_uploaded", ["last_uploaded_at"], unique=False)
+
+    op.create_table(
+        "image_references",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("image_id", sa.Integer(), nullable=False),
+        sa.Column("owner_type", sa.String(length=10), nullable=False),
+        sa.Column("owner_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["image_id"], ["uploaded_images.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("owner_type", "owner_id", name="uq_image_reference_owner"),
+    )
+    op.create_index("ix_image_references_image", "image_references", ["image_id"], unique=False)
+
+    # 기존 업로드(uuid 파일명)도 지금 쓰이는 것은 참조를 채워 GC에서 지워지지 않게 합니다.
+    op.execute(
+        """
+        INSERT INTO image_references (image_id, owner_type, owner_id)
+        SELECT uploaded_images.id, 'post', posts.id
+        FROM posts JOIN uploaded_images ON uploaded_images.url = posts.image_url
+        WHERE posts.deleted_at IS NULL
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO image_references (image_id, owner_type, owner_id)
+        SELECT uploaded_images.id, 'user', users.id
+        FROM users JOIN uploaded_images ON uploaded_images.url = users.profile_image_url
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_image_references_image", table_name="image_references")
+    op.drop_table("image_references")
+    with op.batch_alter_table("uploaded_images") as batch_op:
+        batch_op.drop_index("ix_uploaded_images_last_uploaded")
+        batch_op.drop_column("last_uploaded_at")
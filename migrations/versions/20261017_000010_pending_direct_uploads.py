@@ -0,0 +1,28 @@
+"""pending flag for direct uploads reserved before completion
+
+Revision ID: 20261017_000010
+Revises: 20261017_000009
+Create Date: 2026-10-17 20:00:00
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20261017_000010"
+down_revision: Union[str, Sequence[str], None] = "20261017_000009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("uploaded_images") as batch_op:
+        batch_op.add_column(sa.Column("pending", sa.Boolean(), server_default=sa.false(), nullable=False))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("uploaded_images") as batch_op:
+        batch_op.drop_column("pending")
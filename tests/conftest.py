@@ -1,11 +1,31 @@
+import asyncio
 import uuid
 
 import pytest
 from fastapi.testclient import TestClient
 
+from app.common.jwt_tokens import clear_verified_tokens
+from app.core.cache import cache
 from app.database import SessionLocal, engine
-from app.db_models import Base, Comment, DirectMessage, Like, Post, PostTag, Session, Tag, User
+from app.db_models import (
+    Base,
+    Comment,
+    Conversation,
+    DirectMessage,
+    ImageReference,
+    Like,
+    Post,
+    PostSearchTerm,
+    PostTag,
+    Session,
+    Tag,
+    UploadedImage,
+    User,
+    UserSearchPrefix,
+)
 from app.main import app
+from app.models.posts_model import view_counter
+from app.models.users_model import user_summary_cache
 
 Base.metadata.create_all(bind=engine)
 
@@ -20,11 +40,20 @@ def client():
 def clean_db():
     db = SessionLocal()
     try:
-        for table_model in [DirectMessage, Session, Like, Comment, PostTag, Post, Tag, User]:
+        for table_model in [
+            Conversation, DirectMessage, Session, Like, PostSearchTerm, Comment, PostTag, Post, Tag,
+            UserSearchPrefix, ImageReference, UploadedImage, User,
+        ]:
             db.query(table_model).delete()
         db.commit()
     finally:
         db.close()
+    # 테이블을 비우면 id가 재사용되므로 이전 테스트의 캐시 항목도 함께 비웁니다.
+    asyncio.run(cache.clear())
+    asyncio.run(view_counter.clear())
+    asyncio.run(user_summary_cache.clear())
+    # id가 재사용되면 이전 테스트의 access token이 다른 사용자로 인증되지 않도록 검증 캐시도 비웁니다.
+    clear_verified_tokens()
 
 
 @pytest.fixture
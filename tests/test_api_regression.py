@@ -1,3 +1,34 @@
+import asyncio
+import gzip
+import hashlib
+import io
+import json
+import logging
+import os
+import signal
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from starlette.websockets import WebSocketDisconnect
+
+from app.common import jwt_tokens, security
+from app.controllers import images_controller
+from app.core import bounded_pool, image_variants, upload_storage
+from app.core.logger import RedactTokenQueryFilter
+from app.core.session_store import MemorySessionStore, SqlSessionStore, session_store
+from app.core.static_files import CachedStaticFiles
+from app.core.view_counter import MemoryViewCounter, RedisViewCounter
+from app.database import SessionLocal, async_engine, session_scope
+from app.db_models import Post
+from app.models import images_model, posts_model, users_model
+
+
 def _auth_header(access_token: str) -> dict:
     return {"Authorization": f"Bearer {access_token}"}
 
@@ -176,3 +207,1004 @@ def test_direct_messages_lifecycle(client, unique_email, unique_nickname):
     conversations_after_res = client.get("/messages/conversations", headers=recipient_headers)
     assert conversations_after_res.status_code == 200
     assert conversations_after_res.json()["data"][0]["unread_count"] == 0
+
+
+def test_posts_cursor_pagination(client, unique_email, unique_nickname):
+    password = "Abcd1234!"
+    tokens = _signup_and_login(client, unique_email("cursor"), password, unique_nickname("n"))
+    headers = _auth_header(tokens["access_token"])
+
+    post_ids = []
+    for index in range(5):
+        res = client.post(
+            "/posts",
+            headers=headers,
+            json={"title": f"Cursor {index}", "content": "body", "tags": []},
+        )
+        assert res.status_code == 201
+        post_ids.append(res.json()["data"]["id"])
+
+    client.post(f"/posts/{post_ids[1]}/likes", headers=headers)
+    client.post(f"/posts/{post_ids[3]}/comments", headers=headers, json={"content": "first"})
+
+    for sort in ("latest", "hot", "discussed"):
+        full = client.get("/posts", params={"sort": sort, "limit": 50})
+        assert full.status_code == 200
+        expected = [item["id"] for item in full.json()["data"]]
+        assert full.json()["paging"]["next_cursor"] is None
+
+        seen = []
+        params = {"sort": sort, "limit": 2}
+        while True:
+            res = client.get("/posts", params=params)
+            assert res.status_code == 200
+            seen.extend(item["id"] for item in res.json()["data"])
+            next_cursor = res.json()["paging"]["next_cursor"]
+            if not next_cursor:
+                break
+            params = {"sort": sort, "limit": 2, "cursor": next_cursor}
+
+        assert seen == expected
+        assert sorted(seen) == sorted(post_ids)
+
+    first_page = client.get("/posts", params={"sort": "latest", "limit": 2}).json()
+    mismatched = client.get(
+        "/posts",
+        params={"sort": "hot", "limit": 2, "cursor": first_page["paging"]["next_cursor"]},
+    )
+    assert mismatched.status_code == 400
+    assert mismatched.json()["message"] == "invalid_paging_params"
+
+    broken = client.get("/posts", params={"cursor": "not-a-cursor"})
+    assert broken.status_code == 400
+
+
+def test_post_counters_follow_likes_and_comments(client, unique_email, unique_nickname):
+    password = "Abcd1234!"
+    tokens = _signup_and_login(client, unique_email("count"), password, unique_nickname("n"))
+    headers = _auth_header(tokens["access_token"])
+
+    post_id = client.post(
+        "/posts", headers=headers, json={"title": "Counter", "content": "body", "tags": []}
+    ).json()["data"]["id"]
+
+    like_res = client.post(f"/posts/{post_id}/likes", headers=headers)
+    assert like_res.json()["data"]["likes_count"] == 1
+    comment_id = client.post(
+        f"/posts/{post_id}/comments", headers=headers, json={"content": "hi"}
+    ).json()["data"]["id"]
+    client.post(f"/posts/{post_id}/comments", headers=headers, json={"content": "again"})
+
+    detail = client.get(f"/posts/{post_id}").json()["data"]
+    assert detail["likes_count"] == 1
+    assert detail["comments_count"] == 2
+
+    unlike_res = client.delete(f"/posts/{post_id}/likes", headers=headers)
+    assert unlike_res.json()["data"]["likes_count"] == 0
+    client.delete(f"/posts/{post_id}/comments/{comment_id}", headers=headers)
+
+    detail = client.get(f"/posts/{post_id}").json()["data"]
+    assert detail["likes_count"] == 0
+    assert detail["comments_count"] == 1
+
+    db = SessionLocal()
+    try:
+        db.query(Post).filter(Post.id == post_id).update({"likes_count": 42, "comments_count": 0})
+        db.commit()
+    finally:
+        db.close()
+
+    assert asyncio.run(posts_model.reconcile_post_counters()) >= 1
+    detail = client.get(f"/posts/{post_id}").json()["data"]
+    assert detail["likes_count"] == 0
+    assert detail["comments_count"] == 1
+
+
+def test_hot_score_tracks_events_and_recompute(client, unique_email, unique_nickname):
+    password = "Abcd1234!"
+    tokens = _signup_and_login(client, unique_email("hot"), password, unique_nickname("n"))
+    headers = _auth_header(tokens["access_token"])
+
+    cold_id = client.post(
+        "/posts", headers=headers, json={"title": "Cold", "content": "body", "tags": []}
+    ).json()["data"]["id"]
+    hot_id = client.post(
+        "/posts", headers=headers, json={"title": "Hot", "content": "body", "tags": []}
+    ).json()["data"]["id"]
+
+    client.post(f"/posts/{hot_id}/likes", headers=headers)
+    client.post(f"/posts/{hot_id}/comments", headers=headers, json={"content": "hi"})
+    client.get(f"/posts/{hot_id}")
+
+    asyncio.run(posts_model.flush_view_counts())
+
+    def _stored_hot_score() -> float:
+        db = SessionLocal()
+        try:
+            return db.query(Post.hot_score).filter(Post.id == hot_id).scalar()
+        finally:
+            db.close()
+
+    # 정렬용 내부 점수는 응답에 나가지 않습니다.
+    detail = client.get(f"/posts/{hot_id}").json()["data"]
+    assert "hot_score" not in detail
+    assert all("hot_score" not in item for item in client.get("/posts").json()["data"])
+    assert _stored_hot_score() == pytest.approx(3.0 + 2.0 + 0.1)
+
+    ranked = client.get("/posts", params={"sort": "hot"}).json()["data"]
+    assert [item["id"] for item in ranked] == [hot_id, cold_id]
+
+    db = SessionLocal()
+    try:
+        db.query(Post).filter(Post.id == hot_id).update({"hot_score": 0})
+        db.commit()
+    finally:
+        db.close()
+
+    assert asyncio.run(posts_model.recompute_hot_scores()) == 1
+    assert _stored_hot_score() == pytest.approx(3.0 + 2.0 + 0.1)
+
+
+def test_login_rejected_fast_when_hash_pool_is_saturated(client, unique_email, unique_nickname, monkeypatch):
+    password = "Abcd1234!"
+    email = unique_email("busy")
+    _signup_and_login(client, email, password, unique_nickname("n"))
+
+    monkeypatch.setattr(security, "_hash_slots", threading.BoundedSemaphore(1))
+    security._hash_slots.acquire()
+
+    busy = client.post("/auth/login", json={"email": email, "password": password})
+    assert busy.status_code == 503
+    assert busy.json()["message"] == "service_unavailable"
+
+    security._hash_slots.release()
+    assert client.post("/auth/login", json={"email": email, "password": password}).status_code == 200
+
+
+def test_bounded_pool_releases_slot_when_submit_fails():
+    slots = bounded_pool.create_slots(1, 0)
+    executor = ThreadPoolExecutor(max_workers=1)
+    executor.shutdown()
+
+    # 종료된 풀에 submit하면 예외가 나도 슬롯은 반환되어야 합니다.
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            asyncio.run(bounded_pool.run_bounded(executor, slots, sum, [1, 2]))
+    assert slots.acquire(blocking=False)
+
+
+def test_write_request_uses_single_connection_and_transaction(client, unique_email, unique_nickname):
+    password = "Abcd1234!"
+    tokens = _signup_and_login(client, unique_email("uow"), password, unique_nickname("n"))
+    headers = _auth_header(tokens["access_token"])
+    post_id = client.post(
+        "/posts", headers=headers, json={"title": "UoW", "content": "body", "tags": []}
+    ).json()["data"]["id"]
+
+    events: list[str] = []
+
+    def _on_checkout(*_):
+        events.append("checkout")
+
+    def _on_commit(_):
+        events.append("commit")
+
+    pool = async_engine.sync_engine.pool
+    event.listen(pool, "checkout", _on_checkout)
+    event.listen(async_engine.sync_engine, "commit", _on_commit)
+    try:
+        like_res = client.post(f"/posts/{post_id}/likes", headers=headers)
+    finally:
+        event.remove(pool, "checkout", _on_checkout)
+        event.remove(async_engine.sync_engine, "commit", _on_commit)
+
+    assert like_res.status_code == 201
+    assert like_res.json()["data"]["likes_count"] == 1
+    assert events == ["checkout", "commit"]
+
+
+def test_post_cache_serves_shared_body_and_invalidates_on_write(client, unique_email, unique_nickname):
+    password = "Abcd1234!"
+    tokens = _signup_and_login(client, unique_email("cache"), password, unique_nickname("n"))
+    headers = _auth_header(tokens["access_token"])
+    post_id = client.post(
+        "/posts", headers=headers, json={"title": "Cached", "content": "body", "tags": ["python"]}
+    ).json()["data"]["id"]
+    assert client.get(f"/posts/{post_id}").status_code == 200
+    assert client.get("/posts").json()["data"][0]["title"] == "Cached"
+
+    # 캐시를 거치지 않은 직접 수정은 TTL 동안 보이지 않아야 캐시가 사용된 것입니다.
+    db = SessionLocal()
+    try:
+        db.query(Post).filter(Post.id == post_id).update({"title": "Bypassed"})
+        db.commit()
+    finally:
+        db.close()
+    assert client.get(f"/posts/{post_id}").json()["data"]["title"] == "Cached"
+    assert client.get("/posts").json()["data"][0]["title"] == "Cached"
+
+    client.post(f"/posts/{post_id}/likes", headers=headers)
+    mine = client.get(f"/posts/{post_id}", headers=headers).json()["data"]
+    anonymous = client.get(f"/posts/{post_id}").json()["data"]
+    assert (mine["is_liked"], mine["is_author"], mine["likes_count"]) == (True, True, 1)
+    assert (anonymous["is_liked"], anonymous["is_author"], anonymous["likes_count"]) == (False, False, 1)
+    listed = client.get("/posts", headers=headers).json()["data"][0]
+    assert (listed["is_liked"], listed["likes_count"]) == (True, 1)
+    assert client.get("/posts").json()["data"][0]["is_liked"] is False
+
+    # 좋아요/댓글은 목록 캐시를 무효화하지 않고(본문은 여전히 캐시된 값) 카운터만 덧씌웁니다.
+    client.post(f"/posts/{post_id}/comments", headers=headers, json={"content": "hi"})
+    listed = client.get("/posts").json()["data"][0]
+    assert (listed["title"], listed["likes_count"], listed["comments_count"]) == ("Cached", 1, 1)
+    assert listed["views"] == client.get(f"/posts/{post_id}").json()["data"]["views"] - 1
+
+    client.put(f"/posts/{post_id}", headers=headers, json={"title": "Updated", "content": "body"})
+    assert client.get(f"/posts/{post_id}").json()["data"]["title"] == "Updated"
+    assert client.get("/posts").json()["data"][0]["title"] == "Updated"
+
+    # 작성자 프로필 변경은 캐시된 상세/목록의 작성자 필드에도 바로 반영됩니다.
+    nickname = unique_nickname("r")
+    client.patch("/users/me", headers=headers, json={"nickname": nickname, "profile_image_url": "/static/me.png"})
+    detail = client.get(f"/posts/{post_id}").json()["data"]
+    listed = client.get("/posts").json()["data"][0]
+    for item in (detail, listed):
+        assert (item["author_nickname"], item["author_profile_image"]) == (nickname, "/static/me.png")
+
+    client.delete(f"/posts/{post_id}", headers=headers)
+    assert client.get(f"/posts/{post_id}").status_code == 404
+    assert client.get("/posts").json()["data"] == []
+
+
+def test_view_counts_are_buffered_and_flushed_in_one_update(client, unique_email, unique_nickname):
+    password = "Abcd1234!"
+    tokens = _signup_and_login(client, unique_email("views"), password, unique_nickname("n"))
+    headers = _auth_header(tokens["access_token"])
+    first_id, second_id = (
+        client.post("/posts", headers=headers, json={"title": title, "content": "body"}).json()["data"]["id"]
+        for title in ("One", "Two")
+    )
+
+    updates: list[str] = []
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("UPDATE POSTS"):
+            updates.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", _capture)
+    try:
+        for _ in range(3):
+            client.get(f"/posts/{first_id}")
+        client.get(f"/posts/{second_id}")
+        assert updates == []
+        assert client.get(f"/posts/{first_id}").json()["data"]["views"] == 4
+
+        assert asyncio.run(posts_model.flush_view_counts()) == 2
+        assert len(updates) == 1
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", _capture)
+
+    db = SessionLocal()
+    try:
+        stored = {post.id: (post.view_count, post.hot_score) for post in db.query(Post).all()}
+    finally:
+        db.close()
+    assert stored[first_id] == (4, pytest.approx(0.4))
+    assert stored[second_id] == (1, pytest.approx(0.1))
+
+
+def test_view_counter_failures_do_not_fail_requests(caplog):
+    async def _scenario():
+        # 연결할 수 없는 Redis: 증가분은 버리고 예외를 올리지 않습니다.
+        unreachable = RedisViewCounter(lambda counts: asyncio.sleep(0), url="redis://127.0.0.1:1/0")
+        await unreachable.add(1)
+        assert await unreachable.pending(1) == 0
+        await unreachable.close()
+
+        async def _failing_apply(counts):
+            raise RuntimeError("db down")
+
+        counter = MemoryViewCounter(_failing_apply, flush_events=1)
+        await counter.add(7)
+        with pytest.raises(RuntimeError):
+            await counter._flush_task
+        assert await counter.pending(7) == 1
+
+    with caplog.at_level("WARNING", logger="app.core.view_counter"):
+        asyncio.run(_scenario())
+    messages = [record.getMessage() for record in caplog.records]
+    assert any("increment failed" in message for message in messages)
+    assert "Scheduled view count flush failed" in messages
+
+
+def test_trending_serves_snapshot_with_live_like_overlay(client, unique_email, unique_nickname):
+    password = "Abcd1234!"
+    tokens = _signup_and_login(client, unique_email("trend"), password, unique_nickname("n"))
+    headers = _auth_header(tokens["access_token"])
+    post_id = client.post(
+        "/posts", headers=headers, json={"title": "Trend", "content": "body", "tags": ["python"]}
+    ).json()["data"]["id"]
+
+    first = client.get("/posts/trending", params={"days": 3}).json()["data"]
+    assert [item["id"] for item in first["posts"]] == [post_id]
+
+    client.post(
+        "/posts", headers=headers, json={"title": "Later", "content": "body", "tags": ["sql"]}
+    )
+    client.post(f"/posts/{post_id}/likes", headers=headers)
+    cached = client.get("/posts/trending", params={"days": 3}, headers=headers).json()["data"]
+    assert cached["generated_at"] == first["generated_at"]
+    assert [item["id"] for item in cached["posts"]] == [post_id]
+    assert cached["posts"][0]["is_liked"] is True
+
+    assert asyncio.run(posts_model.refresh_trending_snapshots()) >= 1
+    refreshed = client.get("/posts/trending", params={"days": 3}).json()["data"]
+    assert len(refreshed["posts"]) == 2
+    assert refreshed["posts"][0]["trending_score"] == pytest.approx(3.0)
+    assert refreshed["posts"][0]["is_liked"] is False
+
+
+def test_conversation_inbox_is_paginated_by_latest_message(client, unique_email, unique_nickname):
+    password = "Abcd1234!"
+    me = _signup_and_login(client, unique_email("inbox"), password, unique_nickname("m"))
+    first = _signup_and_login(client, unique_email("inbox"), password, unique_nickname("a"))
+    second = _signup_and_login(client, unique_email("inbox"), password, unique_nickname("b"))
+    me_headers = _auth_header(me["access_token"])
+    me_id = client.get("/users/me", headers=me_headers).json()["data"]["id"]
+    first_id = client.get("/users/me", headers=_auth_header(first["access_token"])).json()["data"]["id"]
+
+    for sender in (first, second, second):
+        client.post(
+            "/messages", headers=_auth_header(sender["access_token"]), json={"recipient_id": me_id, "content": "hi"}
+        )
+    client.post("/messages", headers=me_headers, json={"recipient_id": first_id, "content": "reply"})
+
+    page_one = client.get("/messages/conversations", headers=me_headers, params={"limit": 1}).json()
+    assert [item["partner"]["id"] for item in page_one["data"]] == [first_id]
+    assert page_one["data"][0]["last_message"]["is_mine"] is True
+    assert page_one["data"][0]["unread_count"] == 1
+
+    page_two = client.get(
+        "/messages/conversations",
+        headers=me_headers,
+        params={"limit": 1, "cursor": page_one["paging"]["next_cursor"]},
+    ).json()
+    assert page_two["data"][0]["unread_count"] == 2
+    assert page_two["paging"]["next_cursor"] is None
+
+
+def test_message_history_pages_newest_first_with_cursors(client, unique_email, unique_nickname):
+    password = "Abcd1234!"
+    alice = _signup_and_login(client, unique_email("hist"), password, unique_nickname("a"))
+    bob = _signup_and_login(client, unique_email("hist"), password, unique_nickname("b"))
+    alice_headers = _auth_header(alice["access_token"])
+    bob_headers = _auth_header(bob["access_token"])
+    alice_id = client.get("/users/me", headers=alice_headers).json()["data"]["id"]
+    bob_id = client.get("/users/me", headers=bob_headers).json()["data"]["id"]
+
+    sent_ids = []
+    for index in range(5):
+        headers, recipient_id = (alice_headers, bob_id) if index % 2 == 0 else (bob_headers, alice_id)
+        sent_ids.append(
+            client.post("/messages", headers=headers, json={"recipient_id": recipient_id, "content": f"m{index}"})
+            .json()["data"]["id"]
+        )
+
+    latest = client.get(f"/messages/with/{bob_id}", headers=alice_headers, params={"limit": 2}).json()
+    assert [m["id"] for m in latest["data"]] == sent_ids[3:]
+    assert latest["paging"]["has_more"] is True
+
+    older = client.get(
+        f"/messages/with/{bob_id}",
+        headers=alice_headers,
+        params={"limit": 2, "before_id": latest["paging"]["oldest_id"]},
+    ).json()
+    assert [m["id"] for m in older["data"]] == sent_ids[1:3]
+
+    oldest = client.get(
+        f"/messages/with/{bob_id}",
+        headers=alice_headers,
+        params={"limit": 2, "before_id": older["paging"]["oldest_id"]},
+    ).json()
+    assert [m["id"] for m in oldest["data"]] == sent_ids[:1]
+    assert oldest["paging"]["has_more"] is False
+
+    newer = client.get(
+        f"/messages/with/{bob_id}",
+        headers=alice_headers,
+        params={"limit": 3, "after_id": sent_ids[0]},
+    ).json()
+    assert [m["id"] for m in newer["data"]] == sent_ids[1:4]
+    assert newer["paging"]["has_more"] is True
+
+    both = client.get(
+        f"/messages/with/{bob_id}", headers=alice_headers, params={"before_id": 1, "after_id": 1}
+    )
+    assert both.status_code == 400
+
+
+def test_mark_read_is_a_single_bulk_update(client, unique_email, unique_nickname):
+    password = "Abcd1234!"
+    alice = _signup_and_login(client, unique_email("read"), password, unique_nickname("a"))
+    bob = _signup_and_login(client, unique_email("read"), password, unique_nickname("b"))
+    alice_headers = _auth_header(alice["access_token"])
+    bob_headers = _auth_header(bob["access_token"])
+    alice_id = client.get("/users/me", headers=alice_headers).json()["data"]["id"]
+    bob_id = client.get("/users/me", headers=bob_headers).json()["data"]["id"]
+
+    message_ids = [
+        client.post("/messages", headers=bob_headers, json={"recipient_id": alice_id, "content": f"m{i}"})
+        .json()["data"]["id"]
+        for i in range(4)
+    ]
+
+    statements: list[str] = []
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement.lstrip().split(None, 2)[:2])
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", _capture)
+    try:
+        partial = client.post(
+            f"/messages/with/{bob_id}/read", headers=alice_headers, json={"up_to_id": message_ids[1]}
+        )
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", _capture)
+
+    assert partial.json()["data"] == {"read_count": 2, "unread_count": 2}
+    assert statements.count(["UPDATE", "direct_messages"]) == 1
+
+    thread = client.get(f"/messages/with/{bob_id}", headers=alice_headers).json()["data"]
+    assert all(message["is_read"] for message in thread)
+    rest = client.post(f"/messages/with/{bob_id}/read", headers=alice_headers)
+    assert rest.json()["data"] == {"read_count": 0, "unread_count": 0}
+
+
+def test_message_stream_pushes_new_messages_over_websocket(client, unique_email, unique_nickname):
+    password = "Abcd1234!"
+    alice = _signup_and_login(client, unique_email("ws"), password, unique_nickname("a"))
+    bob = _signup_and_login(client, unique_email("ws"), password, unique_nickname("b"))
+    alice_id = client.get("/users/me", headers=_auth_header(alice["access_token"])).json()["data"]["id"]
+
+    with pytest.raises(WebSocketDisconnect) as rejected:
+        with client.websocket_connect("/messages/stream") as ws:
+            ws.receive_json()
+    assert rejected.value.code == 1008
+
+    with client.websocket_connect(f"/messages/stream?token={alice['access_token']}") as ws:
+        sent = client.post(
+            "/messages",
+            headers=_auth_header(bob["access_token"]),
+            json={"recipient_id": alice_id, "content": "실시간"},
+        ).json()["data"]
+        event = ws.receive_json()
+
+    assert event["type"] == "message"
+    assert event["data"]["id"] == sent["id"]
+    assert event["data"]["content"] == "실시간"
+    assert event["data"]["is_mine"] is False
+
+    unauthorized = client.get("/messages/stream")
+    assert unauthorized.status_code == 401
+
+
+def test_message_stream_closes_when_access_token_expires(client, unique_email, unique_nickname):
+    alice = _signup_and_login(client, unique_email("exp"), "Abcd1234!", unique_nickname("a"))
+    alice_id = client.get("/users/me", headers=_auth_header(alice["access_token"])).json()["data"]["id"]
+
+    short_lived = jwt_tokens.create_access_token(alice_id, expires_minutes=2 / 60)
+    with client.websocket_connect(f"/messages/stream?token={short_lived}") as ws:
+        with pytest.raises(WebSocketDisconnect) as closed:
+            ws.receive_json()
+    assert (closed.value.code, closed.value.reason) == (1008, "token_expired")
+
+    # SSE는 마지막 token_expired 이벤트를 보내고 스트림을 끝냅니다.
+    short_lived = jwt_tokens.create_access_token(alice_id, expires_minutes=2 / 60)
+    response = client.get(f"/messages/stream?token={short_lived}")
+    assert response.status_code == 200
+    event_line, data_line = response.text.rstrip().splitlines()[-2:]
+    assert event_line == "event: token_expired"
+    assert json.loads(data_line.removeprefix("data: ")) == {"reason": "access token expired"}
+
+
+def test_access_log_masks_stream_token_query():
+    record = logging.LogRecord(
+        "uvicorn.access", logging.INFO, __file__, 0, '%s - "%s %s HTTP/%s" %d',
+        ("127.0.0.1:5000", "GET", "/messages/stream?token=abc.def.ghi&x=1", "1.1", 200), None,
+    )
+    assert RedactTokenQueryFilter().filter(record)
+    assert "abc.def.ghi" not in record.getMessage()
+    assert "/messages/stream?token=[redacted]&x=1" in record.getMessage()
+
+
+def test_post_search_ranks_korean_ngrams_and_follows_writes(client, unique_email, unique_nickname):
+    user = _signup_and_login(client, unique_email("search"), "Abcd1234!", unique_nickname("s"))
+    headers = _auth_header(user["access_token"])
+
+    def _create(title, content):
+        return client.post("/posts", headers=headers, json={"title": title, "content": content}).json()["data"]["id"]
+
+    in_title = _create("파이썬 비동기 입문", "이벤트 루프 정리")
+    in_content = _create("오늘의 기록", "파이썬으로 비동기 서버를 만들었다")
+    only_one_word = _create("파이썬 기초", "변수와 함수")
+    _create("자바 입문", "클래스")
+
+    found = client.get("/posts/search", params={"q": "파이썬 비동기"}).json()
+    assert [post["id"] for post in found["data"]] == [in_title, in_content]
+    # 한 음절 검색어는 단어 안의 음절과도 맞습니다.
+    one_syllable = client.get("/posts/search", params={"q": "썬"}).json()
+    assert sorted(post["id"] for post in one_syllable["data"]) == sorted([in_title, in_content, only_one_word])
+
+    first = client.get("/posts/search", params={"q": "파이썬", "limit": 2}).json()
+    rest = client.get(
+        "/posts/search", params={"q": "파이썬", "limit": 2, "cursor": first["paging"]["next_cursor"]}
+    ).json()
+    paged_ids = [post["id"] for post in first["data"] + rest["data"]]
+    assert sorted(paged_ids) == sorted([in_title, in_content, only_one_word])
+    assert rest["paging"]["next_cursor"] is None
+
+    client.put(f"/posts/{in_content}", headers=headers, json={"title": "오늘의 기록", "content": "러스트 입문"})
+    client.post(f"/posts/{only_one_word}/comments", headers=headers, json={"content": "FastAPI 비동기 예제 추가"})
+    client.delete(f"/posts/{in_title}", headers=headers)
+    found = client.get("/posts/search", params={"q": "파이썬 비동기"}).json()
+    assert [post["id"] for post in found["data"]] == [only_one_word]
+
+    assert client.get("/posts/search", params={"q": "  "}).status_code == 400
+
+
+def test_user_search_uses_prefix_index_and_tracks_profile_changes(client, unique_email, unique_nickname):
+    password = "Abcd1234!"
+    me = _signup_and_login(client, unique_email("pick"), password, unique_nickname("me"))
+    headers = _auth_header(me["access_token"])
+    _signup_and_login(client, "gildong@example.com", password, "홍길동")
+    _signup_and_login(client, "hong.second@example.com", password, "홍길순")
+    other = _signup_and_login(client, unique_email("pick"), password, "김철수")
+    _signup_and_login(client, "bob@example.com", password, "밥")
+
+    def _search(query):
+        res = client.get("/messages/users", headers=headers, params={"query": query})
+        return [user["nickname"] for user in res.json()["data"]]
+
+    assert _search("홍길") == ["홍길동", "홍길순"]
+    assert _search("GILDONG") == ["홍길동"]
+    assert _search("hong.") == ["홍길순"]
+    assert _search("hong.second") == ["홍길순"]
+    assert _search("hong.seconds") == []
+    assert _search("길동") == []
+    # @ 앞부분이 짧은 주소도 @ 뒤까지 입력해서 찾을 수 있어야 합니다.
+    assert _search("bob@ex") == ["밥"]
+    assert _search("bob@example.com") == ["밥"]
+    assert _search("bob@example.org") == []
+
+    client.patch("/users/me", headers=_auth_header(other["access_token"]), json={"nickname": "홍철수"})
+    assert _search("홍") == ["홍길동", "홍길순", "홍철수"]
+    client.delete("/users/me", headers=_auth_header(other["access_token"]))
+    assert _search("홍") == ["홍길동", "홍길순"]
+
+
+def test_comments_are_cursor_paginated_in_order(client, unique_email, unique_nickname):
+    user = _signup_and_login(client, unique_email("cmt"), "Abcd1234!", unique_nickname("c"))
+    headers = _auth_header(user["access_token"])
+    post_id = client.post("/posts", headers=headers, json={"title": "t", "content": "c"}).json()["data"]["id"]
+    comment_ids = [
+        client.post(f"/posts/{post_id}/comments", headers=headers, json={"content": f"c{i}"}).json()["data"]["id"]
+        for i in range(5)
+    ]
+
+    first = client.get(f"/posts/{post_id}/comments", params={"limit": 2}).json()
+    assert [c["id"] for c in first["data"]] == comment_ids[:2]
+    assert first["paging"] == {"total": 5, "has_more": True, "next_after_id": comment_ids[1]}
+    second = client.get(f"/posts/{post_id}/comments", params={"limit": 2, "after_id": comment_ids[1]}).json()
+    assert [c["id"] for c in second["data"]] == comment_ids[2:4]
+
+    client.delete(f"/posts/{post_id}/comments/{comment_ids[1]}", headers=headers)
+    rest = client.get(
+        f"/posts/{post_id}/comments", params={"limit": 10, "after_id": first["paging"]["next_after_id"]}
+    ).json()
+    assert [c["id"] for c in rest["data"]] == comment_ids[2:]
+    assert rest["paging"] == {"total": 4, "has_more": False, "next_after_id": None}
+
+
+def test_listings_hydrate_authors_with_one_batched_lookup(client, unique_email, unique_nickname):
+    password = "Abcd1234!"
+    writers = [_signup_and_login(client, unique_email("hyd"), password, unique_nickname("w")) for _ in range(3)]
+    post_id = client.post(
+        "/posts", headers=_auth_header(writers[0]["access_token"]), json={"title": "t", "content": "c"}
+    ).json()["data"]["id"]
+    for writer in writers * 2:
+        client.post(f"/posts/{post_id}/comments", headers=_auth_header(writer["access_token"]), json={"content": "c"})
+    asyncio.run(users_model.user_summary_cache.clear())
+
+    user_selects: list[str] = []
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and "FROM users" in statement:
+            user_selects.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", _capture)
+    try:
+        cold = client.get(f"/posts/{post_id}/comments").json()["data"]
+        cold_selects = len(user_selects)
+        client.get(f"/posts/{post_id}/comments")
+        warm_selects = len(user_selects) - cold_selects
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", _capture)
+
+    assert len(cold) == 6 and all(comment["author_nickname"] != "Unknown" for comment in cold)
+    assert cold_selects == 1
+    assert warm_selects == 0
+
+    me = _auth_header(writers[1]["access_token"])
+    client.patch("/users/me", headers=me, json={"nickname": "바뀐이름"})
+    comments = client.get(f"/posts/{post_id}/comments").json()["data"]
+    assert "바뀐이름" in {comment["author_nickname"] for comment in comments}
+
+
+def test_access_token_verification_and_current_user_are_cached(client, unique_email, unique_nickname, monkeypatch):
+    tokens = _signup_and_login(client, unique_email("jwt"), "Abcd1234!", unique_nickname("j"))
+    headers = _auth_header(tokens["access_token"])
+    client.get("/users/me", headers=headers)
+
+    decode_calls = []
+    original_decode = jwt_tokens.jwt.decode
+
+    def _counting_decode(*args, **kwargs):
+        decode_calls.append(args)
+        return original_decode(*args, **kwargs)
+
+    monkeypatch.setattr(jwt_tokens.jwt, "decode", _counting_decode)
+    statements: list[str] = []
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", _capture)
+    try:
+        for _ in range(3):
+            me = client.get("/users/me", headers=headers)
+            assert me.status_code == 200
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", _capture)
+
+    assert decode_calls == []
+    assert statements == []
+
+    client.delete("/users/me", headers=headers)
+    assert client.get("/users/me", headers=headers).status_code == 404
+
+
+@pytest.mark.skipif(not isinstance(session_store, SqlSessionStore), reason="SQL 세션 저장소 전용")
+def test_refresh_rotates_session_in_one_delete_returning(client, unique_email, unique_nickname):
+    tokens = _signup_and_login(client, unique_email("rot"), "Abcd1234!", unique_nickname("r"))
+
+    statements: list[str] = []
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(" ".join(statement.split()))
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", _capture)
+    try:
+        rotated = client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", _capture)
+
+    assert rotated.status_code == 200
+    assert [statement.split()[0] for statement in statements] == ["BEGIN", "DELETE", "INSERT"]
+    assert "RETURNING" in statements[1]
+    reused = client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert reused.status_code == 400
+
+
+def test_memory_session_store_rotates_once_and_expires():
+    store = MemorySessionStore()
+
+    async def _scenario():
+        token = await store.create(None, user_id=7, ttl_seconds=60)
+        rotated = await store.rotate(None, token, ttl_seconds=60)
+        assert rotated is not None and rotated[0] == 7
+        assert await store.rotate(None, token, ttl_seconds=60) is None
+        assert await store.get_user_id(None, rotated[1]) == 7
+
+        expired = await store.create(None, user_id=8, ttl_seconds=0)
+        assert await store.get_user_id(None, expired) is None
+        await store.create(None, user_id=9, ttl_seconds=0)
+        assert await store.purge_expired() == 1
+
+    asyncio.run(_scenario())
+
+
+def test_image_upload_streams_to_disk_and_enforces_size_limit(
+    client, unique_email, unique_nickname, monkeypatch, tmp_path
+):
+    monkeypatch.setattr(upload_storage, "storage", upload_storage.LocalStorage(tmp_path))
+    monkeypatch.setattr(images_controller, "MAX_FILE_SIZE", 200 * 1024)
+    monkeypatch.setattr(images_controller, "UPLOAD_CHUNK_SIZE", 16 * 1024)
+    tokens = _signup_and_login(client, unique_email("img"), "Abcd1234!", unique_nickname("i"))
+    headers = _auth_header(tokens["access_token"])
+
+    payload = bytes(range(256)) * 400  # 100KB, 여러 청크
+    uploaded = client.post("/images/post", headers=headers, files={"file": ("a.png", payload, "image/png")})
+    assert uploaded.status_code == 200
+    image_url = uploaded.json()["data"]["image_url"]
+    assert (tmp_path / image_url.removeprefix("/uploads/")).read_bytes() == payload
+
+    # Content-Length 검사를 통과하도록 여유분 안에서 한도를 조금 넘긴 파일은 스트리밍 중에 중단됩니다.
+    too_big = client.post(
+        "/images/post", headers=headers, files={"file": ("b.png", b"x" * (200 * 1024 + 1), "image/png")}
+    )
+    assert too_big.status_code == 400
+    assert [path for path in tmp_path.rglob("*") if path.is_file()] == [tmp_path / image_url.removeprefix("/uploads/")]
+
+    rejected_early = client.post(
+        "/images/post", headers=headers, files={"file": ("c.png", b"x" * (400 * 1024), "image/png")}
+    )
+    assert rejected_early.status_code == 400
+
+
+def test_uploaded_image_variants_are_served_as_srcset(client, unique_email, unique_nickname, monkeypatch, tmp_path):
+    image_module = pytest.importorskip("PIL.Image")
+    monkeypatch.setattr(upload_storage, "storage", upload_storage.LocalStorage(tmp_path))
+    tokens = _signup_and_login(client, unique_email("var"), "Abcd1234!", unique_nickname("v"))
+    headers = _auth_header(tokens["access_token"])
+
+    buffer = io.BytesIO()
+    image_module.new("RGB", (1200, 600), "red").save(buffer, format="PNG")
+    uploaded = client.post("/images/post", headers=headers, files={"file": ("a.png", buffer.getvalue(), "image/png")})
+    assert uploaded.status_code == 200
+    data = uploaded.json()["data"]
+    assert [(v["name"], v["width"], v["height"]) for v in data["variants"]] == [("thumb", 320, 160), ("medium", 960, 480)]
+    for variant in data["variants"]:
+        assert variant["url"].endswith(f".{image_variants.IMAGE_VARIANT_FORMAT}")
+        assert (tmp_path / variant["url"].removeprefix("/uploads/")).is_file()
+
+    created = client.post(
+        "/posts", headers=headers, json={"title": "img", "content": "body", "image_url": data["image_url"]}
+    )
+    assert created.status_code == 201
+    listed = client.get("/posts").json()["data"][0]
+    assert listed["image_url"] == data["image_url"]
+    assert listed["image_srcset"] == data["srcset"]
+    assert listed["image_srcset"].endswith(" 960w")
+    assert listed["author_profile_image_srcset"] is None
+
+
+def test_upload_recovers_when_variant_worker_pool_breaks(client, unique_email, unique_nickname, monkeypatch, tmp_path):
+    image_module = pytest.importorskip("PIL.Image")
+    monkeypatch.setattr(upload_storage, "storage", upload_storage.LocalStorage(tmp_path))
+    headers = _auth_header(_signup_and_login(client, unique_email("oom"), "Abcd1234!", unique_nickname("o"))["access_token"])
+
+    # 워커가 OOM 등으로 죽은 상황: 풀의 프로세스를 강제로 종료해 풀을 깨뜨립니다.
+    image_variants.shutdown()
+    executor = image_variants._get_executor()
+    worker_pid = executor.submit(os.getpid).result()
+    os.kill(worker_pid, signal.SIGKILL)
+    deadline = time.monotonic() + 10
+    while not executor._broken and time.monotonic() < deadline:
+        time.sleep(0.05)
+    with pytest.raises(BrokenProcessPool):
+        executor.submit(os.getpid)
+
+    buffer = io.BytesIO()
+    image_module.new("RGB", (640, 480), "green").save(buffer, format="PNG")
+    uploaded = client.post("/images/post", headers=headers, files={"file": ("a.png", buffer.getvalue(), "image/png")})
+    assert uploaded.status_code == 200
+    assert [variant["width"] for variant in uploaded.json()["data"]["variants"]] == [320, 640]
+    assert image_variants._get_executor() is not executor
+
+
+def test_uploads_are_content_addressed_and_unreferenced_images_are_collected(
+    client, unique_email, unique_nickname, monkeypatch, tmp_path
+):
+    monkeypatch.setattr(upload_storage, "storage", upload_storage.LocalStorage(tmp_path))
+    monkeypatch.setattr(image_variants, "PILLOW_AVAILABLE", False)
+    first = _auth_header(_signup_and_login(client, unique_email("ca"), "Abcd1234!", unique_nickname("c"))["access_token"])
+    second = _auth_header(_signup_and_login(client, unique_email("ca"), "Abcd1234!", unique_nickname("c"))["access_token"])
+
+    payload = b"same image bytes"
+    urls = [
+        client.post(path, headers=headers, files={"file": ("a.jpeg", payload, "image/jpeg")}).json()["data"]["image_url"]
+        for path, headers in (("/images/post", first), ("/images/profile", second))
+    ]
+    digest = hashlib.sha256(payload).hexdigest()
+    assert urls == [f"/uploads/{digest[:2]}/{digest[2:4]}/{digest}.jpg"] * 2
+    orphan_url = client.post(
+        "/images/post", headers=first, files={"file": ("b.png", b"other bytes", "image/png")}
+    ).json()["data"]["image_url"]
+
+    def stored(url: str) -> bool:
+        return (tmp_path / url.removeprefix("/uploads/")).is_file()
+
+    assert len([path for path in tmp_path.rglob("*") if path.is_file()]) == 2
+
+    post_id = client.post(
+        "/posts", headers=first, json={"title": "img", "content": "body", "image_url": urls[0]}
+    ).json()["data"]["id"]
+    # 유예 기간 안의 미참조 업로드는 남기고, 유예 기간이 지나면 참조된 이미지만 남깁니다.
+    assert asyncio.run(images_model.collect_garbage()) == 0
+    assert asyncio.run(images_model.collect_garbage(grace_seconds=-60)) == 1
+    assert stored(urls[0]) and not stored(orphan_url)
+
+    client.delete(f"/posts/{post_id}", headers=first)
+    assert asyncio.run(images_model.collect_garbage(grace_seconds=-60)) == 1
+    assert not stored(urls[0])
+
+
+def test_reupload_stores_again_when_gc_removes_the_row_after_lookup(
+    client, unique_email, unique_nickname, monkeypatch, tmp_path
+):
+    monkeypatch.setattr(upload_storage, "storage", upload_storage.LocalStorage(tmp_path))
+    monkeypatch.setattr(image_variants, "PILLOW_AVAILABLE", False)
+    headers = _auth_header(_signup_and_login(client, unique_email("gc"), "Abcd1234!", unique_nickname("g"))["access_token"])
+
+    def _upload():
+        return client.post("/images/post", headers=headers, files={"file": ("a.png", b"raced bytes", "image/png")})
+
+    url = _upload().json()["data"]["image_url"]
+    stale = asyncio.run(_find_upload(url))
+    assert asyncio.run(images_model.collect_garbage(grace_seconds=-60)) == 1
+
+    # find_upload가 GC 직전의 행을 본 상황: touch가 0행이면 파일과 행을 다시 만듭니다.
+    async def _stale_find_upload(db, image_url):
+        return stale
+
+    with monkeypatch.context() as patch:
+        patch.setattr(images_model, "find_upload", _stale_find_upload)
+        assert _upload().json()["data"]["image_url"] == url
+    assert (tmp_path / url.removeprefix("/uploads/")).is_file()
+    assert asyncio.run(_find_upload(url)) is not None
+
+
+async def _find_upload(url: str):
+    async with session_scope() as db:
+        return await images_model.find_upload(db, url)
+
+
+def _direct_upload_request(payload: bytes, filename: str = "a.png") -> dict:
+    return {"filename": filename, "size": len(payload), "sha256": hashlib.sha256(payload).hexdigest()}
+
+
+def test_direct_upload_to_local_storage_verifies_signed_size_and_hash(
+    client, unique_email, unique_nickname, monkeypatch, tmp_path
+):
+    monkeypatch.setattr(upload_storage, "storage", upload_storage.LocalStorage(tmp_path))
+    monkeypatch.setattr(image_variants, "PILLOW_AVAILABLE", False)
+    headers = _auth_header(_signup_and_login(client, unique_email("du"), "Abcd1234!", unique_nickname("d"))["access_token"])
+    payload = b"direct upload bytes"
+
+    issued = client.post("/images/uploads", headers=headers, json=_direct_upload_request(payload))
+    assert issued.status_code == 200
+    data = issued.json()["data"]
+    upload = data["upload"]
+    assert upload["method"] == "PUT"
+
+    # 서명된 해시와 다른 내용은 저장되지 않고, 완료 요청도 거절됩니다.
+    tampered = client.put(upload["url"], headers=upload["headers"], content=b"other bytes with same len")
+    assert tampered.status_code == 400
+    assert client.post("/images/uploads/complete", headers=headers, json={"image_url": data["image_url"]}).status_code == 400
+    assert client.put("/images/direct/not-a-token", content=payload).status_code == 401
+
+    assert client.put(upload["url"], headers=upload["headers"], content=payload).status_code == 200
+    completed = client.post("/images/uploads/complete", headers=headers, json={"image_url": data["image_url"]})
+    assert completed.status_code == 200
+    assert completed.json()["data"]["image_url"] == data["image_url"]
+    assert (tmp_path / data["image_url"].removeprefix("/uploads/")).read_bytes() == payload
+
+    # 같은 내용은 다시 올릴 필요 없이 기존 이미지를 돌려줍니다.
+    again = client.post("/images/uploads", headers=headers, json=_direct_upload_request(payload)).json()["data"]
+    assert again["upload"] is None
+    assert again["image_url"] == data["image_url"]
+
+
+def test_direct_uploads_are_recorded_before_completion(client, unique_email, unique_nickname, monkeypatch, tmp_path):
+    monkeypatch.setattr(upload_storage, "storage", upload_storage.LocalStorage(tmp_path))
+    monkeypatch.setattr(image_variants, "PILLOW_AVAILABLE", False)
+    headers = _auth_header(_signup_and_login(client, unique_email("dp"), "Abcd1234!", unique_nickname("d"))["access_token"])
+
+    def _put(payload: bytes) -> str:
+        data = client.post("/images/uploads", headers=headers, json=_direct_upload_request(payload)).json()["data"]
+        upload = data["upload"]
+        assert client.put(upload["url"], headers=upload["headers"], content=payload).status_code == 200
+        return data["image_url"]
+
+    def stored(url: str) -> bool:
+        return (tmp_path / url.removeprefix("/uploads/")).is_file()
+
+    # /complete 없이 버려진 업로드도 GC가 지웁니다.
+    abandoned_url = _put(b"abandoned bytes")
+    # /complete 전에 게시글에 붙인 이미지는 참조가 남아 지워지지 않습니다.
+    attached_url = _put(b"attached bytes")
+    post_id = client.post(
+        "/posts", headers=headers, json={"title": "img", "content": "body", "image_url": attached_url}
+    ).json()["data"]["id"]
+    completed = client.post("/images/uploads/complete", headers=headers, json={"image_url": attached_url})
+    assert completed.status_code == 200
+
+    assert asyncio.run(images_model.collect_garbage(grace_seconds=-60)) == 1
+    assert not stored(abandoned_url)
+    assert stored(attached_url)
+    assert client.get(f"/posts/{post_id}").json()["data"]["image_url"] == attached_url
+
+
+def test_direct_upload_to_s3_storage(client, unique_email, unique_nickname, monkeypatch):
+    moto = pytest.importorskip("moto")
+    requests = pytest.importorskip("requests")
+    image_module = pytest.importorskip("PIL.Image")
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+
+    with moto.mock_aws():
+        storage = upload_storage.S3Storage(
+            bucket="community-test",
+            region="us-east-1",
+            endpoint_url=None,
+            public_endpoint_url=None,
+            public_base_url="https://cdn.example.com",
+        )
+        storage._client.create_bucket(Bucket="community-test")
+        monkeypatch.setattr(upload_storage, "storage", storage)
+        headers = _auth_header(
+            _signup_and_login(client, unique_email("s3"), "Abcd1234!", unique_nickname("s"))["access_token"]
+        )
+        buffer = io.BytesIO()
+        image_module.new("RGB", (640, 480), "blue").save(buffer, format="PNG")
+        payload = buffer.getvalue()
+
+        data = client.post("/images/uploads", headers=headers, json=_direct_upload_request(payload)).json()["data"]
+        assert data["image_url"].startswith("https://cdn.example.com/")
+        upload = data["upload"]
+        assert requests.put(upload["url"], data=payload, headers=upload["headers"]).status_code == 200
+
+        completed = client.post("/images/uploads/complete", headers=headers, json={"image_url": data["image_url"]})
+        assert completed.status_code == 200
+        variants = completed.json()["data"]["variants"]
+        assert [variant["width"] for variant in variants] == [320, 640]
+        for url in [data["image_url"], *(variant["url"] for variant in variants)]:
+            head = storage._client.head_object(Bucket="community-test", Key=storage.key_for_url(url))
+            assert head["CacheControl"] == upload_storage.IMMUTABLE_CACHE_CONTROL
+
+
+def test_cached_static_files_serve_immutable_uploads_with_content_etags(tmp_path):
+    digest = hashlib.sha256(b"image").hexdigest()
+    image_path = tmp_path / digest[:2] / digest[2:4] / f"{digest}.png"
+    image_path.parent.mkdir(parents=True)
+    image_path.write_bytes(b"0123456789")
+    (tmp_path / "tmp").mkdir()
+    (tmp_path / "tmp" / "upload.part").write_bytes(b"partial")
+    (tmp_path / "terms.html").write_text("<p>terms</p>")
+    (tmp_path / "terms.html.gz").write_bytes(gzip.compress(b"<p>terms</p>"))
+
+    app = FastAPI()
+    app.mount(
+        "/uploads",
+        CachedStaticFiles(
+            directory=tmp_path,
+            cache_control=upload_storage.IMMUTABLE_CACHE_CONTROL,
+            content_etags=True,
+            hidden_dirs=("tmp",),
+        ),
+    )
+    app.mount("/static", CachedStaticFiles(directory=tmp_path, cache_control="public, no-cache", precompressed=True))
+    client = TestClient(app)
+    url = f"/uploads/{digest[:2]}/{digest[2:4]}/{digest}.png"
+
+    first = client.get(url)
+    assert first.status_code == 200
+    assert first.headers["cache-control"] == "public, max-age=31536000, immutable"
+    assert first.headers["etag"] == f'"{digest}"'
+
+    revalidated = client.get(url, headers={"If-None-Match": first.headers["etag"]})
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+    assert revalidated.headers["cache-control"] == first.headers["cache-control"]
+
+    partial = client.get(url, headers={"Range": "bytes=2-4"})
+    assert partial.status_code == 206
+    assert partial.content == b"234"
+    assert client.get("/uploads/tmp/upload.part").status_code == 404
+
+    compressed = client.get("/static/terms.html", headers={"Accept-Encoding": "gzip"})
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert compressed.headers["content-type"].startswith("text/html")
+    assert compressed.text == "<p>terms</p>"
+    plain = client.get("/static/terms.html", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+    assert plain.headers["vary"] == "Accept-Encoding"
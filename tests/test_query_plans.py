@@ -0,0 +1,113 @@
+import re
+
+import pytest
+from sqlalchemy import event
+
+from app.database import async_engine, engine
+
+pytestmark = pytest.mark.skipif(engine.dialect.name != "sqlite", reason="EXPLAIN QUERY PLAN 형식은 SQLite 기준")
+
+# anon_N은 LIMIT이 걸린 파생 테이블(서브쿼리) 결과를 읽는 단계로, 내부 계획은 별도 행으로 검사됩니다.
+FULL_SCAN_PATTERN = re.compile(r"\bSCAN (?!anon_\d+\b)\w+\b(?! USING)")
+
+
+def _auth_header(access_token: str) -> dict:
+    return {"Authorization": f"Bearer {access_token}"}
+
+
+def _signup_and_login(client, email: str, nickname: str) -> dict:
+    password = "Abcd1234!"
+    client.post("/auth/signup", json={"email": email, "password": password, "nickname": nickname})
+    return client.post("/auth/login", json={"email": email, "password": password}).json()["data"]
+
+
+@pytest.fixture
+def captured_selects():
+    statements: list[tuple[str, object]] = []
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and not executemany:
+            statements.append((statement, parameters))
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", _capture)
+    try:
+        yield statements
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", _capture)
+
+
+def _exercise_api(client, unique_email, unique_nickname) -> None:
+    author = _signup_and_login(client, unique_email("plan"), unique_nickname("p"))
+    reader_nickname = unique_nickname("r")
+    reader = _signup_and_login(client, unique_email("plan"), reader_nickname)
+    author_headers = _auth_header(author["access_token"])
+    reader_headers = _auth_header(reader["access_token"])
+
+    client.post("/auth/check-email", json={"email": unique_email("free")})
+    client.post("/auth/check-nickname", json={"nickname": unique_nickname("f")})
+    client.get("/users/me", headers=author_headers)
+    client.patch("/users/me", headers=author_headers, json={"nickname": unique_nickname("e")})
+    refreshed = client.post("/auth/refresh", json={"refresh_token": author["refresh_token"]}).json()["data"]
+    client.post("/auth/logout", json={"refresh_token": refreshed["refresh_token"]})
+
+    post_id = client.post(
+        "/posts",
+        headers=author_headers,
+        json={"title": "Plan", "content": "body", "tags": ["python"]},
+    ).json()["data"]["id"]
+    client.put(
+        f"/posts/{post_id}",
+        headers=author_headers,
+        json={"title": "Plan 2", "content": "body 2", "tags": ["python", "sql"]},
+    )
+    client.post(f"/posts/{post_id}/likes", headers=reader_headers)
+    client.delete(f"/posts/{post_id}/likes", headers=reader_headers)
+    client.post(f"/posts/{post_id}/likes", headers=reader_headers)
+    comment_id = client.post(
+        f"/posts/{post_id}/comments", headers=reader_headers, json={"content": "hi"}
+    ).json()["data"]["id"]
+    client.put(f"/posts/{post_id}/comments/{comment_id}", headers=reader_headers, json={"content": "edit"})
+    client.get(f"/posts/{post_id}/comments", headers=reader_headers)
+    client.get(f"/posts/{post_id}/comments", params={"after_id": comment_id, "limit": 1})
+    client.delete(f"/posts/{post_id}/comments/{comment_id}", headers=reader_headers)
+
+    for sort in ("latest", "hot", "discussed"):
+        first = client.get("/posts", headers=reader_headers, params={"sort": sort, "limit": 1}).json()
+        client.get("/posts", params={"sort": sort, "limit": 1, "page": 2})
+        if first["paging"]["next_cursor"]:
+            client.get("/posts", params={"sort": sort, "limit": 1, "cursor": first["paging"]["next_cursor"]})
+        client.get("/posts", params={"sort": sort, "tag": "python"})
+    client.get("/posts/trending", headers=reader_headers)
+    search = client.get("/posts/search", params={"q": "plan body", "limit": 1}).json()
+    if search["paging"]["next_cursor"]:
+        client.get("/posts/search", params={"q": "plan body", "limit": 1, "cursor": search["paging"]["next_cursor"]})
+    client.get(f"/posts/{post_id}", headers=reader_headers)
+
+    author_id = client.get("/users/me", headers=author_headers).json()["data"]["id"]
+    reader_id = client.get("/users/me", headers=reader_headers).json()["data"]["id"]
+    client.get("/messages/users", headers=author_headers)
+    client.get("/messages/users", headers=author_headers, params={"query": reader_nickname[:3]})
+    client.post("/messages", headers=author_headers, json={"recipient_id": reader_id, "content": "hello"})
+    client.get("/messages/conversations", headers=reader_headers)
+    history = client.get(f"/messages/with/{author_id}", headers=reader_headers).json()["paging"]
+    client.get(f"/messages/with/{author_id}", headers=reader_headers, params={"before_id": history["newest_id"]})
+    client.get(f"/messages/with/{author_id}", headers=reader_headers, params={"after_id": history["oldest_id"]})
+
+    client.delete(f"/posts/{post_id}", headers=author_headers)
+    client.delete("/users/me", headers=reader_headers)
+
+
+def test_model_queries_do_not_full_scan(client, unique_email, unique_nickname, captured_selects):
+    _exercise_api(client, unique_email, unique_nickname)
+    assert captured_selects
+
+    offenders = []
+    with engine.connect() as conn:
+        for statement, parameters in captured_selects:
+            plan = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+            details = [row[-1] for row in plan]
+            scans = [detail for detail in details if FULL_SCAN_PATTERN.search(detail)]
+            if scans:
+                offenders.append((" ".join(statement.split()), scans))
+
+    assert not offenders, "\n".join(f"{scans}: {statement}" for statement, scans in offenders)